@@ -0,0 +1,107 @@
+"""Compare per-command CPU time and latency of the RESI transport backends.
+
+A local fake gateway answers every CR terminated command with a fixed
+`#OK` frame, so the numbers isolate the cost of the transport layer from
+the DALI bus. Run from the repository root:
+
+    python benchmarks/transport_benchmark.py [commands]
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from pathlib import Path
+import statistics
+import sys
+import time
+
+TRANSPORT_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components" / "drp_dali_resi_ascii" / "transport.py"
+)
+
+PREAMBLE = b"\r\r\r\r"
+TERMINATOR = b"\r"
+COMMAND = "#LAMP COMMAND ANSWER:18=0xA0"
+REPLY = b"#OK:1,254,0xFE\r"
+
+
+def load_transport_module():
+    """Load transport.py without importing Home Assistant."""
+    spec = importlib.util.spec_from_file_location("dali_transport", TRANSPORT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def handle_gateway(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer every CR terminated command, ignore wake-up CRs and telnet options."""
+    try:
+        while True:
+            line = await reader.readuntil(b"\r")
+            if b"#" in line:
+                writer.write(REPLY)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_backend(transport_class, port: int, commands: int) -> dict[str, float]:
+    """Send `commands` requests back to back and time each one."""
+    frames: asyncio.Queue[str | None] = asyncio.Queue()
+    transport = transport_class(
+        "127.0.0.1", port, frames.put_nowait, lambda exc: frames.put_nowait(None)
+    )
+    await transport.async_open()
+
+    latencies = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(commands):
+        sent = time.perf_counter()
+        transport.write(PREAMBLE)
+        transport.write(COMMAND.encode("ascii"))
+        transport.write(TERMINATOR)
+        frame = await frames.get()
+        if frame is None:
+            raise ConnectionError("gateway closed the connection")
+        latencies.append(time.perf_counter() - sent)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    transport.close()
+    # let the fake gateway see the end of stream
+    await asyncio.sleep(0.1)
+
+    return {
+        "cpu_us": cpu / commands * 1e6,
+        "mean_us": statistics.fmean(latencies) * 1e6,
+        "p99_us": sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1e6,
+        "rate": commands / wall,
+    }
+
+
+async def main(commands: int) -> None:
+    """Run every backend against the fake gateway."""
+    module = load_transport_module()
+    server = await asyncio.start_server(handle_gateway, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    print(f"{'backend':<10} {'cpu/cmd us':>11} {'mean us':>9} {'p99 us':>9} {'cmd/s':>9}")
+    for name, transport_class in module.TRANSPORTS.items():
+        try:
+            result = await run_backend(transport_class, port, commands)
+        except ImportError as exception_error:
+            print(f"{name:<10} skipped: {exception_error}")
+            continue
+        print(
+            f"{name:<10} {result['cpu_us']:>11.1f} {result['mean_us']:>9.1f}"
+            f" {result['p99_us']:>9.1f} {result['rate']:>9.0f}"
+        )
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -53,6 +53,33 @@ from .const import (
     CONF_LAZY_ERROR,
     DEFAULT_SCAN_INTERVAL,
     CONF_MSG_WAIT,
+    CONF_RETRIES,
+    CONF_POLL_BUDGET,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_CACHE_TTL,
+    CONF_VERIFY,
+    CONF_VERIFY_SAMPLE,
+    CONF_BUS_UTILISATION,
+    CONF_ACTION_MODEL,
+    CONF_GROUPS,
+    CONF_FANOUT_WINDOW,
+    CONF_BUS_COMPLETE,
+    DEFAULT_FANOUT_WINDOW,
+    DALI_GROUPS,
+    DALIActionModel,
+    DEFAULT_RETRIES,
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_VERIFY,
+    DEFAULT_VERIFY_SAMPLE,
+    DEFAULT_BUS_UTILISATION,
+    VERIFY_MODES,
+    CONF_TRANSPORT,
+    CONF_COALESCE_WRITES,
+    DEFAULT_TRANSPORT,
     TCP,
     UNKNOWN,
     ONOFF,
@@ -67,6 +94,7 @@ from .const import (
 )
 
 from .dali_resi_master import DALIHub, async_dali_setup
+from .transport import TRANSPORTS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -90,6 +118,15 @@ BASE_COMPONENT_SCHEMA = vol.Schema(
 )
 
 LIGHT_SCHEMA = BASE_COMPONENT_SCHEMA.extend({
+    vol.Optional(CONF_VERIFY): vol.In(VERIFY_MODES),
+    # lamp: the address is a short address, group: a group number, all: broadcast
+    vol.Optional(CONF_ACTION_MODEL, default=DALIActionModel.LAMP): vol.In(
+        [model.value for model in DALIActionModel]
+    ),
+    # groups a lamp is a member of, group commands update it without a poll
+    vol.Optional(CONF_GROUPS, default=[]): vol.All(
+        cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=0, max=DALI_GROUPS - 1))]
+    ),
     vol.Required(CONF_COLOR_MODE, default=ONOFF): vol.Any(
         UNKNOWN,
         ONOFF,
@@ -110,9 +147,29 @@ DALI_SCHEMA = vol.Schema(
         vol.Optional(CONF_TIMEOUT, default=3): cv.socket_timeout,
         # vol.Optional(CONF_CLOSE_COMM_ON_ERROR): cv.boolean,
         vol.Optional(CONF_DELAY, default=0): cv.positive_int,
-        # vol.Optional(CONF_RETRIES, default=3): cv.positive_int,
+        vol.Optional(CONF_RETRIES, default=DEFAULT_RETRIES): cv.positive_int,
+        vol.Optional(CONF_POLL_BUDGET, default=DEFAULT_POLL_BUDGET): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1)
+        ),
+        vol.Optional(CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_CACHE_TTL, default=DEFAULT_CACHE_TTL): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(CONF_VERIFY, default=DEFAULT_VERIFY): vol.In(VERIFY_MODES),
+        vol.Optional(CONF_VERIFY_SAMPLE, default=DEFAULT_VERIFY_SAMPLE): cv.positive_int,
+        vol.Optional(CONF_BUS_UTILISATION, default=DEFAULT_BUS_UTILISATION): vol.All(
+            vol.Coerce(float), vol.Range(min=0.05, max=1)
+        ),
+        vol.Optional(CONF_FANOUT_WINDOW, default=DEFAULT_FANOUT_WINDOW): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        # every short address on the bus has a light here, broadcasts reach nothing else
+        vol.Optional(CONF_BUS_COMPLETE, default=False): cv.boolean,
         # vol.Optional(CONF_RETRY_ON_EMPTY): cv.boolean,
         vol.Optional(CONF_MSG_WAIT): cv.positive_int,
+        vol.Optional(CONF_TRANSPORT, default=DEFAULT_TRANSPORT): vol.In(list(TRANSPORTS)),
+        vol.Optional(CONF_COALESCE_WRITES, default=True): cv.boolean,
 
         vol.Optional(CONF_LIGHTS): vol.All(cv.ensure_list, [LIGHT_SCHEMA]),
         # vol.Optional(CONF_SWITCHES): vol.All(cv.ensure_list, [SWITCH_SCHEMA]),
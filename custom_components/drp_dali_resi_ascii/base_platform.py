@@ -58,8 +58,11 @@ from homeassistant.components.light import (
 )
 
 from .dali_resi_master import DALIHub
+from .query_planner import STATUS_EVERY, lamp_poll_needs, plan_lamp_poll
+from .scheduler import CancelToken, request_scope
 from .const import (
     ATTR_DALI_ADDRESS,
+    ATTR_DALI_ACTION_MODEL,
     ATTR_DALI_DEVICE,
     ATTR_DALI_CONTROL_GEAR,
     ATTR_DALI_LAMP_FAILURE,
@@ -71,12 +74,18 @@ from .const import (
     ATTR_DALI_QUERY_POWER_FAILURE,
     CONF_SWITCH_CONSTRAINT,
     CONF_COLOR_MODE,
+    CONF_VERIFY,
+    CONF_ACTION_MODEL,
+    CONF_GROUPS,
     CONF_LAZY_ERROR,
     CONF_DEVICE_ADDRESS,
     SIGNAL_STOP_ENTITY,
     SIGNAL_START_ENTITY,
+    SIGNAL_LAMP_STATE,
     DALI_RESI_DOMAIN as DOMAIN,
+    DALIActionModel,
 )
+from .inventory import INV_MAX_LEVEL
 from .dali_const import (
     DONE,
     TIMEOUT,
@@ -112,6 +121,7 @@ class BasePlatform(Entity):
         self._call_active = False
         self._cancel_timer: Callable[[], None] | None = None
         self._cancel_call: Callable[[], None] | None = None
+        self._cancel_token = CancelToken()
         self._state_constraint = 'on'
         self._attr_unique_id = entry.get(CONF_UNIQUE_ID)
         self._attr_name = entry[CONF_NAME]
@@ -152,6 +162,11 @@ class BasePlatform(Entity):
 
         # _LOGGER.debug( '## scan_interval:%d', self._scan_interval )
 
+    @property
+    def _segment_lamp(self) -> int | None:
+        """Return the short address the switch constraint powers, None for no single lamp."""
+        return self._slave
+
     @abstractmethod
     async def async_update(self, now: datetime | None = None) -> None:
         """Virtual function to be overwritten."""
@@ -160,13 +175,12 @@ class BasePlatform(Entity):
     def async_run(self) -> None:
         """Remote start entity."""
         self.async_hold(update=False)
-        self._cancel_call = async_call_later(
-            self.hass, timedelta(milliseconds=100), self.async_update
+        self._cancel_token = CancelToken()
+        # the hub spreads the polls of all its entities over the interval
+        self._cancel_timer = self._hub.poller.async_register(
+            self.entity_id, self.async_update, self._scan_interval, self._slave,
+            self._switch_constraint
         )
-        if self._scan_interval > 0:
-            self._cancel_timer = async_track_time_interval(
-                self.hass, self.async_update, timedelta(seconds=self._scan_interval)
-            )
         self._attr_available = True
         self.async_write_ha_state()
 
@@ -179,6 +193,8 @@ class BasePlatform(Entity):
         if self._cancel_timer:
             self._cancel_timer()
             self._cancel_timer = None
+        # drop whatever this entity still has queued on the hub
+        self._cancel_token.cancel()
         if update:
             self._attr_available = False
             self.async_write_ha_state()
@@ -186,6 +202,7 @@ class BasePlatform(Entity):
     async def async_base_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         self.async_run()
+        self.async_on_remove(lambda: self.async_hold(update=False))
         self.async_on_remove(
             async_dispatcher_connect(self.hass, SIGNAL_STOP_ENTITY, self.async_hold)
         )
@@ -193,6 +210,8 @@ class BasePlatform(Entity):
             async_dispatcher_connect(self.hass, SIGNAL_START_ENTITY, self.async_run)
         )
         if self._switch_constraint:
+            # the hub suspends and resyncs the polls, the entity only follows availability
+            self._hub.async_add_segment(self._switch_constraint, self._segment_lamp)
             self.async_on_remove(
                 async_track_state_change_event(self.hass, self._switch_constraint, self._async_component_changed)
             )
@@ -214,7 +233,8 @@ class BasePlatform(Entity):
             self._attr_available = True
 
         self.async_write_ha_state()
-        async_call_later(self.hass, 7, self.async_update)
+        # the hub holds polls until the gateway answers, no need to wait here
+        self._hub.poller.async_request_poll(self.entity_id)
 
         _LOGGER.debug( "#### _async_update_switch_constraint_status %s %s %s %s",
                 str(self._switch_constraint), str(self._state_constraint), 
@@ -230,7 +250,6 @@ class BasePlatform(Entity):
         if self._state_constraint == 'on':
             self._attr_available = True
             self.async_write_ha_state()
-            async_call_later(self.hass, 7, self.async_update)
         else:
             self._attr_available = False
             self.async_write_ha_state()
@@ -255,6 +274,7 @@ class BaseSwitch(BasePlatform, ToggleEntity, RestoreEntity):
         self.hass = hass
         self._update_lock = asyncio.Lock()
         self._update_lock_flag = False
+        self._status_countdown = 0
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -273,63 +293,20 @@ class BaseSwitch(BasePlatform, ToggleEntity, RestoreEntity):
         await super()._async_update_switch_constraint_status(event)
 
     async def _async_lamp_status(self):
-        result = { 'lamp': self._slave }
-
         # {'request': {'command': '#LAMP ', 'action': 'QUERY STATUS', 'params': ':18'}, 
         #  'response': '#OK:1,4,0x4', 'default': 4, 'done': True, 'statusControlGear': True, 'lampFailure': False, 
         #  'lampArcPowerOn': True, 'queryLimitError': False, 'fadeRunning': False, 'queryResetState': False, 
         #  'queryMissingShortAddress': False, 'queryPowerFailure': False }
 
-        if self._attr_dali_device_code is None:
-            response = await self._hub.async_dali_retrieve_device_type(self._slave)
-            if DONE in response and response[DONE]:
-                result['query_device_type'] = response[DALICMD[QUERY_DEVICE_TYPE][TAG]]
-                result['query_device_typename'] = response[DALICMD[QUERY_DEVICE_TYPE][TAG]+NAME]
+        # the status bits rarely change, read them on the first poll and then now and again
+        want_status = self._attr_dali_status_control_gear is None or self._status_countdown <= 0
+        self._status_countdown = STATUS_EVERY if want_status else self._status_countdown - 1
 
-
-        status_response = await self._hub.async_dali_retrieve_device_status(self._slave)
-        if DONE in status_response and status_response[DONE]:
-            result.update(
-                status_response['query_status']  
-            )
-
-        if self._attr_color_mode == ColorMode.ONOFF or self._attr_color_mode == ColorMode.BRIGHTNESS:
-            actual_level_response = await self._hub.async_dali_retrieve_actual_level( self._attr_color_mode, self._slave )
-            if (DONE in actual_level_response and actual_level_response[DONE]):
-                result["brightness"] = actual_level_response["query_actual_level"]
-    
-        if self._attr_color_mode == ColorMode.COLOR_TEMP:
-            actual_level_response = await self._hub.async_dali_retrieve_actual_level( self._attr_color_mode, self._slave )
-            cw_ww_lamp_response = await self._hub.async_dali_20_dt8_retrieve_cw_ww_lamp(self._slave)
-            if (DONE in cw_ww_lamp_response and cw_ww_lamp_response[DONE]):
-                result["brightness"] = cw_ww_lamp_response['query_tc']["brightness"]
-                # result["mirek"] = cw_ww_lamp_response['query_tc']["mirek"]
-                result["kelvin"] = cw_ww_lamp_response['query_tc']["kelvin"]
-            if (DONE in actual_level_response and actual_level_response[DONE]):
-                result["brightness"] = actual_level_response['query_actual_level']
-
-        if self._attr_color_mode == ColorMode.RGB:
-            actual_level_response = await self._hub.async_dali_retrieve_actual_level( self._attr_color_mode, self._slave )
-            rgb_response = await self._hub.async_dali_20_dt8_retrieve_rgb_lamp(self._slave)
-            if (DONE in rgb_response and rgb_response[DONE]):
-                result["rgb_color"] = [
-                            int(rgb_response['red']), int(rgb_response['green']), int(rgb_response['blue'])
-                        ]
-                result["brightness"] = int(rgb_response['arc_level'])
-            if (DONE in actual_level_response and actual_level_response[DONE]):
-                result["brightness"] = actual_level_response['query_actual_level']
-        
-        if self._attr_color_mode == ColorMode.RGBWW:
-            actual_level_response = await self._hub.async_dali_retrieve_actual_level( self._attr_color_mode, self._slave )
-            rgbwaf_response = await self._hub.async_dali_20_dt8_retrieve_rgbww_lamp(self._slave)
-            if (DONE in rgbwaf_response and rgbwaf_response[DONE]):
-                result["rgbww_color"] = [
-                            int(rgbwaf_response['red']), int(rgbwaf_response['green']), int(rgbwaf_response['blue']), 
-                            int(rgbwaf_response['white']), int(rgbwaf_response['amber'])
-                        ]
-                result["brightness"] = int(rgbwaf_response['arc_level'])
-            if (DONE in actual_level_response and actual_level_response[DONE]):
-                result["brightness"] = actual_level_response['query_actual_level']
+        plan = plan_lamp_poll(
+            self._attr_color_mode,
+            lamp_poll_needs(self._attr_color_mode, self._attr_dali_device_code is not None, want_status)
+        )
+        result = await self._hub.async_dali_execute_plan(self._slave, plan)
 
         _LOGGER.debug( "#### _async_lamp_status %s", str(result))
         return result
@@ -337,9 +314,27 @@ class BaseSwitch(BasePlatform, ToggleEntity, RestoreEntity):
     async def async_update(self, now: datetime | None = None) -> None:
         """Update the entity state.""" 
 
-        if self._update_lock_flag:
+        if self._update_lock_flag or self._cancel_token.cancelled:
             return
         
+        # a poll still queued when the next one is due is not worth sending
+        deadline = self._scan_interval if self._scan_interval > 0 else None
+        before = self._poll_fingerprint()
+        with request_scope(self._cancel_token, deadline):
+            await self._async_update_locked()
+        # poll lamps that keep changing more often than the quiet ones
+        self._hub.poller.async_report(
+            self.entity_id, self._poll_fingerprint() != before, bool(self._attr_available)
+        )
+
+    def _poll_fingerprint(self) -> tuple:
+        """Return the polled values, to tell whether a poll saw a change."""
+        return (
+            self._attr_available, self._attr_is_on, self._attr_brightness,
+            self._attr_color_temp_kelvin, self._attr_rgb_color, self._attr_rgbww_color,
+        )
+
+    async def _async_update_locked(self) -> None:
         async with self._update_lock:
             self._update_lock_flag = True
 
@@ -355,7 +350,13 @@ class BaseSwitch(BasePlatform, ToggleEntity, RestoreEntity):
             
             lamp_status = await self._async_lamp_status()
 
-            if lamp_status is None or not bool(lamp_status):
+            if self._cancel_token.cancelled:
+                # held or removed while polling, leave the state alone
+                self._update_lock_flag = False
+                return
+
+            if lamp_status is None:
+                # none of the planned queries was answered
                 self._attr_available = False
                 self._attr_native_value = None
                 self._attr_is_on = None
@@ -447,6 +448,9 @@ class BaseDALILight(BaseSwitch, LightEntity):
         super().__init__(hass, hub, entry)
 
         self._attr_color_mode = entry[CONF_COLOR_MODE]
+        self._verify = entry.get(CONF_VERIFY)
+        self._action_model = entry.get(CONF_ACTION_MODEL, DALIActionModel.LAMP)
+        self._groups = entry.get(CONF_GROUPS, [])
         supported_color_modes: set[ColorMode] = set()
         # supported_color_modes.add(ColorMode.ONOFF)
         # supported_color_modes.add(ColorMode.BRIGHTNESS)
@@ -485,7 +489,51 @@ class BaseDALILight(BaseSwitch, LightEntity):
             supported_color_modes.add(ColorMode.UNKNOWN)
 
         self._attr_supported_color_modes = supported_color_modes
-        self._attr_supported_features = LightEntityFeature(0)
+        # the gear fades over its stored fade time, see DALIHub._async_dali_fade_time
+        self._attr_supported_features = LightEntityFeature.TRANSITION
+
+    @property
+    def _segment_lamp(self) -> int | None:
+        """Return the short address the switch constraint powers.
+
+        A group or broadcast address is none, its member lamps join the
+        segment through their own entities.
+        """
+        return self._slave if self._action_model == DALIActionModel.LAMP else None
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await super().async_added_to_hass()
+        if self._action_model == DALIActionModel.LAMP:
+            # group and broadcast commands reaching this lamp update it without a poll
+            self._hub.async_add_lamp(self._slave, self._groups, self.entity_id)
+            self.async_on_remove(
+                async_dispatcher_connect(self.hass, SIGNAL_LAMP_STATE, self._async_lamp_state)
+            )
+
+    @callback
+    def _async_lamp_state(self, hub: str, lamps: set[int], state: dict[str, Any]) -> None:
+        """Take the state a group or broadcast command gave this lamp."""
+        if hub != self._hub.name or self._slave not in lamps:
+            return
+
+        if "brightness" in state:
+            brightness = state["brightness"]
+            if brightness is None:
+                # RECALL MAX LEVEL, each lamp goes to its own
+                brightness = self._hub.inventory.get(self._slave, INV_MAX_LEVEL) or 254
+            self._attr_brightness = brightness
+            self._attr_is_on = brightness > 0
+            self._attr_native_value = self._attr_is_on
+
+        if self._attr_color_mode == ColorMode.COLOR_TEMP and "kelvin" in state:
+            self._attr_color_temp_kelvin = state["kelvin"]
+        if self._attr_color_mode == ColorMode.RGB and "rgb_color" in state:
+            self._attr_rgb_color = state["rgb_color"]
+        if self._attr_color_mode == ColorMode.RGBWW and "rgbww_color" in state:
+            self._attr_rgbww_color = state["rgbww_color"]
+
+        self.async_write_ha_state()
 
     async def async_set_temperature_color(self, temperature: int, kelvin: int) -> None:
         """Set switch on\off."""
@@ -559,6 +607,9 @@ class BaseDALILight(BaseSwitch, LightEntity):
             ATTR_DALI_ADDRESS : self._slave 
         }
 
+        if self._action_model != DALIActionModel.LAMP:
+            data[ ATTR_DALI_ACTION_MODEL ] = self._action_model
+
         if self._attr_dali_device:
             data[ ATTR_DALI_DEVICE ] = self._attr_dali_device
 
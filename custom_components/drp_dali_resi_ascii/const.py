@@ -15,14 +15,53 @@ CONF_DEVICE_ADDRESS = "device_address"
 CONF_COLOR_MODE = "color_mode"
 CONF_LAZY_ERROR = "lazy_error_count"
 CONF_MSG_WAIT = "message_wait_milliseconds"
+CONF_TRANSPORT = "transport"
+CONF_COALESCE_WRITES = "coalesce_writes"
+CONF_RETRIES = "retries"
+CONF_POLL_BUDGET = "poll_budget"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_CACHE_TTL = "query_cache_ttl"
+CONF_VERIFY = "verify"
+CONF_VERIFY_SAMPLE = "verify_sample"
+CONF_BUS_UTILISATION = "bus_utilisation"
+CONF_ACTION_MODEL = "action_model"
+CONF_GROUPS = "groups"
+CONF_FANOUT_WINDOW = "fanout_window"
+CONF_BUS_COMPLETE = "bus_complete"
+
+# read back policies after a command
+VERIFY_ALWAYS = "always"
+VERIFY_SAMPLED = "sampled"
+VERIFY_DEFERRED = "deferred"
+VERIFY_MODES = [VERIFY_ALWAYS, VERIFY_SAMPLED, VERIFY_DEFERRED]
 
 DEFAULT_HUB = "dalihub"
 DEFAULT_SCAN_INTERVAL = 30  # seconds
+DEFAULT_TRANSPORT = "protocol"
+DEFAULT_RETRIES = 1
+DEFAULT_POLL_BUDGET = 2.0  # polls per second at most
+DEFAULT_MIN_SCAN_INTERVAL = 5  # seconds, right after a change
+DEFAULT_MAX_SCAN_INTERVAL = 300  # seconds, for lamps that stay unchanged
+DEFAULT_CACHE_TTL = 2.0  # seconds a query answer is reused, 0 disables
+# 1200 baud forward and backward frames with settling times
+DALI_MAX_TRANSACTIONS = 30  # per second
+DEFAULT_BUS_UTILISATION = 0.6  # share of DALI_MAX_TRANSACTIONS the hub may use
+
+SEGMENT_POWER_UP_DELAY = 7  # seconds for gear to boot after its switch turns on
+INTERACTIVE_READY_WAIT = 5  # seconds a user command waits for the link to come back
+DEFAULT_VERIFY = VERIFY_SAMPLED
+DEFAULT_VERIFY_SAMPLE = 5  # commands per lamp for each read back when sampled
+DEFAULT_FANOUT_WINDOW = 0.05  # seconds lamp commands wait for others to share a group command
 
 # service call attributes
 ATTR_HUB = "hub"
+ATTR_SCENE = "scene"
+ATTR_LEVELS = "levels"
+ATTR_GROUP = "group"
 
 ATTR_DALI_ADDRESS = "dali_address"
+ATTR_DALI_ACTION_MODEL = "dali_action_model"
 ATTR_DALI_DEVICE = "dali_device"
 ATTR_DALI_CONTROL_GEAR = "control_gear"
 ATTR_DALI_LAMP_FAILURE = "lamp_failure"
@@ -52,10 +91,14 @@ WHITE = "white"
 # service calls
 SERVICE_STOP = "stop"
 SERVICE_RESTART = "restart"
+SERVICE_STATISTICS = "statistics"
+SERVICE_PROGRAM_SCENE = "program_scene"
+SERVICE_RECALL_SCENE = "recall_scene"
 
 # dispatcher signals
 SIGNAL_STOP_ENTITY = "dali.stop"
 SIGNAL_START_ENTITY = "dali.start"
+SIGNAL_LAMP_STATE = "dali.lamp_state"  # (hub name, short addresses, state) after a group command
 
 PLATFORMS = (
     (Platform.LIGHT, CONF_LIGHTS),
@@ -70,6 +113,9 @@ class DALIActionModel(str, Enum):
     GROUP = "group"
     ALL = "all"
 
+DALI_GROUPS = 16  # group addresses 0..15
+DALI_SCENES = 16  # scenes 0..15 stored in the gear
+
 class DALICommandNames(str, Enum):
 
     LAMP_LEVEL = "LAMP LEVEL"
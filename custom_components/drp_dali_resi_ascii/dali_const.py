@@ -9,6 +9,9 @@ TIMEOUT = "timeout"
 ERROR = "error"
 ERR9 = "9"
 ERR99 = "99"
+TARGET_LEVEL = "target_level"
+TARGET_KELVIN = "target_kelvin"
+TARGET_COLOR = "target_color"
 
 ATTR_ACTUAL_LAMP_LEVEL = "actualLampLevel"
 
@@ -22,6 +25,7 @@ OFF = "OFF"
 ON = "ON"
 RECALL_MAX_LEVEL = "RECALL MAX LEVEL"
 RECALL_MIN_LEVEL = "RECALL MIN LEVEL"
+GO_TO_SCENE = "GO TO SCENE"
 STORE_ACTUAL_LEVEL_IN_DTR = "STORE ACTUAL LEVEL IN DTR"
 STORE_THE_DTR_AS_MAX_LEVEL = "STORE THE DTR AS MAX LEVEL"
 STORE_THE_DTR_AS_MIN_LEVEL = "STORE THE DTR AS MIN LEVEL"
@@ -56,6 +60,7 @@ DT8_SET_COLOUR_TEMPERATURE_TC = "DT8:SET COLOUR TEMPERATURE Tc"
 DT8_SET_PRIMARY_N_DIMLEVEL = "DT8:SET PRIMARY N DIMLEVEL"
 DT8_SET_RGB_DIMLEVEL = "DT8:SET RGB DIMLEVEL"
 DT8_SET_WAF_DIMLEVEL = "DT8:SET WAF DIMLEVEL"
+DT8_ACTIVATE = "DT8:ACTIVATE"
 SET_DTR = "DTR="
 ENABLE_DEVICE_TYPE = "ENABLE DEVICE TYPE"
 SET_DTR1 = "DTR1="
@@ -122,6 +127,12 @@ DALICMD = {
         OPCODE : '0x06',
         DESCRIPTION : 'Changes the current light output to the minimum level'
     },
+    GO_TO_SCENE : { 
+        NAME : GO_TO_SCENE,
+        OPCODE : '0x10',
+        TAG: 'go_to_scene',
+        DESCRIPTION : 'Changes the current light output to the level stored for scene x (0 to 15), add x to the opcode'
+    },
     STORE_ACTUAL_LEVEL_IN_DTR : {
         NAME : STORE_ACTUAL_LEVEL_IN_DTR,
         OPCODE : '0x21',
@@ -150,6 +161,7 @@ DALICMD = {
     STORE_DTR_AS_FADETIME : {
         NAME : 'STORE DTR AS FADETIME',
         OPCODE : '0x2E',
+        TAG: 'store_dtr_as_fadetime',
         DESCRIPTION : 'Stores the actual register value DTR as fade time for lamp'
     },
     STORE_DTR_AS_FADERATE : {
@@ -160,12 +172,12 @@ DALICMD = {
     STORE_THE_DTR_AS_SCENE_0: {
         NAME : 'STORE THE DTR AS SCENE 0',
         OPCODE : '0x40',
+        TAG: 'store_dtr_as_scene',
         DESCRIPTION : 'Stores the actual register value DTR as new brightness level forscene x (0 to 15)'
     },
-    # //TO-DO
     STORE_THE_DTR_AS_SCENE_15: {
         NAME : 'STORE THE DTR AS SCENE 15',
-        OPCODE : '0x40F',
+        OPCODE : '0x4F',
         DESCRIPTION : 'Stores the actual register value DTR as new brightness level forscene x (0 to 15)'
     },
 
@@ -195,6 +207,7 @@ DALICMD = {
     QUERY_PHYSICAL_MINIMUM: {
         NAME : 'QUERY PHYSICAL MINIMUM',
         OPCODE : '0x9A',
+        TAG: 'query_physical_minimum',
         DESCRIPTION : 'Returns the minimum light output that the control gear can operate at'
     },
     QUERY_CONTENT_DTR1: {
@@ -228,31 +241,37 @@ DALICMD = {
     QUERY_POWER_ON_LEVEL : { 
         NAME : 'QUERY POWER ON LEVEL',
         OPCODE : '0xA3',
+        TAG: 'query_power_on_level',
         DESCRIPTION : 'Returns the control gear\'s minimum output setting'
     },  
     QUERY_SYSTEM_FAILURE_LEVEL : { 
         NAME : 'QUERY SYSTEM FAILURE LEVEL',
         OPCODE : '0xA4',
+        TAG: 'query_system_failure_level',
         DESCRIPTION : 'Returns the value of the intensity level due to a system failure'
     },  
     QUERY_FADE_TIME_FADE_RATE : { 
         NAME : 'QUERY FADE TIME FADE RATE',
         OPCODE : '0xA5',
+        TAG: 'query_fade_time_fade_rate',
         DESCRIPTION : 'Returns a byte in which the upper nibble is equal to the fade time value and the lower nibble is the fade rate value'
     },   
     QUERY_SCENE_LEVEL : { 
         NAME : 'QUERY SCENE LEVEL',
         OPCODE : '0xB0',
+        TAG: 'query_scene_level',
         DESCRIPTION : 'Returns the level value of scene \'x\''
     },   
     QUERY_GROUPS_0_7 : { 
         NAME : 'QUERY GROUPS 0-7',
         OPCODE : '0xC0',
+        TAG: 'query_groups_0_7',
         DESCRIPTION : 'Returns a byte in which each bit represents a member of a group. A \'1\' represents a member of the group'
     },     
     QUERY_GROUPS_8_15 : { 
         NAME : 'QUERY GROUPS 8-15',
         OPCODE : '0xC1',
+        TAG: 'query_groups_8_15',
         DESCRIPTION : 'Returns a byte in which each bit represents a member of a group. A \'1\' represents a member of the group'
     },
 # //
@@ -293,6 +312,11 @@ DALICMD = {
         OPCODE : '0x01EC',
         DESCRIPTION : ''
     },      
+    DT8_ACTIVATE : { 
+        NAME : 'DT8:ACTIVATE',
+        OPCODE : '0x01E2',
+        DESCRIPTION : 'Applies the temporary colour values to the lamp'
+    },      
     SET_DTR : { 
         NAME : 'DTR=',
         OPCODE : '0xA3',
@@ -369,7 +393,8 @@ RESICMD = {
         TAG: "query_tc"
     },
     DALI_CMD16 : {
-        NAME : '#DALI CMD16:'
+        NAME : '#DALI CMD16:',
+        TAG : 'dali_cmd16'
     },
     LAMP_PRIMARY_N : {
         NAME : '#LAMP PRIMARY N:'
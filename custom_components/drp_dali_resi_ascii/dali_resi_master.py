@@ -2,22 +2,28 @@
 from __future__ import annotations
 
 import asyncio
-from collections import namedtuple
+from collections import deque, namedtuple
 from collections.abc import Callable
 from typing import Any
 
 import telnetlib  # pylint: disable=deprecated-module
-import telnetlib3
 import logging
 
 import voluptuous as vol
 
-from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
 from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.helpers.typing import ConfigType
 
@@ -35,19 +41,104 @@ from homeassistant.const import (
     CONF_TIMEOUT,
     CONF_TYPE,
     EVENT_HOMEASSISTANT_STOP,
+    STATE_OFF,
+    STATE_ON,
 )
 
 from .const import (
     ATTR_HUB,
     CONF_MSG_WAIT,
+    CONF_RETRIES,
+    CONF_POLL_BUDGET,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_CACHE_TTL,
+    CONF_VERIFY,
+    CONF_VERIFY_SAMPLE,
+    CONF_BUS_UTILISATION,
+    CONF_FANOUT_WINDOW,
+    CONF_BUS_COMPLETE,
+    DEFAULT_RETRIES,
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_VERIFY,
+    DEFAULT_VERIFY_SAMPLE,
+    DEFAULT_BUS_UTILISATION,
+    DEFAULT_FANOUT_WINDOW,
+    DALI_MAX_TRANSACTIONS,
+    SEGMENT_POWER_UP_DELAY,
+    INTERACTIVE_READY_WAIT,
+    CONF_TRANSPORT,
+    CONF_COALESCE_WRITES,
+    DEFAULT_TRANSPORT,
     DALI_RESI_DOMAIN as DOMAIN,
     SERVICE_STOP,
     SERVICE_RESTART,
+    SERVICE_STATISTICS,
+    SERVICE_PROGRAM_SCENE,
+    SERVICE_RECALL_SCENE,
+    ATTR_SCENE,
+    ATTR_LEVELS,
+    ATTR_GROUP,
+    DALI_GROUPS,
+    DALI_SCENES,
     SIGNAL_STOP_ENTITY,
     SIGNAL_START_ENTITY,
+    SIGNAL_LAMP_STATE,
+    DALIActionModel,
     PLATFORMS,
 )
 
+from . import frames
+from .fanout import FanOutBatcher
+from .groups import GroupIndex
+from .pacing import (
+    REPLY_COMMAND,
+    REPLY_DT8,
+    REPLY_FLOORS,
+    REPLY_QUERY,
+    REPLY_REPEAT,
+    PacingController,
+    ReplyTimeout,
+    TokenBucket,
+)
+from .quarantine import LampQuarantine, is_no_answer
+from .inventory import (
+    INV_DEVICE_TYPE,
+    INV_FADE_DEFAULT,
+    INV_FADE_RATE,
+    INV_FADE_TIME,
+    INV_GROUPS,
+    INV_SCENES,
+    INV_MAX_LEVEL,
+    INV_MIN_LEVEL,
+    INV_PHYSICAL_MINIMUM,
+    INV_POWER_ON_LEVEL,
+    INV_SYSTEM_FAILURE_LEVEL,
+    LampInventory,
+)
+from .poller import PollScheduler
+from .query_cache import QueryCache
+from .query_planner import Query, QueryPlan
+from .verify import VerifyPolicy
+from .transport import TRANSPORTS, DALITransport
+from .supervisor import LINK_DEAD_TIMEOUTS, CircuitBreaker, ReconnectBackoff
+from .scheduler import (
+    CommandCollapser,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    PRIORITY_VERIFY,
+    PendingRequest,
+    RequestQueue,
+    current_priority,
+    current_scope,
+    detached_scope,
+    request_priority,
+    with_priority,
+)
+
 from .dali_const import (
     TAG,
     RESICMD,
@@ -78,6 +169,7 @@ from .dali_const import (
     LAMP_QUERY_RGBWAF,
     LAMP_TC_KELVIN,
     LAMP_QUERY_TC,
+    DALI_CMD16,
     QUERY_STATUS,
     QUERY_ACTUAL_LEVEL,
     QUERY_DEVICE_TYPE,
@@ -86,15 +178,30 @@ from .dali_const import (
     QUERY_SYSTEM_FAILURE_LEVEL,
     QUERY_FADE_TIME_FADE_RATE,
     QUERY_PHYSICAL_MINIMUM,
+    QUERY_GROUPS_0_7,
+    QUERY_GROUPS_8_15,
+    QUERY_SCENE_LEVEL,
+    STORE_THE_DTR_AS_SCENE_0,
+    STORE_DTR_AS_FADETIME,
+    SET_DTR,
     QUERY_MIN_LEVEL,
     QUERY_MAX_LEVEL,
     DT8_SET_COLOUR_TEMPERATURE_TC,
     DT8_SET_PRIMARY_N_DIMLEVEL,
     RESIRESP,
+    TARGET_LEVEL,
+    TARGET_KELVIN,
+    TARGET_COLOR,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# RESI ASCII framing: wake-up CRs, the command, a terminating CR.
+PB_PREAMBLE = b"\r\r\r\r"
+PB_TERMINATOR = b"\r"
+# Whole frame in one write, checked against the gateway at connect time.
+PB_COALESCED_PREAMBLE = b"\r"
+
 async def async_dali_setup(
     hass: HomeAssistant,
     config: ConfigType,
@@ -225,11 +332,75 @@ async def async_dali_setup(
             x_service[1],
             schema=vol.Schema({vol.Required(ATTR_HUB): cv.string}),
         )
+
+    async def async_hub_statistics(service: ServiceCall) -> ServiceResponse:
+        """Return what the hubs learned about their gateways."""
+        names = [service.data[ATTR_HUB]] if ATTR_HUB in service.data else list(hub_collect)
+        return {name: hub_collect[name].statistics for name in names}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STATISTICS,
+        async_hub_statistics,
+        schema=vol.Schema({vol.Optional(ATTR_HUB): cv.string}),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_program_scene(service: ServiceCall) -> ServiceResponse:
+        """Store scene levels in the gear."""
+        hub = hub_collect[service.data[ATTR_HUB]]
+        result = await hub.async_dali_program_scene(
+            service.data[ATTR_SCENE], service.data[ATTR_LEVELS]
+        )
+        return {
+            "programmed": [lamp for lamp, ok in result.items() if ok],
+            "failed": [lamp for lamp, ok in result.items() if not ok],
+        }
+
+    async def async_recall_scene(service: ServiceCall) -> None:
+        """Recall a scene with one group or broadcast frame."""
+        hub = hub_collect[service.data[ATTR_HUB]]
+        await hub.async_dali_recall_scene(service.data[ATTR_SCENE], service.data.get(ATTR_GROUP))
+
+    scene_number = vol.All(vol.Coerce(int), vol.Range(min=0, max=DALI_SCENES - 1))
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROGRAM_SCENE,
+        async_program_scene,
+        schema=vol.Schema({
+            vol.Required(ATTR_HUB): cv.string,
+            vol.Required(ATTR_SCENE): scene_number,
+            # short address: level, 255 takes the lamp out of the scene
+            vol.Required(ATTR_LEVELS): vol.Schema({
+                vol.All(vol.Coerce(int), vol.Range(min=0, max=63)):
+                    vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+            }),
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECALL_SCENE,
+        async_recall_scene,
+        schema=vol.Schema({
+            vol.Required(ATTR_HUB): cv.string,
+            vol.Required(ATTR_SCENE): scene_number,
+            # broadcast when no group is given
+            vol.Optional(ATTR_GROUP): vol.All(vol.Coerce(int), vol.Range(min=0, max=DALI_GROUPS - 1)),
+        }),
+    )
     return True
 
 class DALIRESIClient3:
-    """Thread safe wrapper class for telnetlib."""
-    """Thread safe wrapper class for telnetlib."""
+    """Pipelined request/response engine on top of a DALITransport.
+
+    Requests are queued and written back to back by a single dispatcher
+    task: the next command goes on the wire as soon as the previous CR
+    terminated reply has been framed and handed to the request waiting
+    for it. A supervisor task keeps the connection up, reconnecting with
+    jittered exponential backoff, while a circuit breaker fails requests
+    fast for as long as the gateway is unreachable.
+    """
 
     def __init__(
             self,
@@ -245,16 +416,49 @@ class DALIRESIClient3:
         }
         self._msg_wait = config.get(CONF_MSG_WAIT, None)
         self._config_delay = config[CONF_DELAY]
+        self._retries = config.get(CONF_RETRIES, DEFAULT_RETRIES)
+        self._transport_class = TRANSPORTS[config.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)]
+        self._coalesce_writes = config.get(CONF_COALESCE_WRITES, True)
+        self._coalesced = False
 
         # generic configuration
         self._lock = asyncio.Lock()
         self._async_cancel_listener: Callable[[], None] | None = None
         self._in_error = False
-        self._client_reader = None
-        self._client_writer = None
+        self._transport: DALITransport | None = None
+
+        # request pipeline
+        self._pending = RequestQueue()
+        self._inflight: deque[PendingRequest] = deque()
+        self._dispatcher: asyncio.Task | None = None
+        self._frames: asyncio.Queue[str | None] = asyncio.Queue()
+        self._pacing = PacingController(self.name)
+        self._reply_timeouts = {
+            kind: ReplyTimeout(f"{self.name} {kind}", config.get(CONF_TIMEOUT, 3), floor)
+            for kind, floor in REPLY_FLOORS.items()
+        }
+        # deadlines of the replies to timed out requests, they may still come
+        self._owed: deque[float] = deque()
+        self._late_replies = 0
+        self._retransmits = 0
+        self._sequences = 0
+        self._bus_budget = TokenBucket(
+            DALI_MAX_TRANSACTIONS * config.get(CONF_BUS_UTILISATION, DEFAULT_BUS_UTILISATION)
+        )
+        self._dropped_expired = 0
+        self._dropped_cancelled = 0
+
+        # connection supervision
+        self._supervisor: asyncio.Task | None = None
+        self._link_lost = asyncio.Event()
+        self._backoff = ReconnectBackoff()
+        self._breaker = CircuitBreaker()
+        self._missed_replies = 0
+        self._reconnects = 0
+        self._ready = asyncio.Event()
+        self._unready_since: float | None = None
 
         # self._client = telnetlib.Telnet()
-        self._msg_read_timeout = 5
 
     async def async_setup(self) -> bool:
         """Set up telnetlib client."""
@@ -269,9 +473,12 @@ class DALIRESIClient3:
         #     func = getattr(self._client, entry.func_name)
         #     self._pb_request[entry.call_type] = RunEntry(entry.attr, func)
 
-        self.hass.async_create_background_task(
-            self.async_pb_connect(), "dali-connect"
-        )
+        if self._unready_since is None and not self._ready.is_set():
+            self._unready_since = self.hass.loop.time()
+        if self._supervisor is None or self._supervisor.done():
+            self._supervisor = self.hass.async_create_background_task(
+                self._async_supervise(), f"dali-{self.name}-supervisor"
+            )
 
         # Start counting down to allow dali requests.
         if self._config_delay:
@@ -282,9 +489,7 @@ class DALIRESIClient3:
     
     async def async_restart(self) -> None:
         """Reconnect client."""
-        if self._client:
-            await self.async_close()
-
+        await self.async_close()
         await self.async_setup()
 
     @callback
@@ -307,118 +512,397 @@ class DALIRESIClient3:
             self._async_cancel_listener()
             self._async_cancel_listener = None
 
+        if self._supervisor:
+            self._supervisor.cancel()
+            self._supervisor = None
+
         async with self._lock:
-            if self._client_writer:
-                try:
-                    self._client_writer.close()
-                except Exception as exception_error:
-                    self._log_error(str(exception_error))
-                del self._client_writer
-                self._client_writer = None
-                message = f"dali {self.name} writer communication closed"
-                _LOGGER.warning(message)
-            if self._client_reader:
-                try:
-                    self._client_reader.close()
-                except Exception as exception_error:
-                    self._log_error(str(exception_error))
-                del self._client_reader
-                self._client_reader = None
-                message = f"dali {self.name} reader communication closed"
-                _LOGGER.warning(message)
+            self._async_drop_link()
+
+    @callback
+    def _async_drop_link(self) -> None:
+        """Tear down the connection and fail everything waiting on it."""
+        self._breaker.trip()
+        if self._ready.is_set():
+            self._ready.clear()
+            self._unready_since = self.hass.loop.time()
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        self._async_fail_pending()
+
+        if self._transport:
+            try:
+                self._transport.close()
+            except Exception as exception_error:
+                self._log_error(str(exception_error))
+            self._transport = None
+            message = f"dali {self.name} communication closed"
+            _LOGGER.warning(message)
+
+    @callback
+    def _async_link_lost(self, exc: Exception | None = None) -> None:
+        """Flag the connection as dead, the supervisor reconnects it."""
+        if exc is not None:
+            self._log_error(f"connection lost: {exc}")
+        self._frames.put_nowait(None)
+        self._link_lost.set()
+
+    @callback
+    def _async_link_ready(self, since: float) -> None:
+        """Hook run when the link answers again, unready since `since`."""
+
+    async def async_wait_ready(self, timeout: float | None = None) -> bool:
+        """Wait until the gateway link is up and answering."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
     async def async_pb_connect(self) -> bool:
         """Connect client."""
         async with self._lock:
+            frames: asyncio.Queue[str | None] = asyncio.Queue()
+            self._frames = frames
+
+            @callback
+            def _async_lost(exc: Exception | None) -> None:
+                # ignore a late notice from a connection already replaced
+                if self._frames is frames:
+                    self._async_link_lost(exc)
+
+            transport = self._transport_class(
+                self._pb_params["host"], self._pb_params["port"],
+                frames.put_nowait, _async_lost,
+            )
             try:
-                self._client_reader, self._client_writer = await telnetlib3.open_connection(**self._pb_params)
-                # self._client.open(**self._pb_params)  # type: ignore[union-attr]
+                await transport.async_open()
             except Exception as exception_error:
                 self._log_error(str(exception_error), error_state=False)
                 return False
 
+            self._transport = transport
+            self._owed.clear()
+            self._missed_replies = 0
+            self._link_lost.clear()
+            self._breaker.try_reset()
+            self._dispatcher = self.hass.async_create_background_task(
+                self._async_dispatch(), f"dali-{self.name}-dispatcher"
+            )
             message = f"dali {self.name} communication open"
             _LOGGER.info(message)
             return True
 
-    # async def async_pb_connect(self) -> None:
-    #     """Connect to device, async."""
-    #     async with self._lock:
-    #         if not await self.hass.async_add_executor_job(self.pb_connect):
-    #             err = f"{self.name} connect failed, retry in dali-resi"
-    #             self._log_error(err, error_state=False)
-
-    # def pb_call(
-    #     self, command: str
-    # ) -> str | None:
-    #     """Call sync. telnetlib."""
-    #     line = None
-    #     try:
-    #         # cmd = command.encode('ascii') + b"\r\n"
-    #         # # cmd = "\r" + command + "\r"
-    #         # _LOGGER.debug( '### pb_call command: |%s|', cmd )
-    #         self._client.write( b"\r" + b"\r" + b"\r" +b"\r" + b"\n")
-    #         # self._client.write( b"\r" )
-    #         # asyncio.sleep(0.1)
-    #         # self._client.write( b"\r" )
-    #         # asyncio.sleep(0.1)
-    #         # self._client.write( b"\r" )
-    #         # asyncio.sleep(0.1)
-    #         self._client.write( b"\r" + b"\r" + b"\r" +b"\r" + b"\n" + command.encode('ascii') + b"\r" + b"\n" )
-    #         line = self._client.read_until(b"\r", self._msg_read_timeout).decode('ascii').rstrip()
-
-    #         _LOGGER.debug( '### pb_call command: %s %s | result: %s', command, command.encode('ascii'), line )
-    #     except Exception as exception_error:
-    #         self._log_error(str(exception_error))
-    #         return None
-        
-    #     return line
-    
+    async def _async_supervise(self) -> None:
+        """Keep the gateway connected, reconnecting with backoff."""
+        while True:
+            if not await self.async_pb_connect():
+                delay = self._backoff.next_delay()
+                _LOGGER.debug( '### dali %s reconnect attempt %d in %.1f s',
+                              self.name, self._backoff.attempts, delay )
+                await asyncio.sleep(delay)
+                continue
+
+            await self._link_lost.wait()
+            _LOGGER.warning( 'DALI Master integration %s link lost, reconnecting', self.name )
+            async with self._lock:
+                self._async_drop_link()
+            self._reconnects += 1
+            # back off on the first retry as well, the gateway may be rebooting
+            await asyncio.sleep(self._backoff.next_delay())
+
+    @callback
+    def _async_fail_pending(self) -> None:
+        """Release every queued or in-flight request with no result."""
+        while self._inflight:
+            entry = self._inflight.popleft()
+            if not entry.future.done():
+                entry.future.set_result(None)
+        for entry in self._pending.drain():
+            if not entry.future.done():
+                entry.future.set_result(None)
+
+    def _drop_stale_frames(self) -> None:
+        """Discard frames nobody is waiting for before a new request."""
+        while not self._frames.empty():
+            frame = self._frames.get_nowait()
+            if frame is None:
+                # keep the end of stream marker for the next reader
+                self._frames.put_nowait(None)
+                return
+            _LOGGER.debug( '### dali %s dropped unsolicited frame %s', self.name, repr(frame) )
+
+    @staticmethod
+    def _reply_kind(command: str) -> str:
+        """Return the class of `command`, by what it puts on the bus."""
+        if command.startswith(RESICMD[LAMP_COMMAND_ANSWER][NAME]):
+            return REPLY_QUERY
+        if command.startswith(RESICMD[LAMP_COMMAND_REPEAT][NAME]):
+            return REPLY_REPEAT
+        if command.startswith((
+            RESICMD[LAMP_QUERY_TC][NAME], RESICMD[LAMP_QUERY_RGBWAF][NAME],
+            RESICMD[LAMP_TC_KELVIN][NAME], RESICMD[LAMP_RGBWAF][NAME],
+        )):
+            return REPLY_DT8
+        return REPLY_COMMAND
+
+    async def _async_collect_owed(self) -> str | None:
+        """Wait for the replies owed to timed out requests and discard them.
+
+        RESI replies carry nothing tying them to their request, a late one
+        would be taken for the answer to the next request. Each is waited
+        for until the ceiling of its request has passed. Returns the last
+        late reply.
+        """
+        late = None
+        while self._owed:
+            if not self._frames.empty():
+                frame = self._frames.get_nowait()
+            else:
+                remaining = self._owed[0] - self.hass.loop.time()
+                if remaining <= 0:
+                    self._owed.popleft()
+                    continue
+                try:
+                    frame = await asyncio.wait_for(self._frames.get(), timeout=remaining)
+                except asyncio.exceptions.TimeoutError:
+                    self._owed.popleft()
+                    continue
+            if frame is None:
+                # keep the end of stream marker for the next reader
+                self._frames.put_nowait(None)
+                self._owed.clear()
+                return None
+            self._owed.popleft()
+            self._late_replies += 1
+            _LOGGER.debug( '### dali %s discarded late reply %s', self.name, repr(frame) )
+            late = frame
+        return late
+
+    async def _async_transact(self, command: str, retransmit: bool = False) -> str | None:
+        """Write one command frame and wait for the CR terminated reply.
+
+        Round trips of retransmitted frames are not sampled, a late reply
+        to the first attempt would make the link look faster than it is.
+        """
+        late = await self._async_collect_owed()
+        if retransmit and late is not None and late.startswith('#'):
+            # the first attempt was only slow, its reply answers this request
+            return late
+        self._drop_stale_frames()
+        reply_timeout = self._reply_timeouts[self._reply_kind(command)]
+        self._bus_budget.consume(self.hass.loop.time())
+
+        if self._msg_wait:
+            # small delay until next request/response
+            await asyncio.sleep(self._msg_wait) 
+
+        transport = self._transport
+        payload = command.encode('ascii')
+        if self._coalesced:
+            transport.write(PB_COALESCED_PREAMBLE + payload + PB_TERMINATOR)
+            await transport.async_drain()
+        else:
+            transport.write(PB_PREAMBLE)
+            if self._pacing.preamble_gap:
+                await asyncio.sleep(self._pacing.preamble_gap)
+            transport.write(payload)
+            if self._pacing.command_gap:
+                await asyncio.sleep(self._pacing.command_gap)
+            transport.write(PB_TERMINATOR)
+        sent = self.hass.loop.time()
+        try:
+            result = await asyncio.wait_for(self._frames.get(), timeout=reply_timeout.timeout)
+        except asyncio.exceptions.TimeoutError:
+            self._pacing.record_error()
+            self._owed.append(sent + reply_timeout.ceiling)
+            reply_timeout.record_timeout()
+            self._missed_replies += 1
+            if self._missed_replies >= LINK_DEAD_TIMEOUTS:
+                self._log_error(f"no reply to {self._missed_replies} requests in a row, dropping the link")
+                self._async_link_lost()
+            return ''
+
+        if result is None:
+            # end of stream, the link is gone
+            return None
+        self._missed_replies = 0
+        if result.startswith('#'):
+            turnaround = self.hass.loop.time() - sent
+            self._pacing.record_reply(turnaround)
+            if not retransmit:
+                reply_timeout.record_sample(turnaround)
+        else:
+            _LOGGER.debug( '### dali %s garbled reply %s to %s', self.name, repr(result), command )
+            self._pacing.record_error()
+        return result
+
+    @property
+    def statistics(self) -> dict[str, Any]:
+        """Return the values learned about the gateway."""
+        return {
+            "connected": self._transport is not None and self._transport.connected,
+            "pending": self._pending.depth(),
+            "coalesced_write": self._coalesced,
+            "pacing": self._pacing.as_dict(),
+            "reply_timeout": {
+                kind: reply_timeout.as_dict() for kind, reply_timeout in self._reply_timeouts.items()
+            },
+            "late_replies": self._late_replies,
+            "retransmits": self._retransmits,
+            "sequences": self._sequences,
+            "bus_budget": self._bus_budget.as_dict(),
+            "dropped": {
+                "expired": self._dropped_expired,
+                "cancelled": self._dropped_cancelled,
+            },
+            "breaker": self._breaker.as_dict(),
+            "reconnects": self._reconnects,
+        }
+
+    async def _async_probe_link(self) -> bool:
+        """Check a new connection answers, and whether it takes single write frames."""
+        probe = (
+            RESICMD[LAMP_COMMAND_ANSWER][NAME] + "0="
+            + DALICMD[QUERY_CONTROL_GEAR_PRESENT][OPCODE]
+        )
+        if self._coalesce_writes:
+            self._coalesced = True
+            result = await self._async_transact(probe)
+            if result and result.startswith('#'):
+                _LOGGER.debug( '### dali %s single write frames accepted: %s', self.name, result )
+                return True
+            _LOGGER.warning( 'dali %s gateway rejected single write frames (%s), using split writes',
+                            self.name, repr(result) )
+
+        self._coalesced = False
+        result = await self._async_transact(probe)
+        return bool(result) and result.startswith('#')
+
+    async def _async_dispatch(self) -> None:
+        """Serve queued requests by priority, FIFO within a priority."""
+        try:
+            alive = await self._async_probe_link()
+        except Exception as exception_error:
+            self._log_error(f"link probe failed: {exception_error}")
+            alive = False
+        if not alive:
+            self._async_link_lost()
+            return
+        self._breaker.reset()
+        self._backoff.reset()
+        self._in_error = False
+        self._ready.set()
+        since, self._unready_since = self._unready_since, None
+        self._async_link_ready(since if since is not None else self.hass.loop.time())
+
+        while True:
+            await self._pending.async_wait()
+            entry = self._pending.pop()
+            future = entry.future
+            if future.done():
+                # caller went away or its owner cancelled it while queued
+                self._dropped_cancelled += 1
+                continue
+            if entry.expired(self.hass.loop.time()):
+                _LOGGER.debug( '### dali %s dropped expired request %s', self.name, entry.command )
+                self._dropped_expired += 1
+                future.set_result(None)
+                continue
+
+            self._inflight.append(entry)
+            try:
+                if isinstance(entry.command, tuple):
+                    results = await self._async_send_sequence(entry.command)
+                    result = results[-1] if results else ''
+                else:
+                    result = results = await self._async_send(entry.command)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception_error:
+                self._log_error(str(exception_error))
+                result = results = None
+            self._inflight.popleft()
+
+            if not future.done():
+                future.set_result(results)
+            # _LOGGER.debug( '### async_pb_call command {%s} response {%s}', command, result)
+
+            if result is None or self._link_lost.is_set():
+                self._async_link_lost()
+                return
+
+    async def _async_send(self, command: str) -> str | None:
+        """Transact `command`, resending it while the reply times out."""
+        result = await self._async_transact(command)
+        attempt = 0
+        while result == '' and attempt < self._retries and not self._link_lost.is_set():
+            # no reply in time, resend with the backed off timeout
+            attempt += 1
+            self._retransmits += 1
+            _LOGGER.debug( '### dali %s retry %d of %s', self.name, attempt, command )
+            result = await self._async_transact(command, retransmit=True)
+        return result
+
+    async def _async_send_sequence(self, commands: tuple[str, ...]) -> list[str | None]:
+        """Transact `commands` back to back, stopping at the first one not done.
+
+        A sequence is not given up half way once it started: ENABLE DEVICE
+        TYPE and a loaded DTR act on whatever frame comes next.
+        """
+        results = []
+        for command in commands:
+            result = await self._async_send(command)
+            results.append(result)
+            if result is None or not result.startswith(DALI_RESP_OK) or is_no_answer(result):
+                break
+        self._sequences += 1
+        return results
+
     async def async_pb_call(
         self, 
         request: any, 
     ) -> str | None:
-        """Convert async to sync dali call."""
+        """Queue a DALI request and wait for its reply."""
 
         # _LOGGER.debug( '### async_pb_call request: %s', str(request) )
 
-        command = request["command"]
-
-        async with self._lock:
-            if not self._client_reader:
-                return None   
+        return await self._async_queue(request["command"])
 
-            if self._msg_wait:
-                # small delay until next request/response
-                await asyncio.sleep(self._msg_wait) 
-
-            try:
-                result = (await asyncio.wait_for(self._client_reader.read(), timeout=0.5))
-            except asyncio.exceptions.TimeoutError as e:
-                result = ''
-
-            # await asyncio.sleep(0.2)
-            self._client_writer.write("\r\r\r\r")
-            await asyncio.sleep(0.1)
-            self._client_writer.write(command)
-            await asyncio.sleep(0.2)
-            self._client_writer.write("\r")
-            try:
-                result = (await asyncio.wait_for(self._client_reader.readuntil(separator=b'\r'), timeout=5)).decode().rstrip()
-            except asyncio.exceptions.TimeoutError as e:
-                result = ''
-
-            # result = await self.hass.async_add_executor_job(
-            #     self.pb_call, command
-            # )
+    async def async_pb_call_sequence(
+        self,
+        requests: list[dict[str, Any]],
+    ) -> list[str | None]:
+        """Queue DALI requests that must reach the bus with nothing in between.
+
+        Returns one reply per request, None for those not sent because the
+        link is down or an earlier one of the sequence failed.
+        """
+        replies: list[str | None] = [None] * len(requests)
+        results = await self._async_queue(tuple(request["command"] for request in requests))
+        for index, reply in enumerate(results or ()):
+            replies[index] = reply
+        return replies
+
+    async def _async_queue(self, command: str | tuple[str, ...]) -> Any:
+        """Queue `command` at the priority and in the scope of the caller, wait for it."""
+        if (not self._ready.is_set() and current_priority() == PRIORITY_INTERACTIVE
+                and self._supervisor is not None and not self._supervisor.done()):
+            # a user command during a reconnect waits for the link a little
+            await self.async_wait_ready(INTERACTIVE_READY_WAIT)
+
+        if not self._transport or not self._dispatcher or not self._breaker.allows_requests:
+            return None
 
-            if result is None:
-                _LOGGER.warning( 'DALI Master integration %s restart', self.name )
-                await self.async_restart()
+        scope = current_scope()
+        if scope.token is not None and scope.token.cancelled:
+            self._dropped_cancelled += 1
+            return None
 
-                
-            # _LOGGER.debug( '### async_pb_call command {%s} response {%s}', command, result)
-            return result
+        future = self.hass.loop.create_future()
+        self._pending.put(command, future, current_priority(), scope)
+        return await future
 
 class DALIRESIClient:
     """Thread safe wrapper class for telnetlib."""
@@ -806,6 +1290,15 @@ class DALIRESIMaster(DALIRESIClient3):
                             respTokenized[ 0 ], respTokenized[ 1 ], DALICMD[QUERY_MAX_LEVEL][TAG])
                     )
 
+                for query in (QUERY_PHYSICAL_MINIMUM, QUERY_POWER_ON_LEVEL,
+                              QUERY_SYSTEM_FAILURE_LEVEL, QUERY_FADE_TIME_FADE_RATE,
+                              QUERY_GROUPS_0_7, QUERY_GROUPS_8_15, QUERY_SCENE_LEVEL):
+                    if ACTION == DALICMD[query][NAME]:
+                        result.update(
+                            await self.async_decode_default_response(
+                                respTokenized[ 0 ], respTokenized[ 1 ], DALICMD[query][TAG])
+                        )
+
             elif COMMAND == LAMP_COMMAND: 
                 prefix = response if len(response) == 3 else respTokenized[ 0 ]
                 suffix = None if len(response) == 3 else respTokenized[ 1 ]
@@ -828,6 +1321,11 @@ class DALIRESIMaster(DALIRESIClient3):
                         respTokenized[ 0 ], respTokenized[ 1 ], RESICMD[LAMP_QUERY_TC][TAG]
                     )
                 )
+                # the answer is nested under its tag, surface the outcome
+                if DONE in result[RESICMD[LAMP_QUERY_TC][TAG]]:
+                    result[DONE] = True
+                else:
+                    result[ERROR] = True
 
             elif COMMAND == RESICMD[LAMP_QUERY_RGBWAF][NAME]:
                 result.update(
@@ -881,6 +1379,15 @@ class DALIRESIMaster(DALIRESIClient3):
                     )
                 )
 
+            elif COMMAND == RESICMD[DALI_CMD16][NAME]:
+                prefix = response if len(response) == 3 else respTokenized[ 0 ]
+                suffix = None if len(response) == 3 else respTokenized[ 1 ]
+                result.update(
+                    await self.async_decode_default_response(
+                        prefix, suffix, RESICMD[DALI_CMD16][TAG]
+                    )
+                )
+
 
         except Exception as e:
             result[ERROR] = True
@@ -900,46 +1407,293 @@ class DALIHub(DALIRESIMaster):
         """Initialize the DALI hub."""
         super().__init__(hass, client_config)
 
+        self._collapser = CommandCollapser()
+        self._query_cache = QueryCache(client_config.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL))
+        self.inventory = LampInventory(hass, client_config[CONF_HOST], client_config[CONF_PORT])
+        self._inventory_refresh: set[int] = set()
+        self._plan_queries = 0
+        self._plan_skipped = 0
+        self._segments: dict[str, Callable[[], None]] = {}
+        self._segment_lamps: dict[str, set[int]] = {}
+        self.quarantine = LampQuarantine(self.name)
+        self._lamps: set[int] = set()
+        self._lamp_keys: dict[int, str] = {}
+        self._scene_reads: set[tuple[int, int]] = set()
+        self._groups = GroupIndex()
+        self._group_commands = 0
+        self._group_frames = 0
+        self._group_fanout = 0
+        # a fade time stays programmed until the command relying on it is sent
+        self._fade_lock = asyncio.Lock()
+        self._fade_programs = 0
+        self._fanout = FanOutBatcher(
+            hass, self._lamps, self._groups,
+            client_config.get(CONF_FANOUT_WINDOW, DEFAULT_FANOUT_WINDOW),
+            client_config.get(CONF_BUS_COMPLETE, False),
+        )
+        self._verify = VerifyPolicy(
+            client_config.get(CONF_VERIFY, DEFAULT_VERIFY),
+            client_config.get(CONF_VERIFY_SAMPLE, DEFAULT_VERIFY_SAMPLE),
+        )
+        self.poller = PollScheduler(
+            hass, self.name,
+            client_config.get(CONF_POLL_BUDGET, DEFAULT_POLL_BUDGET),
+            client_config.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            client_config.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+            self._ready,
+            self._bus_budget,
+            self.quarantine,
+        )
+
+    async def async_setup(self) -> bool:
+        """Set up the client and resume polling."""
+        await self.inventory.async_load()
+        result = await super().async_setup()
+        self.poller.async_start()
+        return result
+
+    async def async_close(self) -> None:
+        """Stop polling and disconnect client."""
+        # a reloaded hub follows the switches with its own listeners
+        for unsubscribe in self._segments.values():
+            unsubscribe()
+        self._segments.clear()
+        self._segment_lamps.clear()
+        self.poller.async_stop()
+        await super().async_close()
+
+    @property
+    def statistics(self) -> dict[str, Any]:
+        """Return the values learned about the gateway and the bus."""
+        result = super().statistics
+        result["collapsed_commands"] = self._collapser.collapsed
+        result["poller"] = self.poller.as_dict()
+        result["query_cache"] = self._query_cache.as_dict()
+        result["inventory"] = self.inventory.as_dict()
+        result["query_plans"] = {
+            "planned": self._plan_queries,
+            "skipped": self._plan_skipped,
+        }
+        result["verify"] = self._verify.as_dict()
+        result["quarantine"] = self.quarantine.as_dict()
+        result["group_commands"] = {
+            "commands": self._group_commands,
+            "frames": self._group_frames,
+            "lamps_reached": self._group_fanout,
+        }
+        result["fade_programs"] = self._fade_programs
+        result["fanout"] = self._fanout.as_dict()
+        result["groups"] = self._groups.as_dict()
+        return result
+
+    @callback
+    def async_add_lamp(
+            self, lamp: int, groups: list[int] | None = None, key: str | None = None
+    ) -> None:
+        """Note a lamp entity at `lamp`, polled as `key`, and the groups it is a member of.
+
+        The groups read from the gear win over the configured ones.
+        """
+        self._lamps.add(lamp)
+        if key is not None:
+            self._lamp_keys[lamp] = key
+        if (mask := self.inventory.get(lamp, INV_GROUPS)) is not None:
+            self._groups.set_groups(lamp, mask)
+            return
+        mask = 0
+        for group in groups or ():
+            mask |= 1 << group
+        self._groups.set_groups(lamp, mask, confirmed=False)
+
+    def group_members(self, model: str, address: int) -> set[int]:
+        """Return the short addresses a group or broadcast command reaches."""
+        if model == DALIActionModel.ALL:
+            return set(self._lamps)
+        if model == DALIActionModel.GROUP:
+            return self._groups.members(address)
+        return {address}
+
+    @callback
+    def async_add_segment(self, segment: str, lamp: int | None = None) -> None:
+        """Follow the switch `segment`, the lamps it feeds are polled only while it is on."""
+        if lamp is not None:
+            self._segment_lamps.setdefault(segment, set()).add(lamp)
+        if segment in self._segments:
+            return
+        self._segments[segment] = async_track_state_change_event(
+            self.hass, segment, self._async_segment_changed
+        )
+        if (state := self.hass.states.get(segment)) is not None and state.state == STATE_OFF:
+            self.poller.async_suspend_segment(segment)
+
+    @callback
+    def _async_segment_changed(self, event: Event) -> None:
+        """Suspend or resync the lamps behind a switch that changed."""
+        segment = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        if new_state is not None and new_state.state == STATE_ON:
+            _LOGGER.debug( '### dali %s segment %s powered up, resync', self.name, segment )
+            # lamps that went silent with their power get a fresh chance
+            for lamp in self._segment_lamps.get(segment, ()):
+                self.quarantine.release(lamp)
+            self.poller.async_resume_segment(segment, SEGMENT_POWER_UP_DELAY)
+        elif new_state is not None and new_state.state == STATE_OFF:
+            _LOGGER.debug( '### dali %s segment %s powered down, suspended', self.name, segment )
+            self.poller.async_suspend_segment(segment)
+
+    @callback
+    def _async_link_ready(self, since: float) -> None:
+        """Warm up: the inventory is already loaded, sweep the lamp states."""
+        self.poller.async_sweep(since)
+
+    @callback
+    def _async_inventory_check(self, lamp: int) -> None:
+        """Read the inventory of `lamp` in the background when it is due."""
+        if (
+            lamp in self._inventory_refresh
+            or lamp in self.quarantine
+            or not self.inventory.due(lamp)
+        ):
+            return
+        self._inventory_refresh.add(lamp)
+        self.inventory.attempt(lamp)
+        self.hass.async_create_background_task(
+            self._async_refresh_inventory(lamp), f"dali-{self.name}-inventory-{lamp}"
+        )
+
+    async def _async_refresh_inventory(self, lamp: int) -> None:
+        """Query the capabilities and settings of `lamp` and store them."""
+        queries = (
+            (QUERY_DEVICE_TYPE, INV_DEVICE_TYPE),
+            (QUERY_MIN_LEVEL, INV_MIN_LEVEL),
+            (QUERY_MAX_LEVEL, INV_MAX_LEVEL),
+            (QUERY_PHYSICAL_MINIMUM, INV_PHYSICAL_MINIMUM),
+            (QUERY_POWER_ON_LEVEL, INV_POWER_ON_LEVEL),
+            (QUERY_SYSTEM_FAILURE_LEVEL, INV_SYSTEM_FAILURE_LEVEL),
+            (QUERY_FADE_TIME_FADE_RATE, None),
+            (QUERY_GROUPS_0_7, None),
+            (QUERY_GROUPS_8_15, None),
+        )
+        groups = {}
+        values = {}
+        try:
+            # not bound to the entity or command that noticed it was due
+            with detached_scope(), request_priority(PRIORITY_POLL):
+                for query, field in queries:
+                    await self._async_bus_pause()
+                    response = await self._async_dali_1_lamp_answer(lamp, query)
+                    if not (DONE in response and response[DONE]):
+                        if query == QUERY_DEVICE_TYPE:
+                            # lamp silent or powered off, try again later
+                            return
+                        continue
+                    value = response[DALICMD[query][TAG]]
+                    if query == QUERY_FADE_TIME_FADE_RATE:
+                        values[INV_FADE_TIME] = value >> 4
+                        values[INV_FADE_RATE] = value & 0x0F
+                    elif query in (QUERY_GROUPS_0_7, QUERY_GROUPS_8_15):
+                        groups[query] = value
+                    else:
+                        values[field] = value
+        finally:
+            self._inventory_refresh.discard(lamp)
+
+        if len(groups) == 2:
+            values[INV_GROUPS] = groups[QUERY_GROUPS_0_7] | groups[QUERY_GROUPS_8_15] << 8
+            self._groups.set_groups(lamp, values[INV_GROUPS])
+        self.inventory.update(lamp, values)
+        _LOGGER.debug( '### dali %s inventory of lamp %d: %s', self.name, lamp, str(values) )
+
+    async def _async_bus_pause(self) -> None:
+        """Wait until the bus budget is out of debt, background reads go after the rest."""
+        if (delay := self._bus_budget.delay(self.hass.loop.time())) > 0:
+            await asyncio.sleep(delay)
+
+    def _clamp_level(self, lamp: int, level: int) -> int:
+        """Keep a non zero level inside the MIN/MAX LEVEL of `lamp`."""
+        min_level = self.inventory.get(lamp, INV_MIN_LEVEL)
+        max_level = self.inventory.get(lamp, INV_MAX_LEVEL)
+        if min_level is not None and level < min_level:
+            return min_level
+        if max_level is not None and level > max_level:
+            return max_level
+        return level
+
+    def _record_answer(self, lamp: int, dali_response: str | None, decoded: dict[str, Any]) -> None:
+        """Keep the quarantine of `lamp` up to date with the outcome of a query."""
+        if DONE in decoded and decoded[DONE]:
+            self.quarantine.record(lamp, True)
+        elif is_no_answer(dali_response) and self._ready.is_set():
+            self.quarantine.record(lamp, False)
+
 # ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
 # PRIVATE Query methods
 # ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
         
     async def _async_dali_1_lamp_answer(self, lamp: int, command: str) -> None:
-        dali_request = await self.async_build_request(
-            RESICMD[LAMP_COMMAND_ANSWER],
-            DALICMD[command],
-            lamp, '=' + DALICMD[command][OPCODE]
-        )
-        dali_response = await self.async_pb_call(dali_request)
-        decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+        async def _async_query():
+            dali_request = await self.async_build_request(
+                RESICMD[LAMP_COMMAND_ANSWER],
+                DALICMD[command],
+                lamp, '=' + DALICMD[command][OPCODE]
+            )
+            dali_response = await self.async_pb_call(dali_request)
+            decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+            self._record_answer(lamp, dali_response, decoded_response)
 
-        # _LOGGER.debug( '### _async_dali_1_lamp_answer %s', str(decoded_response) )
-        return decoded_response
+            # _LOGGER.debug( '### _async_dali_1_lamp_answer %s', str(decoded_response) )
+            return decoded_response
+
+        return await self._query_cache.async_query((lamp, command), _async_query)
     
+    async def _async_dali_scene_level_query(self, lamp: int, scene: int) -> None:
+        async def _async_query():
+            dali_request = await self.async_build_request(
+                RESICMD[LAMP_COMMAND_ANSWER],
+                DALICMD[QUERY_SCENE_LEVEL],
+                lamp, f'=0x{frames.opcode(QUERY_SCENE_LEVEL) + scene:02X}'
+            )
+            dali_response = await self.async_pb_call(dali_request)
+            decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+            self._record_answer(lamp, dali_response, decoded_response)
+
+            # _LOGGER.debug( '### _async_dali_scene_level_query %s', str(decoded_response) )
+            return decoded_response
+
+        return await self._query_cache.async_query((lamp, QUERY_SCENE_LEVEL, scene), _async_query)
+
     async def _async_dali_20_dt8_rgbwaf_lamp_query(self, lamp: int, channels: int) -> None:
-        dali_request = await self.async_build_request(
-            RESICMD[LAMP_QUERY_RGBWAF],
-            None,
-            lamp, ',' + str(channels)
-        )
-        dali_response = await self.async_pb_call(dali_request)
-        decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+        async def _async_query():
+            dali_request = await self.async_build_request(
+                RESICMD[LAMP_QUERY_RGBWAF],
+                None,
+                lamp, ',' + str(channels)
+            )
+            dali_response = await self.async_pb_call(dali_request)
+            decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+            self._record_answer(lamp, dali_response, decoded_response)
 
-        # _LOGGER.debug( '### _async_dali_20_dt8_rgbwaf_lamp_query %s', str(decoded_response) )
+            # _LOGGER.debug( '### _async_dali_20_dt8_rgbwaf_lamp_query %s', str(decoded_response) )
 
-        return decoded_response
+            return decoded_response
+
+        return await self._query_cache.async_query((lamp, LAMP_QUERY_RGBWAF, channels), _async_query)
     
     async def _async_dali_20_dt8_cw_ww_lamp_query(self, lamp: int) -> None:
-        dali_request = await self.async_build_request(
-            RESICMD[LAMP_QUERY_TC],
-            None,
-            lamp, ''
-        )
-        dali_response = await self.async_pb_call(dali_request)
-        decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+        async def _async_query():
+            dali_request = await self.async_build_request(
+                RESICMD[LAMP_QUERY_TC],
+                None,
+                lamp, ''
+            )
+            dali_response = await self.async_pb_call(dali_request)
+            decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+            self._record_answer(lamp, dali_response, decoded_response)
 
-        # _LOGGER.debug( '### _async_dali_20_dt8_cw_ww_lamp_query %s', str(decoded_response) )
-        return decoded_response
+            # _LOGGER.debug( '### _async_dali_20_dt8_cw_ww_lamp_query %s', str(decoded_response) )
+            return decoded_response
+
+        return await self._query_cache.async_query((lamp, LAMP_QUERY_TC), _async_query)
     
     
 # ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
@@ -953,6 +1707,7 @@ class DALIHub(DALIRESIMaster):
             lamp, '=' + DALICMD[command][OPCODE]
         )
         dali_response = await self.async_pb_call(dali_request)
+        self._query_cache.invalidate(lamp)
         decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
 
         # _LOGGER.debug( '### _async_dali_1_lamp_command %s', str(decoded_response) )
@@ -966,6 +1721,7 @@ class DALIHub(DALIRESIMaster):
             lamp, ''
         )
         dali_response = await self.async_pb_call(dali_request)
+        self._query_cache.invalidate(lamp)
         decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
 
         # _LOGGER.debug( '### _async_dali_1_lamp_command %s', str(decoded_response) )
@@ -979,6 +1735,7 @@ class DALIHub(DALIRESIMaster):
             lamp, '=' + str(level if level < 255 else 254)
         )
         dali_response = await self.async_pb_call(dali_request)
+        self._query_cache.invalidate(lamp)
         decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
 
         # _LOGGER.debug( '### _async_dali_1_lamp_command %s', str(decoded_response) )
@@ -992,6 +1749,7 @@ class DALIHub(DALIRESIMaster):
             lamp, '=' + str(level if level < 255 else 254)
         )
         dali_response = await self.async_pb_call(dali_request)
+        self._query_cache.invalidate(lamp)
         decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
 
         # _LOGGER.debug( '### _async_dali_1_lamp_command %s', str(decoded_response) )
@@ -1004,6 +1762,7 @@ class DALIHub(DALIRESIMaster):
             lamp, ',' + str(level) + ',' + str(kelvin)
         )
         dali_response = await self.async_pb_call(dali_request)
+        self._query_cache.invalidate(lamp)
         decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
 
         # _LOGGER.debug( '### _async_dali_20_dt8_cw_ww_lamp_query %s', str(decoded_response) )
@@ -1035,6 +1794,7 @@ class DALIHub(DALIRESIMaster):
         )
 
         dali_response = await self.async_pb_call(dali_request)
+        self._query_cache.invalidate(lamp)
         response = await self.async_decode_dali_master_response(dali_response, dali_request)
 
         return response
@@ -1044,19 +1804,27 @@ class DALIHub(DALIRESIMaster):
 # ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
 
     async def async_dali_retrieve_min_level(self, lamp: int) -> None:
+        self._async_inventory_check(lamp)
+        if (min_level := self.inventory.get(lamp, INV_MIN_LEVEL)) is not None:
+            return { DONE: True, DALICMD[QUERY_MIN_LEVEL][TAG]: min_level }
+
         command_response = await self._async_dali_1_lamp_answer(lamp, QUERY_MIN_LEVEL)
         if DONE in command_response and command_response[DONE]:
             _LOGGER.debug( '### async_dali_retrieve_min_level %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_retrieve_min_level %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_retrieve_min_level %s', str(command_response) )
         return command_response
     
     async def async_dali_retrieve_max_level(self, lamp: int) -> None:
+        self._async_inventory_check(lamp)
+        if (max_level := self.inventory.get(lamp, INV_MAX_LEVEL)) is not None:
+            return { DONE: True, DALICMD[QUERY_MAX_LEVEL][TAG]: max_level }
+
         command_response = await self._async_dali_1_lamp_answer(lamp, QUERY_MAX_LEVEL)
         if DONE in command_response and command_response[DONE]:
             _LOGGER.debug( '### async_dali_retrieve_max_level %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_retrieve_max_level %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_retrieve_max_level %s', str(command_response) )
         return command_response
         
     async def async_dali_retrieve_actual_level(self, color_mode: str, lamp: int) -> None:
@@ -1069,7 +1837,7 @@ class DALIHub(DALIRESIMaster):
         if DONE in command_response and command_response[DONE]:  
             _LOGGER.debug( '### async_dali_retrieve_actual_level %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_retrieve_actual_level %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_retrieve_actual_level %s', str(command_response) )
         return command_response
 
     async def async_dali_20_dt8_retrieve_rgbww_lamp(self, lamp: int) -> any:
@@ -1077,7 +1845,7 @@ class DALIHub(DALIRESIMaster):
         if DONE in command_response and command_response[DONE]:  
             _LOGGER.debug( '### async_dali_20_dt8_retrieve_rgbww_lamp %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_20_dt8_retrieve_rgbww_lamp %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_20_dt8_retrieve_rgbww_lamp %s', str(command_response) )
         return command_response
     
     async def async_dali_20_dt8_retrieve_rgb_lamp(self, lamp: int) -> any:
@@ -1085,7 +1853,7 @@ class DALIHub(DALIRESIMaster):
         if DONE in command_response and command_response[DONE]:  
             _LOGGER.debug( '### async_dali_20_dt8_retrieve_rgb_lamp %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_20_dt8_retrieve_rgb_lamp %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_20_dt8_retrieve_rgb_lamp %s', str(command_response) )
         return command_response
         
     async def async_dali_20_dt8_retrieve_cw_ww_lamp(self, lamp: int):
@@ -1093,15 +1861,23 @@ class DALIHub(DALIRESIMaster):
         if DONE in command_response and command_response[DONE]:  
             _LOGGER.debug( '### async_dali_20_dt8_retrieve_cw_ww_lamp %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_20_dt8_retrieve_cw_ww_lamp %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_20_dt8_retrieve_cw_ww_lamp %s', str(command_response) )
         return command_response
     
     async def async_dali_retrieve_device_type(self, lamp: int) -> any:
+        self._async_inventory_check(lamp)
+        if (device_type := self.inventory.get(lamp, INV_DEVICE_TYPE)) is not None:
+            return {
+                DONE: True,
+                DALICMD[QUERY_DEVICE_TYPE][TAG]: device_type,
+                DALICMD[QUERY_DEVICE_TYPE][TAG]+NAME: DALI_DEVICE_TYPES.get(device_type, str(device_type)),
+            }
+
         command_response = await self._async_dali_1_lamp_answer(lamp, QUERY_DEVICE_TYPE)
         if DONE in command_response and command_response[DONE]:        
             _LOGGER.debug( '### async_dali_retrieve_device_type %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_retrieve_device_type %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_retrieve_device_type %s', str(command_response) )
         return command_response
 
     async def async_dali_retrieve_device_status(self, lamp: int) -> any:
@@ -1109,40 +1885,161 @@ class DALIHub(DALIRESIMaster):
         if DONE in command_response and command_response[DONE]:
             _LOGGER.debug( '### async_dali_retrieve_device_status %s', str(command_response) )
         else:
-            _LOGGER.error( '### async_dali_retrieve_device_status %s', str(command_response) )
+            _LOGGER.log( self.quarantine.log_level(lamp), '### async_dali_retrieve_device_status %s', str(command_response) )
         return command_response
 
+    async def async_dali_execute_plan(self, lamp: int, plan: QueryPlan) -> dict[str, Any] | None:
+        """Run the transactions of `plan` against `lamp` and merge the answers.
+
+        None when the lamp answered none of them, a device type the
+        inventory knows does not count as an answer.
+        """
+        result = { 'lamp': lamp }
+        answered = False
+        arc_off = False
+        self._plan_queries += plan.transactions
+
+        for step in plan.steps:
+            if step.skip_if_off and arc_off:
+                # nothing to read back from a lamp that is off
+                self._plan_skipped += 1
+                result["brightness"] = 0
+                continue
+
+            if step.query == Query.DEVICE_TYPE:
+                response = await self.async_dali_retrieve_device_type(lamp)
+                if DONE in response and response[DONE]:
+                    result['query_device_type'] = response[DALICMD[QUERY_DEVICE_TYPE][TAG]]
+                    result['query_device_typename'] = response[DALICMD[QUERY_DEVICE_TYPE][TAG]+NAME]
+
+            elif step.query == Query.STATUS:
+                response = await self.async_dali_retrieve_device_status(lamp)
+                if DONE in response and response[DONE]:
+                    answered = True
+                    result.update(response['query_status'])
+                    arc_off = not response['query_status']['lampArcPowerOn']
+
+            elif step.query == Query.ACTUAL_LEVEL:
+                response = await self._async_dali_1_lamp_answer(lamp, QUERY_ACTUAL_LEVEL)
+                if DONE in response and response[DONE]:
+                    answered = True
+                    result["brightness"] = response['query_actual_level']
+
+            elif step.query == Query.TC:
+                response = await self.async_dali_20_dt8_retrieve_cw_ww_lamp(lamp)
+                if DONE in response and response[DONE]:
+                    answered = True
+                    if "brightness" in response['query_tc']:
+                        result["brightness"] = response['query_tc']["brightness"]
+                    result["kelvin"] = response['query_tc']["kelvin"]
+
+            elif step.query == Query.RGB:
+                response = await self.async_dali_20_dt8_retrieve_rgb_lamp(lamp)
+                if DONE in response and response[DONE]:
+                    answered = True
+                    result["rgb_color"] = [
+                        int(response['red']), int(response['green']), int(response['blue'])
+                    ]
+                    result["brightness"] = int(response['arc_level'])
+
+            elif step.query == Query.RGBWW:
+                response = await self.async_dali_20_dt8_retrieve_rgbww_lamp(lamp)
+                if DONE in response and response[DONE]:
+                    answered = True
+                    result["rgbww_color"] = [
+                        int(response['red']), int(response['green']), int(response['blue']),
+                        int(response['white']), int(response['amber'])
+                    ]
+                    result["brightness"] = int(response['arc_level'])
+
+        return result if answered else None
+
 # ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
 # PUBLIC Command methods
 # ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
 
+    @with_priority(PRIORITY_INTERACTIVE)
     async def async_dali_recall_off(self, device_type: int, color_mode: str, lamp: int) -> None:
+        return await self._fanout.async_submit(
+            (LAMP_OFF,), lamp,
+            self.async_dali_group_recall_off,
+            lambda: self._collapser.async_run(
+                lamp,
+                lambda: self._async_dali_recall_off(device_type, color_mode, lamp)
+            )
+        )
+
+    async def _async_dali_recall_off(self, device_type: int, color_mode: str, lamp: int) -> None:
         command_response = await self._async_dali_1_lamp_command(lamp, OFF)
         command_response = await self._async_dali_1_lamp_off_command(lamp)
         # if ERROR in command_response and command_response[ERROR]:
+        command_response[TARGET_LEVEL] = 0
 
         _LOGGER.debug( '### async_dali_recall_off %s || command_response: %s', 
                         str(command_response), str(command_response) )
         return command_response
             
-    async def async_dali_recall_level(self, device_type: int, color_mode: str, lamp: int, level: int) -> None:
-        if level > 0:
-            command_response = await self._async_dali_1_lamp_arc_power_command(lamp, level)
-            if (DONE in command_response and command_response[DONE]):
-                query_response = await self.async_dali_retrieve_actual_level(color_mode, lamp)
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_recall_level(
+            self, device_type: int, color_mode: str, lamp: int, level: int,
+            verify: str | None = None, transition: float | None = None
+    ) -> None:
+        fade = None if transition is None else frames.fade_time(transition)
+        return await self._fanout.async_submit(
+            (LAMP_ARC_POWER, level, fade), lamp,
+            lambda model, address: self.async_dali_group_recall_level(model, address, level, transition),
+            lambda: self._collapser.async_run(
+                lamp,
+                lambda: self._async_dali_recall_level(
+                    device_type, color_mode, lamp, level, verify, transition
+                )
+            )
+        )
+
+    async def _async_dali_recall_level(
+            self, device_type: int, color_mode: str, lamp: int, level: int,
+            verify: str | None = None, transition: float | None = None
+    ) -> None:
+        if level > 0 or transition is not None:
+            # the gear clamps anyway, asking for what it will do keeps the read back in step
+            level = self._clamp_level(lamp, level) if level > 0 else 0
+            async with self._fade_lock:
+                # the gear fades by itself, one arc power whatever the transition
+                await self._async_dali_fade_time({lamp}, transition)
+                command_response = await self._async_dali_1_lamp_arc_power_command(lamp, level)
+            if not (DONE in command_response and command_response[DONE]):
+                self._verify.record(lamp, False)
+            elif transition is None and self._verify.should_verify(lamp, verify):
+                with request_priority(PRIORITY_VERIFY):
+                    query_response = await self.async_dali_retrieve_actual_level(color_mode, lamp)
                 if (DONE in query_response and query_response[DONE]):
-                    if( (level if level < 255 else 254) == query_response["query_actual_level"]):
+                    matched = (level if level < 255 else 254) == query_response["query_actual_level"]
+                    self._verify.record(lamp, matched)
+                    if matched:
                         command_response["query_actual_level"] = query_response["query_actual_level"]
                     else:
                         command_response = await self._async_dali_1_lamp_level(lamp, level)
         else:
-            command_response = await self.async_dali_recall_off(color_mode, lamp)
+            command_response = await self._async_dali_recall_off(device_type, color_mode, lamp)
 
+        # superseded callers get this response, it carries the level actually sent
+        command_response[TARGET_LEVEL] = level
         _LOGGER.debug( '### async_dali_recall_level %s || command_response: %s', 
                         str(command_response), str(command_response) )
         return command_response
         
+    @with_priority(PRIORITY_INTERACTIVE)
     async def async_dali_recall_max_level(self, color_mode: str, lamp: int) -> None:
+        return await self._fanout.async_submit(
+            (RECALL_MAX_LEVEL,), lamp,
+            self.async_dali_group_recall_max_level,
+            lambda: self._collapser.async_run(
+                lamp,
+                lambda: self._async_dali_recall_max_level(color_mode, lamp)
+            )
+        )
+
+    async def _async_dali_recall_max_level(self, color_mode: str, lamp: int) -> None:
         query_response = await self.async_dali_retrieve_max_level(lamp)
 
         command_response = await self._async_dali_1_lamp_command(lamp, RECALL_MAX_LEVEL)
@@ -1150,7 +2047,8 @@ class DALIHub(DALIRESIMaster):
             if (DONE in query_response and query_response[DONE]):
                 command_response["query_actual_level"] = query_response["query_max_level"]
             else:
-                query_response = await self.async_dali_retrieve_actual_level(color_mode, lamp)
+                with request_priority(PRIORITY_VERIFY):
+                    query_response = await self.async_dali_retrieve_actual_level(color_mode, lamp)
                 if (DONE in query_response and query_response[DONE]):
                     command_response["query_actual_level"] = query_response["query_actual_level"]
         
@@ -1159,38 +2057,483 @@ class DALIHub(DALIRESIMaster):
 
         return command_response
 
+    @with_priority(PRIORITY_INTERACTIVE)
     async def async_dali_recall_color_temperature_level(
             self, device_type: int, color_mode: str,
             lamp: int, level: int, kelvin: int
     ) -> None:
-        command_response = await self._async_dali_20_dt8_cw_ww_lamp_command(
-            lamp, 255 if level is None else ( 254 if level == 255 else level), kelvin
-         )
+        return await self._fanout.async_submit(
+            (LAMP_TC_KELVIN, level, kelvin), lamp,
+            lambda model, address: self.async_dali_group_recall_color_temperature_level(
+                model, address, level, kelvin
+            ),
+            lambda: self._collapser.async_run(
+                lamp,
+                lambda: self._async_dali_recall_color_temperature_level(
+                    device_type, color_mode, lamp, level, kelvin
+                )
+            )
+        )
+
+    async def _async_dali_recall_color_temperature_level(
+            self, device_type: int, color_mode: str,
+            lamp: int, level: int, kelvin: int
+    ) -> None:
+        async with self._fade_lock:
+            # a colour change does not fade, whatever a transition left in the gear
+            await self._async_dali_fade_time({lamp}, None)
+            command_response = await self._async_dali_20_dt8_cw_ww_lamp_command(
+                lamp, 255 if level is None else ( 254 if level == 255 else level), kelvin
+            )
+        command_response[TARGET_KELVIN] = kelvin
 
         _LOGGER.debug( '### async_dali_recall_color_temperature_level command_response: %s', 
                         str(command_response) )
         return command_response
 
+    @with_priority(PRIORITY_INTERACTIVE)
     async def async_dali_recall_rgb_level(
             self, device_type: int, color_mode: str,
             lamp: int, level: int, red: int, green: int, blue: int
     ) -> None:
-        command_response = await self._async_dali_20_dt8_rgbwaf_channels_lamp_command(
-            lamp, 255 if level is None else ( 254 if level == 255 else level),
-            red, green, blue, 0, 0
+        return await self._fanout.async_submit(
+            (LAMP_RGBWAF, level, red, green, blue), lamp,
+            lambda model, address: self.async_dali_group_recall_rgb_level(
+                model, address, level, red, green, blue
+            ),
+            lambda: self._collapser.async_run(
+                lamp,
+                lambda: self._async_dali_recall_rgb_level(
+                    device_type, color_mode, lamp, level, red, green, blue
+                )
+            )
         )
+
+    async def _async_dali_recall_rgb_level(
+            self, device_type: int, color_mode: str,
+            lamp: int, level: int, red: int, green: int, blue: int
+    ) -> None:
+        async with self._fade_lock:
+            await self._async_dali_fade_time({lamp}, None)
+            command_response = await self._async_dali_20_dt8_rgbwaf_channels_lamp_command(
+                lamp, 255 if level is None else ( 254 if level == 255 else level),
+                red, green, blue, 0, 0
+            )
+        command_response[TARGET_COLOR] = [red, green, blue]
         _LOGGER.debug( '### async_dali_recall_rgb_level command_response: %s', 
                         str(command_response) )
         return command_response
 
+    @with_priority(PRIORITY_INTERACTIVE)
     async def async_dali_recall_rgbww_level(
             self, device_type: int, color_mode: str,
             lamp: int, level: int, red: int, green: int, blue: int, white: int, amber: int
     ) -> None:
-        command_response = await self._async_dali_20_dt8_rgbwaf_channels_lamp_command(
-            lamp, 255 if level is None else ( 254 if level == 255 else level),
-            red, green, blue, white, amber
+        return await self._fanout.async_submit(
+            (LAMP_RGBWAF, level, red, green, blue, white, amber), lamp,
+            lambda model, address: self.async_dali_group_recall_rgbww_level(
+                model, address, level, red, green, blue, white, amber
+            ),
+            lambda: self._collapser.async_run(
+                lamp,
+                lambda: self._async_dali_recall_rgbww_level(
+                    device_type, color_mode, lamp, level, red, green, blue, white, amber
+                )
+            )
         )
+
+    async def _async_dali_recall_rgbww_level(
+            self, device_type: int, color_mode: str,
+            lamp: int, level: int, red: int, green: int, blue: int, white: int, amber: int
+    ) -> None:
+        async with self._fade_lock:
+            await self._async_dali_fade_time({lamp}, None)
+            command_response = await self._async_dali_20_dt8_rgbwaf_channels_lamp_command(
+                lamp, 255 if level is None else ( 254 if level == 255 else level),
+                red, green, blue, white, amber
+            )
+        command_response[TARGET_COLOR] = [red, green, blue, white, amber]
         _LOGGER.debug( '### async_dali_recall_rgbww_level command_response: %s', 
                         str(command_response) )
         return command_response
+
+# ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
+# PUBLIC Group and broadcast command methods
+# ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
+
+    async def _async_dali_fade_time(self, lamps: set[int], transition: float | None) -> None:
+        """Give `lamps` the fade time of `transition`, programming only those that differ.
+
+        Without a transition a lamp gets back the fade time it had before
+        the first one changed it, a lamp whose fade time cannot be read
+        first is left alone. DTR0 is loaded once per fade time and
+        STORE DTR AS FADETIME sent to each lamp needing it in the same
+        sequence. Each lamp is read back, and programmed once more if it
+        holds something else, before the inventory takes the new value.
+        The caller holds the fade lock.
+        """
+        wanted: dict[int, list[int]] = {}
+        for lamp in sorted(lamps):
+            if transition is None:
+                fade = self.inventory.get(lamp, INV_FADE_DEFAULT)
+                if fade is None:
+                    # never changed by a transition
+                    continue
+            else:
+                fade = frames.fade_time(transition)
+                if not await self._async_keep_fade_default(lamp):
+                    # nothing to go back to later, the lamp fades as it is set up
+                    continue
+            if fade != self.inventory.get(lamp, INV_FADE_TIME):
+                wanted.setdefault(fade, []).append(lamp)
+
+        for fade, todo in wanted.items():
+            for _ in range(2):
+                store = [ await self.async_build_request(
+                    RESICMD[DALI_CMD16], None, frames.frame_hex(frames.special(SET_DTR, fade)), ''
+                ) ]
+                for lamp in todo:
+                    store.append(await self.async_build_request(
+                        RESICMD[LAMP_COMMAND_REPEAT],
+                        DALICMD[STORE_DTR_AS_FADETIME],
+                        lamp, '=' + DALICMD[STORE_DTR_AS_FADETIME][OPCODE]
+                    ))
+                responses = await self._async_dali_sequence(store)
+                if not (DONE in responses[0] and responses[0][DONE]):
+                    break
+                stored = {
+                    lamp for lamp, response in zip(todo, responses[1:])
+                    if DONE in response and response[DONE]
+                }
+                todo = [
+                    lamp for lamp in todo
+                    if lamp not in stored or not await self._async_check_fade_time(lamp, fade)
+                ]
+                if not todo:
+                    break
+
+    async def _async_keep_fade_default(self, lamp: int) -> bool:
+        """Note the fade time `lamp` has before a transition first changes it.
+
+        The gear is asked unless the inventory holds it. False when it
+        stays unknown.
+        """
+        if self.inventory.get(lamp, INV_FADE_DEFAULT) is not None:
+            return True
+        values = {}
+        if (fade := self.inventory.get(lamp, INV_FADE_TIME)) is None:
+            response = await self._async_dali_1_lamp_answer(lamp, QUERY_FADE_TIME_FADE_RATE)
+            if not (DONE in response and response[DONE]):
+                return False
+            value = response[DALICMD[QUERY_FADE_TIME_FADE_RATE][TAG]]
+            fade = value >> 4
+            values = { INV_FADE_TIME: fade, INV_FADE_RATE: value & 0x0F }
+        values[INV_FADE_DEFAULT] = fade
+        self.inventory.update(lamp, values, refreshed=False)
+        return True
+
+    async def _async_check_fade_time(self, lamp: int, fade: int) -> bool:
+        """Read the fade time of `lamp` back into the inventory, True when it is `fade`."""
+        with request_priority(PRIORITY_VERIFY):
+            response = await self._async_dali_1_lamp_answer(lamp, QUERY_FADE_TIME_FADE_RATE)
+        if not (DONE in response and response[DONE]):
+            self._verify.record(lamp, False)
+            return False
+        value = response[DALICMD[QUERY_FADE_TIME_FADE_RATE][TAG]]
+        values = { INV_FADE_TIME: value >> 4, INV_FADE_RATE: value & 0x0F }
+        self.inventory.update(lamp, values, refreshed=False)
+        ok = values[INV_FADE_TIME] == fade
+        self._verify.record(lamp, ok)
+        if ok:
+            self._fade_programs += 1
+            _LOGGER.debug( '### dali %s lamp %d fade time %d', self.name, lamp, fade )
+        return ok
+
+    async def _async_dali_sequence(self, dali_requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Send `dali_requests` as one unit, nothing else reaches the bus in between."""
+        dali_responses = await self.async_pb_call_sequence(dali_requests)
+        result = []
+        for dali_request, dali_response in zip(dali_requests, dali_responses):
+            if isinstance(dali_request["address"], int):
+                self._query_cache.invalidate(dali_request["address"])
+            result.append(await self.async_decode_dali_master_response(dali_response, dali_request))
+        return result
+
+    async def _async_dali_cmd16(self, frame: int) -> dict[str, Any]:
+        dali_request = await self.async_build_request(
+            RESICMD[DALI_CMD16],
+            None,
+            frames.frame_hex(frame), ''
+        )
+        dali_response = await self.async_pb_call(dali_request)
+        decoded_response = await self.async_decode_dali_master_response(dali_response, dali_request)
+
+        # _LOGGER.debug( '### _async_dali_cmd16 %s', str(decoded_response) )
+        return decoded_response
+
+    async def _async_dali_group_command(
+            self, model: str, address: int, dali_frames: list[int], state: dict[str, Any],
+            transition: float | None = None
+    ) -> dict[str, Any]:
+        """Send `dali_frames` once for all the lamps of a group or of the bus.
+
+        The member lamps cannot answer a group query, their entities are
+        told the new `state` instead and are not polled for it.
+        """
+        dali_requests = [
+            await self.async_build_request(RESICMD[DALI_CMD16], None, frames.frame_hex(frame), '')
+            for frame in dali_frames
+        ]
+        async with self._fade_lock:
+            await self._async_dali_fade_time(self.group_members(model, address), transition)
+            # ENABLE DEVICE TYPE and the DTRs act on the next frame, nothing may come between
+            command_responses = await self._async_dali_sequence(dali_requests)
+        command_response = { ERROR: True }
+        for frame, command_response in zip(dali_frames, command_responses):
+            if not (DONE in command_response and command_response[DONE]):
+                _LOGGER.debug( '### dali %s %s %d frame %04X failed %s',
+                              self.name, model, address, frame, str(command_response) )
+                return command_response
+            self._group_frames += 1
+
+        members = self.group_members(model, address)
+        for lamp in members:
+            self._query_cache.invalidate(lamp)
+        self._group_commands += 1
+        self._group_fanout += len(members)
+        async_dispatcher_send(self.hass, SIGNAL_LAMP_STATE, self.name, members, state)
+        return command_response
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_group_recall_off(self, model: str, address: int) -> dict[str, Any]:
+        return await self._collapser.async_run(
+            (model, address),
+            lambda: self._async_dali_group_command(
+                model, address, [frames.command(model, address, OFF)], { "brightness": 0 }
+            )
+        )
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_group_recall_max_level(self, model: str, address: int) -> dict[str, Any]:
+        # every member goes to its own MAX LEVEL, the entities take it from the inventory
+        return await self._collapser.async_run(
+            (model, address),
+            lambda: self._async_dali_group_command(
+                model, address, [frames.command(model, address, RECALL_MAX_LEVEL)],
+                { "brightness": None }
+            )
+        )
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_group_recall_level(
+            self, model: str, address: int, level: int, transition: float | None = None
+    ) -> dict[str, Any]:
+        return await self._collapser.async_run(
+            (model, address),
+            lambda: self._async_dali_group_recall_level(model, address, level, transition)
+        )
+
+    async def _async_dali_group_recall_level(
+            self, model: str, address: int, level: int, transition: float | None = None
+    ) -> dict[str, Any]:
+        if level > 0 or transition is not None:
+            # arc power 0 fades out, OFF does not
+            dali_frames = [frames.arc_power(model, address, level)]
+        else:
+            dali_frames = [frames.command(model, address, OFF)]
+        command_response = await self._async_dali_group_command(
+            model, address, dali_frames, { "brightness": min(level, 254) }, transition
+        )
+        if (level > 0 and transition is None
+                and DONE in command_response and command_response[DONE]):
+            await self._async_reverify_members(model, address, level)
+        command_response[TARGET_LEVEL] = level
+        _LOGGER.debug( '### async_dali_group_recall_level command_response: %s', 
+                        str(command_response) )
+        return command_response
+
+    async def _async_reverify_members(self, model: str, address: int, level: int) -> None:
+        """Read back the members that lately did not follow their commands.
+
+        The others are trusted, a group command costs no read back per lamp.
+        """
+        for lamp in sorted(self.group_members(model, address)):
+            if lamp in self.quarantine or not self._verify.needs_verify(lamp):
+                continue
+            expected = self._clamp_level(lamp, min(level, 254))
+            with request_priority(PRIORITY_VERIFY):
+                query_response = await self._async_dali_1_lamp_answer(lamp, QUERY_ACTUAL_LEVEL)
+            if not (DONE in query_response and query_response[DONE]):
+                continue
+            matched = query_response["query_actual_level"] == expected
+            self._verify.record(lamp, matched)
+            if not matched:
+                _LOGGER.debug( '### dali %s lamp %d missed group level %d, resent', self.name, lamp, expected )
+                await self._async_dali_1_lamp_arc_power_command(lamp, expected)
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_group_recall_color_temperature_level(
+            self, model: str, address: int, level: int | None, kelvin: int
+    ) -> dict[str, Any]:
+        return await self._collapser.async_run(
+            (model, address),
+            lambda: self._async_dali_group_recall_color(
+                model, address, level,
+                frames.colour_temperature(model, address, kelvin), { "kelvin": kelvin },
+                { TARGET_KELVIN: kelvin }
+            )
+        )
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_group_recall_rgb_level(
+            self, model: str, address: int, level: int | None, red: int, green: int, blue: int
+    ) -> dict[str, Any]:
+        return await self._collapser.async_run(
+            (model, address),
+            lambda: self._async_dali_group_recall_color(
+                model, address, level,
+                frames.rgbwaf(model, address, red, green, blue), { "rgb_color": [red, green, blue] },
+                { TARGET_COLOR: [red, green, blue] }
+            )
+        )
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_group_recall_rgbww_level(
+            self, model: str, address: int, level: int | None,
+            red: int, green: int, blue: int, white: int, amber: int
+    ) -> dict[str, Any]:
+        return await self._collapser.async_run(
+            (model, address),
+            lambda: self._async_dali_group_recall_color(
+                model, address, level,
+                frames.rgbwaf(model, address, red, green, blue, white, amber),
+                { "rgbww_color": [red, green, blue, white, amber] },
+                { TARGET_COLOR: [red, green, blue, white, amber] }
+            )
+        )
+
+    async def _async_dali_group_recall_color(
+            self, model: str, address: int, level: int | None,
+            dali_frames: list[int], state: dict[str, Any], target: dict[str, Any]
+    ) -> dict[str, Any]:
+        if level is not None:
+            # DT8 gear applies the activated colour with the arc power
+            dali_frames = dali_frames + [frames.arc_power(model, address, level)]
+            state = { **state, "brightness": min(level, 254) }
+        command_response = await self._async_dali_group_command(model, address, dali_frames, state)
+        command_response.update(target)
+        _LOGGER.debug( '### async_dali_group_recall_color command_response: %s', 
+                        str(command_response) )
+        return command_response
+
+# ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
+# PUBLIC Scene methods
+# ####### # ####### # ####### # ####### # ####### # ####### # ####### # #######
+
+    async def _async_dali_store_scene(self, lamp: int, scene: int, level: int) -> dict[str, Any]:
+        """Load `level` into DTR0 and store it as `scene` of `lamp`, sent twice.
+
+        Both go out as one sequence, nothing else can load DTR0 in between.
+        """
+        command_responses = await self._async_dali_sequence([
+            await self.async_build_request(
+                RESICMD[DALI_CMD16], None, frames.frame_hex(frames.special(SET_DTR, level)), ''
+            ),
+            await self.async_build_request(
+                RESICMD[LAMP_COMMAND_REPEAT],
+                DALICMD[STORE_THE_DTR_AS_SCENE_0],
+                lamp, f'=0x{frames.opcode(STORE_THE_DTR_AS_SCENE_0) + scene:02X}'
+            ),
+        ])
+        if not (DONE in command_responses[0] and command_responses[0][DONE]):
+            return command_responses[0]
+        return command_responses[1]
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_program_scene(self, scene: int, levels: dict[int, int]) -> dict[int, bool]:
+        """Store `levels` (short address: level) as `scene` and read each one back.
+
+        A lamp that reads back wrong is programmed once more. What was
+        stored goes into the scene table of the inventory.
+        """
+        result = {}
+        for lamp, level in sorted(levels.items()):
+            ok = False
+            for _ in range(2):
+                command_response = await self._async_dali_store_scene(lamp, scene, level)
+                if not (DONE in command_response and command_response[DONE]):
+                    break
+                with request_priority(PRIORITY_VERIFY):
+                    query_response = await self._async_dali_scene_level_query(lamp, scene)
+                if (DONE in query_response and query_response[DONE]
+                        and query_response[DALICMD[QUERY_SCENE_LEVEL][TAG]] == level):
+                    ok = True
+                    break
+            self._verify.record(lamp, ok)
+            result[lamp] = ok
+            if ok:
+                scenes = list(self.inventory.get(lamp, INV_SCENES) or [None] * DALI_SCENES)
+                scenes[scene] = level
+                self.inventory.update(lamp, { INV_SCENES: scenes }, refreshed=False)
+
+        _LOGGER.debug( '### async_dali_program_scene %d %s', scene, str(result) )
+        return result
+
+    @with_priority(PRIORITY_INTERACTIVE)
+    async def async_dali_recall_scene(self, scene: int, group: int | None = None) -> dict[str, Any]:
+        """Send GO TO SCENE to a group or to all, one frame for the whole room.
+
+        The lamps it reached take their level from the scene table, lamps
+        not in the scene keep theirs.
+        """
+        if group is None:
+            model, address = DALIActionModel.ALL, 0
+        else:
+            model, address = DALIActionModel.GROUP, group
+        command_response = await self._async_dali_cmd16(frames.scene(model, address, scene))
+        if not (DONE in command_response and command_response[DONE]):
+            return command_response
+        self._group_commands += 1
+
+        by_level: dict[int, set[int]] = {}
+        unknown = set()
+        for lamp in self.group_members(model, address):
+            self._query_cache.invalidate(lamp)
+            scenes = self.inventory.get(lamp, INV_SCENES)
+            level = scenes[scene] if scenes else None
+            if level is None:
+                unknown.add(lamp)
+            elif level != frames.MASK:
+                by_level.setdefault(level, set()).add(lamp)
+        for level, lamps in by_level.items():
+            async_dispatcher_send(self.hass, SIGNAL_LAMP_STATE, self.name, lamps, { "brightness": level })
+        if unknown:
+            # poll them soon, and learn the scene for the next recall
+            for lamp in unknown:
+                if (key := self._lamp_keys.get(lamp)) is not None:
+                    self.poller.async_mark_active(key)
+            self.hass.async_create_background_task(
+                self._async_learn_scene(unknown, scene), f"dali-{self.name}-scene-{scene}"
+            )
+
+        _LOGGER.debug( '### async_dali_recall_scene %d %s %d: %s unknown %s',
+                      scene, model, address, str(by_level), str(unknown) )
+        return command_response
+
+    async def _async_learn_scene(self, lamps: set[int], scene: int) -> None:
+        """Read the level `scene` has in each of `lamps` into the inventory."""
+        with detached_scope(), request_priority(PRIORITY_POLL):
+            for lamp in sorted(lamps):
+                if (lamp, scene) in self._scene_reads or lamp in self.quarantine:
+                    continue
+                self._scene_reads.add((lamp, scene))
+                try:
+                    await self._async_bus_pause()
+                    response = await self._async_dali_scene_level_query(lamp, scene)
+                finally:
+                    self._scene_reads.discard((lamp, scene))
+                if not (DONE in response and response[DONE]):
+                    continue
+                scenes = list(self.inventory.get(lamp, INV_SCENES) or [None] * DALI_SCENES)
+                scenes[scene] = response[DALICMD[QUERY_SCENE_LEVEL][TAG]]
+                self.inventory.update(lamp, { INV_SCENES: scenes }, refreshed=False)
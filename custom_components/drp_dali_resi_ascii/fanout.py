@@ -0,0 +1,173 @@
+"""Turn bursts of identical lamp commands into group or broadcast commands."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import copy
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DALIActionModel, DEFAULT_FANOUT_WINDOW
+from .dali_const import DONE
+from .groups import GroupIndex
+from .scheduler import PRIORITY_INTERACTIVE, detached_scope, request_priority
+
+_LOGGER = logging.getLogger(__name__)
+
+GroupCommand = Callable[[str, int], Awaitable[dict[str, Any]]]
+
+
+@dataclass
+class _Batch:
+    """Lamps asked for the same target within one window."""
+
+    group_command: GroupCommand
+    futures: dict[int, asyncio.Future] = field(default_factory=dict)
+
+
+class FanOutBatcher:
+    """Collect lamp commands for `window` seconds and send them per group.
+
+    Lamps given the same target (say level 200, or off) during the window
+    are matched against the known groups: when they are all the lamps of
+    the hub one broadcast is sent, otherwise every group whose members
+    all got that target gets one group command. The remaining lamps, and
+    everything when the window is 0, are sent their own command by the
+    caller as before.
+
+    Gear without a light entity would follow a broadcast or group command
+    too, so nothing is batched unless `complete` says every short address
+    on the bus is configured, and groups are only used once the groups of
+    every lamp were read from the gear.
+
+    A lamp given a new target while its previous one is still waiting
+    has the previous one sent right away, so the bus sees them in order.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        lamps: set[int],
+        groups: GroupIndex,
+        window: float = DEFAULT_FANOUT_WINDOW,
+        complete: bool = False,
+    ) -> None:
+        """Initialize the batcher on the hub's lamp and group index."""
+        self.hass = hass
+        self._lamps = lamps
+        self._groups = groups
+        self._window = window
+        self._complete = complete
+        self._batches: dict[Hashable, _Batch] = {}
+        self._pending: dict[int, Hashable] = {}
+        self._flush: asyncio.TimerHandle | None = None
+        self.submitted = 0
+        self.grouped = 0
+        self.group_commands = 0
+
+    async def async_submit(
+        self,
+        target: Hashable,
+        lamp: int,
+        group_command: GroupCommand,
+        single: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Give `lamp` the `target`, alone or with the other lamps asking for it."""
+        self.submitted += 1
+        if (self._window <= 0 or not self._complete
+                or (not self._groups and len(self._lamps) < 2)):
+            return await single()
+
+        if (previous := self._pending.get(lamp)) is not None:
+            # keep the order of the commands to one lamp
+            self._release(previous, lamp)
+
+        batch = self._batches.setdefault(target, _Batch(group_command))
+        future = self.hass.loop.create_future()
+        batch.futures[lamp] = future
+        self._pending[lamp] = target
+        if self._flush is None:
+            self._flush = self.hass.loop.call_later(self._window, self._async_flush)
+
+        try:
+            response = await future
+        except asyncio.CancelledError:
+            if self._pending.get(lamp) == target and batch.futures.get(lamp) is future:
+                del batch.futures[lamp]
+                del self._pending[lamp]
+            raise
+        if response is None:
+            return await single()
+        return response
+
+    def _release(self, target: Hashable, lamp: int) -> None:
+        """Let the waiting command of `lamp` go out on its own."""
+        batch = self._batches[target]
+        future = batch.futures.pop(lamp)
+        del self._pending[lamp]
+        if not future.done():
+            future.set_result(None)
+
+    def _async_flush(self) -> None:
+        self._flush = None
+        batches, self._batches = self._batches, {}
+        self._pending = {}
+        for target, batch in batches.items():
+            if len(batch.futures) < 2:
+                for future in batch.futures.values():
+                    if not future.done():
+                        future.set_result(None)
+                continue
+            self.hass.async_create_background_task(
+                self._async_send(target, batch), "dali-fanout"
+            )
+
+    def _cover(self, lamps: set[int]) -> list[tuple[str, int, set[int]]]:
+        """Return the group and broadcast commands that reach only `lamps`."""
+        if not self._complete:
+            return []
+        if len(lamps) > 1 and lamps >= self._lamps:
+            return [(DALIActionModel.ALL, 0, set(self._lamps))]
+        if not all(self._groups.confirmed(lamp) for lamp in self._lamps):
+            # a configured group may hold more gear than it claims
+            return []
+        left = set(lamps)
+        cover = []
+        for group, members in sorted(self._groups.items(), key=lambda item: -len(item[1])):
+            if len(members) > 1 and members <= left:
+                cover.append((DALIActionModel.GROUP, group, members))
+                left -= members
+        return cover
+
+    async def _async_send(self, target: Hashable, batch: _Batch) -> None:
+        try:
+            for model, address, members in self._cover(set(batch.futures)):
+                # the group command serves every caller, not the one that opened the window
+                with detached_scope(), request_priority(PRIORITY_INTERACTIVE):
+                    response = await batch.group_command(model, address)
+                if not (DONE in response and response[DONE]):
+                    continue
+                self.group_commands += 1
+                self.grouped += len(members)
+                _LOGGER.debug( '### dali fan-out %s to %s %d for %d lamps',
+                              str(target), model, address, len(members) )
+                for lamp in members:
+                    if not (future := batch.futures[lamp]).done():
+                        future.set_result(copy.copy(response))
+        finally:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_result(None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the batcher counters."""
+        return {
+            "window": self._window,
+            "complete": self._complete,
+            "submitted": self.submitted,
+            "grouped": self.grouped,
+            "group_commands": self.group_commands,
+        }
@@ -0,0 +1,130 @@
+"""Raw 16 bit DALI forward frames, sent with #DALI CMD16.
+
+The #LAMP commands of the gateway address one short address. Group and
+broadcast commands are built here from the address byte and the opcodes
+of DALICMD.
+"""
+from __future__ import annotations
+
+from .const import DALIActionModel
+from .dali_const import (
+    DALICMD,
+    OPCODE,
+    GO_TO_SCENE,
+    ENABLE_DEVICE_TYPE,
+    SET_DTR,
+    SET_DTR1,
+    SET_DTR2,
+    DT8_ACTIVATE,
+    DT8_SET_COLOUR_TEMPERATURE_TC,
+    DT8_SET_RGB_DIMLEVEL,
+    DT8_SET_WAF_DIMLEVEL,
+)
+
+BROADCAST = 0xFE  # address byte of a broadcast, direct arc power
+GROUP_BIT = 0x80  # address byte 100GGGGS
+COMMAND_BIT = 0x01  # S bit: the second byte is an opcode, not a level
+DEVICE_TYPE_COLOUR = 8  # DT8
+MASK = 0xFF  # level or colour channel left unchanged
+MIREK_MIN = 1
+MIREK_MAX = 0xFFFE
+FADE_TIME_MAX = 15  # fade time codes 0 (no fade) to 15
+
+
+def opcode(command: str) -> int:
+    """Return the second byte of `command` from DALICMD."""
+    return int(DALICMD[command][OPCODE], 16) & 0xFF
+
+
+def address_byte(model: str, address: int, command: bool) -> int:
+    """Return the first byte addressing a short address, a group or all."""
+    if model == DALIActionModel.ALL:
+        byte = BROADCAST
+    elif model == DALIActionModel.GROUP:
+        byte = GROUP_BIT | (address & 0x0F) << 1
+    else:
+        byte = (address & 0x3F) << 1
+    return byte | COMMAND_BIT if command else byte
+
+
+def arc_power(model: str, address: int, level: int) -> int:
+    """Return DIRECT ARC POWER CONTROL to `level`."""
+    return address_byte(model, address, False) << 8 | min(max(level, 0), 254)
+
+
+def command(model: str, address: int, command_name: str) -> int:
+    """Return the addressed command `command_name` of DALICMD."""
+    return address_byte(model, address, True) << 8 | opcode(command_name)
+
+
+def scene(model: str, address: int, scene_number: int) -> int:
+    """Return GO TO SCENE `scene_number`."""
+    return address_byte(model, address, True) << 8 | (opcode(GO_TO_SCENE) + (scene_number & 0x0F))
+
+
+def special(command_name: str, data: int) -> int:
+    """Return the special command `command_name` carrying `data`."""
+    return opcode(command_name) << 8 | (data & 0xFF)
+
+
+def dt8(model: str, address: int, command_name: str) -> list[int]:
+    """Return a DT8 command, enabled for colour gear first."""
+    return [
+        special(ENABLE_DEVICE_TYPE, DEVICE_TYPE_COLOUR),
+        command(model, address, command_name),
+    ]
+
+
+def colour_temperature(model: str, address: int, kelvin: int) -> list[int]:
+    """Return the frames setting and activating a colour temperature."""
+    mirek = min(max(1_000_000 // max(kelvin, 1), MIREK_MIN), MIREK_MAX)
+    return [
+        special(SET_DTR, mirek & 0xFF),
+        special(SET_DTR1, mirek >> 8),
+        *dt8(model, address, DT8_SET_COLOUR_TEMPERATURE_TC),
+        *dt8(model, address, DT8_ACTIVATE),
+    ]
+
+
+def _channel(value: int | None) -> int:
+    return MASK if value is None else min(max(value, 0), 254)
+
+
+def rgbwaf(
+    model: str, address: int,
+    red: int, green: int, blue: int,
+    white: int | None = None, amber: int | None = None,
+) -> list[int]:
+    """Return the frames setting and activating the colour channels."""
+    frames = [
+        special(SET_DTR, _channel(red)),
+        special(SET_DTR1, _channel(green)),
+        special(SET_DTR2, _channel(blue)),
+        *dt8(model, address, DT8_SET_RGB_DIMLEVEL),
+    ]
+    if white is not None or amber is not None:
+        frames += [
+            special(SET_DTR, _channel(white)),
+            special(SET_DTR1, _channel(amber)),
+            special(SET_DTR2, MASK),
+            *dt8(model, address, DT8_SET_WAF_DIMLEVEL),
+        ]
+    return frames + dt8(model, address, DT8_ACTIVATE)
+
+
+def fade_time(seconds: float) -> int:
+    """Return the fade time code closest to `seconds`, 0 for no fade.
+
+    Code X fades over 0.5 * sqrt(2 ** X) seconds, 0.7 s for 1 up to 90.5 s for 15.
+    """
+    if seconds <= 0:
+        return 0
+    return min(
+        range(FADE_TIME_MAX + 1),
+        key=lambda code: abs((0.5 * 2 ** (code / 2) if code else 0) - seconds),
+    )
+
+
+def frame_hex(frame: int) -> str:
+    """Return `frame` the way #DALI CMD16 takes it."""
+    return f"{frame:04X}"
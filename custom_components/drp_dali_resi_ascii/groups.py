@@ -0,0 +1,78 @@
+"""Which DALI short addresses belong to which group."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from .const import DALI_GROUPS
+
+
+def _bits(mask: int) -> Iterator[int]:
+    """Yield the positions of the bits set in `mask`."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class GroupIndex:
+    """Group membership kept both ways as bitmasks.
+
+    Each short address maps to the 16 bit mask of its groups, as QUERY
+    GROUPS 0-7 and 8-15 return it, and each group to the 64 bit mask of
+    its short addresses. Both are updated together, lookups either way
+    never touch the bus.
+
+    Masks taken from the configuration are only what the user claims,
+    a lamp counts as confirmed once its mask was read from the gear.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._lamp_groups: dict[int, int] = {}
+        self._group_lamps = [0] * DALI_GROUPS
+        self._confirmed: set[int] = set()
+
+    def set_groups(self, lamp: int, mask: int, confirmed: bool = True) -> None:
+        """Make `mask` the groups of `lamp`, replacing what was known."""
+        old = self._lamp_groups.get(lamp, 0)
+        for group in _bits(old & ~mask):
+            self._group_lamps[group] &= ~(1 << lamp)
+        for group in _bits(mask & ~old):
+            self._group_lamps[group] |= 1 << lamp
+        self._lamp_groups[lamp] = mask
+        if confirmed:
+            self._confirmed.add(lamp)
+        else:
+            self._confirmed.discard(lamp)
+
+    def confirmed(self, lamp: int) -> bool:
+        """Return True when the groups of `lamp` were read from the gear."""
+        return lamp in self._confirmed
+
+    def groups(self, lamp: int) -> int:
+        """Return the mask of the groups `lamp` is in."""
+        return self._lamp_groups.get(lamp, 0)
+
+    def mask(self, group: int) -> int:
+        """Return the mask of the short addresses in `group`."""
+        return self._group_lamps[group] if 0 <= group < DALI_GROUPS else 0
+
+    def members(self, group: int) -> set[int]:
+        """Return the short addresses in `group`."""
+        return set(_bits(self.mask(group)))
+
+    def items(self) -> Iterator[tuple[int, set[int]]]:
+        """Yield each group that has members, with its short addresses."""
+        for group, mask in enumerate(self._group_lamps):
+            if mask:
+                yield group, set(_bits(mask))
+
+    def __bool__(self) -> bool:
+        return any(self._group_lamps)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the groups and their members."""
+        return {
+            str(group): sorted(members) for group, members in self.items()
+        }
@@ -0,0 +1,99 @@
+"""Persistent inventory of the lamps behind a DALI RESI gateway."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DALI_RESI_DOMAIN as DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10  # seconds, batches the writes of a refresh sweep
+
+INVENTORY_MAX_AGE = 7 * 24 * 3600  # seconds before an entry is refreshed
+INVENTORY_RETRY = 600  # seconds before asking a silent lamp again
+
+INV_DEVICE_TYPE = "device_type"
+INV_MIN_LEVEL = "min_level"
+INV_MAX_LEVEL = "max_level"
+INV_PHYSICAL_MINIMUM = "physical_minimum"
+INV_POWER_ON_LEVEL = "power_on_level"
+INV_SYSTEM_FAILURE_LEVEL = "system_failure_level"
+INV_FADE_TIME = "fade_time"
+INV_FADE_RATE = "fade_rate"
+INV_FADE_DEFAULT = "fade_default"  # fade time before the first transition changed it
+INV_GROUPS = "groups"  # bit n set for a member of group n
+INV_SCENES = "scenes"  # level of each scene, 255 when not part of it, None until read
+INV_UPDATED = "updated"
+
+
+class LampInventory:
+    """Capabilities and settings of each short address, kept across restarts.
+
+    Entries are stored with Home Assistant's storage helper in one file
+    per gateway and keyed by short address. An entry that is missing or
+    older than INVENTORY_MAX_AGE is reported as due, the hub refreshes it
+    in the background while callers keep using what is there.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int) -> None:
+        """Initialize the inventory."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.inventory.{host}_{port}"
+        )
+        self._lamps: dict[str, dict[str, Any]] = {}
+        self._attempts: dict[int, float] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the stored entries, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if (data := await self._store.async_load()) is not None:
+            self._lamps = data
+
+    def get(self, lamp: int, field: str) -> Any:
+        """Return a stored value of `lamp`, None when unknown."""
+        if (entry := self._lamps.get(str(lamp))) is None:
+            return None
+        return entry.get(field)
+
+    def due(self, lamp: int) -> bool:
+        """Return True when `lamp` should be (re)read from the bus."""
+        now = time.time()
+        if now - self._attempts.get(lamp, 0) < INVENTORY_RETRY:
+            return False
+        entry = self._lamps.get(str(lamp))
+        return (
+            entry is None
+            # stored before groups were read
+            or INV_GROUPS not in entry
+            or now - entry.get(INV_UPDATED, 0) > INVENTORY_MAX_AGE
+        )
+
+    def attempt(self, lamp: int) -> None:
+        """Note that `lamp` is being read, so it is not asked again right away."""
+        self._attempts[lamp] = time.time()
+
+    def update(self, lamp: int, values: dict[str, Any], refreshed: bool = True) -> None:
+        """Store what was read from `lamp` and schedule a save.
+
+        `refreshed` False keeps the entry's age, for values written to the
+        gear rather than read in a refresh.
+        """
+        entry = self._lamps.setdefault(str(lamp), {})
+        entry.update(values)
+        if refreshed:
+            entry[INV_UPDATED] = time.time()
+        self._store.async_delay_save(lambda: self._lamps, SAVE_DELAY)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the inventory counters."""
+        return {
+            "lamps": len(self._lamps),
+            "due": sum(1 for lamp in self._lamps if self.due(int(lamp))),
+        }
@@ -18,6 +18,7 @@ from homeassistant.components.light import (
     ATTR_RGBW_COLOR,
     ATTR_RGBWW_COLOR,
     ATTR_SUPPORTED_COLOR_MODES,
+    ATTR_TRANSITION,
     ATTR_WHITE,
     ATTR_XY_COLOR,
     ENTITY_ID_FORMAT,
@@ -27,7 +28,7 @@ from homeassistant.components.light import (
     valid_supported_color_modes,
 )
 from homeassistant.const import CONF_LIGHTS, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.event import (
@@ -43,9 +44,13 @@ from homeassistant.helpers.update_coordinator import (
 from . import get_hub
 from .base_platform import BaseDALILight
 from .dali_resi_master import DALIHub
+from .inventory import INV_MAX_LEVEL
+from .scheduler import CancelToken
 from .const import (
     CONF_SWITCH_CONSTRAINT,
     CONF_COLOR_MODE,
+    CONF_ACTION_MODEL,
+    DALIActionModel,
     DALI_RESI_DOMAIN as DOMAIN,
     ATTR_DALI_ADDRESS,
     ATTR_DALI_DEVICE,
@@ -54,9 +59,13 @@ from .dali_const import (
     DONE,
     OFF,
     ON,
+    TARGET_LEVEL,
+    TARGET_KELVIN,
+    TARGET_COLOR,
 )
 
-PARALLEL_UPDATES = 1
+# commands of a scene reach the hub together, it batches them into group commands
+PARALLEL_UPDATES = 0
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,7 +82,10 @@ async def async_setup_platform(
     lights = []
     for entry in discovery_info[CONF_LIGHTS]:
         hub: DALIHub = get_hub(hass, discovery_info[CONF_NAME])
-        lights.append(DALILight(hass, hub, entry))
+        if entry.get(CONF_ACTION_MODEL, DALIActionModel.LAMP) == DALIActionModel.LAMP:
+            lights.append(DALILight(hass, hub, entry))
+        else:
+            lights.append(DALIGroupLight(hass, hub, entry))
     async_add_entities(lights)
 
 
@@ -116,8 +128,13 @@ class DALILight(BaseDALILight):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Set light on."""
         response = {}
+        self._hub.poller.async_mark_active(self.entity_id)
 
         _LOGGER.debug( "#### async_turn_on %s | %s", str(kwargs), str(response))
+        transition = kwargs.get(ATTR_TRANSITION)
+        if kwargs.keys() == {ATTR_TRANSITION}:
+            # RECALL MAX LEVEL does not fade, arc power to MAX LEVEL does
+            kwargs[ATTR_BRIGHTNESS] = self._hub.inventory.get(self._slave, INV_MAX_LEVEL) or 254
         if len(kwargs) == 0:
             max_level_response = await self._hub.async_dali_recall_max_level(self._attr_color_mode, self._slave)
             # _LOGGER.debug( "#### async_turn_on %s %s", str(kwargs), str(max_level_response))
@@ -131,11 +148,13 @@ class DALILight(BaseDALILight):
         if ATTR_BRIGHTNESS in kwargs:
             brightness = self._attr_brightness
             brightness_response = await self._hub.async_dali_recall_level(
-                self._attr_dali_device_code, self._attr_color_mode, self._slave, kwargs['brightness']
+                self._attr_dali_device_code, self._attr_color_mode, self._slave, kwargs['brightness'],
+                verify=self._verify, transition=transition
             )
             # _LOGGER.debug( "#### async_turn_on %s %s", str(kwargs), str(brightness_response))
             if DONE in brightness_response and brightness_response[DONE]:
-                self._attr_brightness = kwargs['brightness']
+                # a later call may have superseded this one, follow what was sent
+                self._attr_brightness = brightness_response.get(TARGET_LEVEL, kwargs['brightness'])
             else:
                 self._attr_brightness = brightness
 
@@ -156,7 +175,7 @@ class DALILight(BaseDALILight):
                 self._slave, brightness, kwargs['color_temp_kelvin']
             )
             if DONE in color_temp_response and color_temp_response[DONE]:
-                self._attr_color_temp_kelvin = kwargs['color_temp_kelvin']
+                self._attr_color_temp_kelvin = color_temp_response.get(TARGET_KELVIN, kwargs['color_temp_kelvin'])
             else:
                 self._attr_color_temp_kelvin = color_temp_kelvin
             self.async_write_ha_state()
@@ -171,7 +190,7 @@ class DALILight(BaseDALILight):
                 self._slave, brightness, rgb[0], rgb[1], rgb[2]
             )
             if DONE in rgb_response and rgb_response[DONE]:
-                self._attr_rgb_color = [rgb[0], rgb[1], rgb[2]]
+                self._attr_rgb_color = rgb_response.get(TARGET_COLOR, [rgb[0], rgb[1], rgb[2]])
             else:
                 self._attr_rgb_color = rgb_color
             self.async_write_ha_state()
@@ -186,19 +205,107 @@ class DALILight(BaseDALILight):
                 self._slave, brightness, rgbww[0], rgbww[1], rgbww[2], rgbww[3], rgbww[4]
             )
             if DONE in rgbww_response and rgbww_response[DONE]:
-                self._attr_rgbww_color = [rgbww[0], rgbww[1], rgbww[2], rgbww[3], rgbww[4]]
+                self._attr_rgbww_color = rgbww_response.get(
+                    TARGET_COLOR, [rgbww[0], rgbww[1], rgbww[2], rgbww[3], rgbww[4]]
+                )
             else:
                 self._attr_rgbww_color = rgbww_color
             self.async_write_ha_state()        
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Set light on."""
+        self._hub.poller.async_mark_active(self.entity_id)
 
-        response = await self._hub.async_dali_recall_off(self._attr_dali_device_code, self._attr_color_mode, self._slave)
+        if ATTR_TRANSITION in kwargs:
+            # OFF is immediate, arc power 0 fades out
+            response = await self._hub.async_dali_recall_level(
+                self._attr_dali_device_code, self._attr_color_mode, self._slave, 0,
+                transition=kwargs[ATTR_TRANSITION]
+            )
+        else:
+            response = await self._hub.async_dali_recall_off(self._attr_dali_device_code, self._attr_color_mode, self._slave)
+        if DONE in response and response[DONE]:
+            self._attr_is_on = False
+            self._attr_native_value = False
+            self.async_write_ha_state()
+
+        _LOGGER.debug( "#### async_turn_off %s %s", str(kwargs), str(response))
+    
+
+
+class DALIGroupLight(DALILight):
+    """A DALI group or the whole bus, driven by one command for all its lamps.
+
+    A group address cannot be queried, so the entity is not polled and
+    keeps the state its commands set. The member lamps follow through
+    the hub.
+    """
+
+    _attr_assumed_state = True
+
+    @callback
+    def async_run(self) -> None:
+        """Remote start entity, there is nothing to poll."""
+        self.async_hold(update=False)
+        self._cancel_token = CancelToken()
+        self._attr_available = True
+        self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Set the lamps of the group on."""
+        model, group = self._action_model, self._slave
+        brightness = kwargs.get(ATTR_BRIGHTNESS)
+        transition = kwargs.get(ATTR_TRANSITION)
+
+        if ATTR_COLOR_TEMP_KELVIN in kwargs:
+            response = await self._hub.async_dali_group_recall_color_temperature_level(
+                model, group, brightness, kwargs[ATTR_COLOR_TEMP_KELVIN]
+            )
+            if DONE in response and response[DONE]:
+                self._attr_color_temp_kelvin = response.get(TARGET_KELVIN, kwargs[ATTR_COLOR_TEMP_KELVIN])
+        elif ATTR_RGB_COLOR in kwargs:
+            rgb = kwargs[ATTR_RGB_COLOR]
+            response = await self._hub.async_dali_group_recall_rgb_level(
+                model, group, brightness, rgb[0], rgb[1], rgb[2]
+            )
+            if DONE in response and response[DONE]:
+                self._attr_rgb_color = response.get(TARGET_COLOR, list(rgb))
+        elif ATTR_RGBWW_COLOR in kwargs:
+            rgbww = kwargs[ATTR_RGBWW_COLOR]
+            response = await self._hub.async_dali_group_recall_rgbww_level(
+                model, group, brightness, rgbww[0], rgbww[1], rgbww[2], rgbww[3], rgbww[4]
+            )
+            if DONE in response and response[DONE]:
+                self._attr_rgbww_color = response.get(TARGET_COLOR, list(rgbww))
+        elif brightness is not None or transition is not None:
+            if brightness is None:
+                # RECALL MAX LEVEL does not fade, the gear clamps 254 to its MAX LEVEL
+                brightness = 254
+            response = await self._hub.async_dali_group_recall_level(model, group, brightness, transition)
+        else:
+            response = await self._hub.async_dali_group_recall_max_level(model, group)
+            brightness = 254
+
+        if DONE in response and response[DONE]:
+            if brightness is not None:
+                self._attr_brightness = brightness
+            self._attr_is_on = self._attr_brightness is None or self._attr_brightness > 0
+            self._attr_native_value = self._attr_is_on
+            self.async_write_ha_state()
+
+        _LOGGER.debug( "#### group async_turn_on %s %s", str(kwargs), str(response))
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Set the lamps of the group off."""
+        if ATTR_TRANSITION in kwargs:
+            response = await self._hub.async_dali_group_recall_level(
+                self._action_model, self._slave, 0, kwargs[ATTR_TRANSITION]
+            )
+        else:
+            response = await self._hub.async_dali_group_recall_off(self._action_model, self._slave)
         if DONE in response and response[DONE]:
             self._attr_is_on = False
             self._attr_native_value = False
             self.async_write_ha_state()
 
-        _LOGGER.debug( "#### async_turn_off %s %s", str(**kwargs), str(response))
-    
\ No newline at end of file
+        _LOGGER.debug( "#### group async_turn_off %s", str(response))
@@ -0,0 +1,222 @@
+"""Adaptive inter-command pacing for a DALI RESI gateway."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Conservative starting point, the gaps the gateway was always driven with.
+DEFAULT_PREAMBLE_GAP = 0.1  # seconds between wake-up CRs and command
+DEFAULT_COMMAND_GAP = 0.2  # seconds between command and terminator
+MAX_GAP = 0.5  # seconds, upper bound when backing off
+
+SHRINK_AFTER = 20  # clean replies in a row before trying smaller gaps
+SHRINK_FACTOR = 0.75
+BACKOFF_FACTOR = 2.0
+MIN_STEP = 0.005  # seconds, gaps below this are treated as zero
+SAFETY_MARGIN = 1.25  # keep this far above a gap that produced errors
+UNSAFE_DECAY = 0.9  # forget old failures slowly so the gaps are re-probed
+TURNAROUND_ALPHA = 0.125  # EWMA weight of a new turnaround sample
+
+
+class PacingController:
+    """Learn the smallest safe gaps between the parts of a command frame.
+
+    The controller starts from the historical fixed gaps and shrinks them
+    after a run of clean replies. A timeout or a garbled reply backs the
+    gaps off and remembers the failing value, so later shrinking stops
+    short of it.
+    """
+
+    def __init__(self, name: str, floor: float = 0.0) -> None:
+        """Initialize the controller."""
+        self.name = name
+        self._floor = floor
+        self.preamble_gap = DEFAULT_PREAMBLE_GAP
+        self.command_gap = DEFAULT_COMMAND_GAP
+        self._unsafe_preamble_gap = 0.0
+        self._unsafe_command_gap = 0.0
+        self._clean_streak = 0
+        self.turnaround: float | None = None
+        self.replies = 0
+        self.errors = 0
+
+    def _lower_bound(self, unsafe: float) -> float:
+        bound = max(self._floor, unsafe * SAFETY_MARGIN)
+        return bound if bound >= MIN_STEP else 0.0
+
+    def _shrink(self, gap: float, unsafe: float) -> float:
+        gap = gap * SHRINK_FACTOR
+        if gap < MIN_STEP:
+            gap = 0.0
+        return max(gap, self._lower_bound(unsafe))
+
+    def record_reply(self, turnaround: float) -> None:
+        """Account for a well formed reply received after `turnaround` s."""
+        self.replies += 1
+        if self.turnaround is None:
+            self.turnaround = turnaround
+        else:
+            self.turnaround += TURNAROUND_ALPHA * (turnaround - self.turnaround)
+
+        self._clean_streak += 1
+        if self._clean_streak < SHRINK_AFTER:
+            return
+        self._clean_streak = 0
+        self._unsafe_preamble_gap *= UNSAFE_DECAY
+        self._unsafe_command_gap *= UNSAFE_DECAY
+
+        preamble_gap = self._shrink(self.preamble_gap, self._unsafe_preamble_gap)
+        command_gap = self._shrink(self.command_gap, self._unsafe_command_gap)
+        if (preamble_gap, command_gap) != (self.preamble_gap, self.command_gap):
+            self.preamble_gap, self.command_gap = preamble_gap, command_gap
+            _LOGGER.debug( '### dali %s pacing shrunk to %.3f/%.3f s',
+                          self.name, self.preamble_gap, self.command_gap )
+
+    def record_error(self) -> None:
+        """Account for a timeout or a garbled reply and back off."""
+        self.errors += 1
+        self._clean_streak = 0
+        self._unsafe_preamble_gap = max(self._unsafe_preamble_gap, self.preamble_gap)
+        self._unsafe_command_gap = max(self._unsafe_command_gap, self.command_gap)
+        self.preamble_gap = min(MAX_GAP, max(self.preamble_gap * BACKOFF_FACTOR, MIN_STEP))
+        self.command_gap = min(MAX_GAP, max(self.command_gap * BACKOFF_FACTOR, MIN_STEP))
+        _LOGGER.debug( '### dali %s pacing backed off to %.3f/%.3f s',
+                      self.name, self.preamble_gap, self.command_gap )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the learned values."""
+        return {
+            "preamble_gap": round(self.preamble_gap, 4),
+            "command_gap": round(self.command_gap, 4),
+            "turnaround": round(self.turnaround, 4) if self.turnaround is not None else None,
+            "replies": self.replies,
+            "errors": self.errors,
+        }
+
+
+# Reply timeout estimation, after the TCP retransmission timer (RFC 6298).
+RTT_ALPHA = 0.125  # weight of a new sample in the smoothed round trip
+RTT_BETA = 0.25  # weight of a new sample in the round trip variance
+RTT_K = 4  # variance multiplier
+RTT_GRANULARITY = 0.02  # seconds, least slack allowed above the smoothed round trip
+RTO_MIN = 0.05  # seconds
+
+# DALI bus timing at 1200 bit/s (IEC 62386-101)
+DALI_FORWARD_FRAME = 0.0158  # 19 bits
+DALI_BACKWARD_FRAME = 0.0092  # 11 bits
+DALI_ANSWER_WINDOW = 0.0129  # longest wait for a backward frame
+DALI_SETTLING = 0.0135  # between a frame and the next forward frame
+DALI_SEND = DALI_FORWARD_FRAME + DALI_SETTLING
+DALI_QUERY = DALI_FORWARD_FRAME + DALI_ANSWER_WINDOW + DALI_BACKWARD_FRAME + DALI_SETTLING
+
+# Gateway commands by what they put on the bus, each with its own estimator.
+REPLY_COMMAND = "command"  # one forward frame
+REPLY_QUERY = "query"  # forward frame and answer
+REPLY_REPEAT = "repeat"  # forward frame sent twice
+REPLY_DT8 = "dt8"  # DTR loads, enable device type, set and activate or read back
+# least time the bus needs before the gateway can reply, per command class
+REPLY_FLOORS = {
+    REPLY_COMMAND: DALI_SEND,
+    REPLY_QUERY: DALI_QUERY,
+    REPLY_REPEAT: 2 * DALI_SEND,
+    REPLY_DT8: 4 * DALI_SEND + 3 * DALI_QUERY,
+}
+
+
+class ReplyTimeout:
+    """Estimate how long to wait for a reply before giving up on it.
+
+    Until the first reply is seen the timeout is the configured ceiling.
+    Afterwards it follows the smoothed round trip plus four times its
+    variance, so a lamp that does not answer costs a few tens of
+    milliseconds more than a normal reply. Each timeout doubles the value
+    up to the ceiling until a fresh sample brings it back down. It never
+    goes below `floor`, the time the bus itself needs for the command.
+    """
+
+    def __init__(self, name: str, ceiling: float, floor: float = RTO_MIN) -> None:
+        """Initialize the estimator."""
+        self.name = name
+        self._ceiling = ceiling
+        self._floor = min(ceiling, max(RTO_MIN, floor))
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.timeout = ceiling
+        self.timeouts = 0
+
+    @property
+    def ceiling(self) -> float:
+        """Return the longest a reply is waited for."""
+        return self._ceiling
+
+    def _update(self, rto: float) -> None:
+        self.timeout = min(self._ceiling, max(self._floor, rto))
+
+    def record_sample(self, rtt: float) -> None:
+        """Account for a reply received `rtt` s after its request."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += RTT_ALPHA * (rtt - self.srtt)
+        self._update(self.srtt + max(RTT_GRANULARITY, RTT_K * self.rttvar))
+
+    def record_timeout(self) -> None:
+        """Back the timeout off after a reply did not arrive in time."""
+        self.timeouts += 1
+        self._update(self.timeout * 2)
+        _LOGGER.debug( '### dali %s reply timeout backed off to %.3f s', self.name, self.timeout )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the estimator state."""
+        return {
+            "floor": round(self._floor, 4),
+            "srtt": round(self.srtt, 4) if self.srtt is not None else None,
+            "rttvar": round(self.rttvar, 4),
+            "timeout": round(self.timeout, 4),
+            "timeouts": self.timeouts,
+        }
+
+
+class TokenBucket:
+    """Budget of bus transactions per second.
+
+    Every transaction takes a token, whatever its priority, so the bucket
+    may go into debt behind a burst of commands. Background work waits
+    until the debt is paid back before it puts more on the bus.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self._capacity = capacity if capacity is not None else rate
+        self._tokens = self._capacity
+        self._stamp: float | None = None
+        self.consumed = 0
+
+    def _refill(self, now: float) -> None:
+        if self._stamp is not None:
+            self._tokens = min(self._capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def consume(self, now: float, tokens: float = 1.0) -> None:
+        """Take `tokens` for a transaction put on the bus at `now`."""
+        self._refill(now)
+        self._tokens -= tokens
+        self.consumed += 1
+
+    def delay(self, now: float) -> float:
+        """Return how long to wait until the bucket is out of debt."""
+        self._refill(now)
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the bucket state."""
+        return {
+            "rate": round(self.rate, 2),
+            "tokens": round(self._tokens, 2),
+            "consumed": self.consumed,
+        }
@@ -0,0 +1,368 @@
+"""Hub wide polling of the DALI entities."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+import heapq
+import itertools
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .pacing import TokenBucket
+from .quarantine import LampQuarantine
+from .const import (
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_POLL_BUDGET,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+FIRST_POLL_DELAY = 0.1  # seconds after an entity registers
+INTERVAL_GROWTH = 1.5  # interval factor after a poll that saw no change
+POLL_COST_ALPHA = 0.2  # weight of the latest poll in the transactions per poll
+
+
+@dataclass
+class _PollTarget:
+    """An entity polled by the scheduler."""
+
+    poll: Callable[[], Awaitable[Any]]
+    interval: float  # seconds, 0 polls only on request
+    generation: int = 0
+    polls: int = 0
+    changes: int = 0
+    last_start: float | None = None
+    order: int = 0  # short address, orders a sweep
+    segment: str | None = None  # switch feeding the lamp, if any
+
+
+class PollScheduler:
+    """Poll the entities of a hub one at a time, spread over the interval.
+
+    Polls are started from a single task, never closer together than the
+    bus budget allows and, once every entity has been polled, evenly
+    spaced over the shortest interval in round-robin order. A first poll
+    or a requested one only waits for the budget, so new and changed
+    entities are refreshed quickly without bunching up the regular polls.
+
+    The interval of each entity adapts to how often it actually changes:
+    a command or a poll that saw a change drops it to `min_interval`,
+    every poll that saw nothing new stretches it towards `max_interval`.
+
+    Nothing is polled while the `ready` event is clear. Once the gateway
+    link is ready the hub starts a sweep: every entity is polled in
+    short address order at the bus budget, and the time until all of
+    them reported available is kept as `time_to_availability`.
+
+    Polls also wait while the `bus` token bucket is in debt. When the polls
+    would need more transactions per second than the budget has, the
+    spacing stretches to fit it and a warning is logged once.
+
+    An entity whose short address is in `quarantine` is polled after the
+    quarantine backoff instead of its interval, and counts as settled
+    for a sweep.
+
+    Entities powered through the same switch form a segment. While a
+    segment is suspended its entities are not polled; resuming it polls
+    them all once more, in address order at the bus budget.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        budget: float = DEFAULT_POLL_BUDGET,
+        min_interval: float = DEFAULT_MIN_SCAN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_SCAN_INTERVAL,
+        ready: asyncio.Event | None = None,
+        bus: TokenBucket | None = None,
+        quarantine: LampQuarantine | None = None,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.name = name
+        self._min_spacing = 1 / budget
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self._ready = ready
+        self._bus = bus
+        self._quarantine = quarantine
+        self._poll_cost = 1.0  # transactions per poll, learned
+        self.overloaded = False
+        self._targets: dict[Hashable, _PollTarget] = {}
+        # (due, order, seq, key, generation, urgent), stale generations are skipped
+        self._heap: list[tuple[float, int, int, Hashable, int, bool]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._last_start: float | None = None
+        self.polls = 0
+        self.late = 0
+        self._suspended: set[str] = set()
+        self._sweep_since: float | None = None
+        self._sweep_pending: set[Hashable] = set()
+        self.time_to_availability: float | None = None
+
+    @property
+    def spacing(self) -> float:
+        """Return the gap kept between two regular polls."""
+        floor = self._min_spacing
+        if self._bus is not None:
+            floor = max(floor, self._poll_cost / self._bus.rate)
+        rate = self.poll_rate
+        if not rate:
+            return floor
+        return max(floor, 1 / rate)
+
+    @property
+    def poll_rate(self) -> float:
+        """Return the polls per second the intervals ask for."""
+        return sum(
+            1 / t.interval for t in self._targets.values()
+            if t.interval > 0 and t.segment not in self._suspended
+        )
+
+    @callback
+    def _async_check_overload(self) -> None:
+        """Warn once when polling needs more than the bus budget."""
+        if self._bus is None:
+            return
+        demand = self.poll_rate * self._poll_cost
+        if not self.overloaded and demand > self._bus.rate:
+            self.overloaded = True
+            _LOGGER.warning(
+                "dali %s: polling needs %.1f transactions/s but the bus budget is %.1f, "
+                "poll intervals are stretched; raise bus_utilisation or the scan intervals",
+                self.name, demand, self._bus.rate,
+            )
+        elif self.overloaded and demand < 0.9 * self._bus.rate:
+            self.overloaded = False
+            _LOGGER.info("dali %s: polling is back within the bus budget", self.name)
+
+    def _schedule(self, key: Hashable, due: float, urgent: bool) -> None:
+        target = self._targets[key]
+        target.generation += 1
+        heapq.heappush(
+            self._heap, (due, target.order, next(self._seq), key, target.generation, urgent)
+        )
+        self._wakeup.set()
+
+    @callback
+    def async_register(
+        self,
+        key: Hashable,
+        poll: Callable[[], Awaitable[Any]],
+        interval: float,
+        order: int = 0,
+        segment: str | None = None,
+    ) -> Callable[[], None]:
+        """Poll `key` every `interval` seconds, return the unregister callback."""
+        self._targets[key] = _PollTarget(poll, interval, order=order, segment=segment)
+        self._schedule(key, self.hass.loop.time() + FIRST_POLL_DELAY, urgent=True)
+        self.async_start()
+
+        @callback
+        def _async_unregister() -> None:
+            if self._targets.get(key) is not None and self._targets[key].poll is poll:
+                del self._targets[key]
+                self._async_sweep_done(key)
+
+        return _async_unregister
+
+    @callback
+    def async_request_poll(self, key: Hashable, delay: float = 0) -> None:
+        """Poll `key` after `delay` seconds, ahead of its regular turn."""
+        if key in self._targets:
+            self._schedule(key, self.hass.loop.time() + delay, urgent=True)
+
+    def _retime(self, key: Hashable, interval: float) -> None:
+        """Give `key` a new interval, counted from its last poll."""
+        target = self._targets[key]
+        if target.interval <= 0 or interval == target.interval:
+            return
+        target.interval = interval
+        start = target.last_start if target.last_start is not None else self.hass.loop.time()
+        self._schedule(key, start + interval, urgent=False)
+
+    @callback
+    def async_sweep(self, since: float) -> None:
+        """Poll every entity now, in short address order.
+
+        `since` is when the entities stopped being served, the time to
+        availability is counted from there.
+        """
+        now = self.hass.loop.time()
+        self._sweep_since = since
+        self._sweep_pending = set(self._targets)
+        for key in self._targets:
+            self._schedule(key, now, urgent=True)
+        if not self._sweep_pending:
+            self._sweep_since = None
+
+    @callback
+    def async_suspend_segment(self, segment: str) -> None:
+        """Stop polling the entities of `segment`."""
+        self._suspended.add(segment)
+
+    @callback
+    def async_resume_segment(self, segment: str, delay: float = 0) -> None:
+        """Poll the entities of `segment` again, first all of them after `delay`."""
+        if segment not in self._suspended:
+            return
+        self._suspended.discard(segment)
+        due = self.hass.loop.time() + delay
+        for key, target in self._targets.items():
+            if target.segment == segment:
+                self._schedule(key, due, urgent=True)
+
+    @callback
+    def _async_sweep_done(self, key: Hashable) -> None:
+        if key not in self._sweep_pending:
+            return
+        self._sweep_pending.discard(key)
+        if not self._sweep_pending and self._sweep_since is not None:
+            self.time_to_availability = self.hass.loop.time() - self._sweep_since
+            self._sweep_since = None
+            _LOGGER.info(
+                "dali %s: all %d entities available after %.1f s",
+                self.name, len(self._targets), self.time_to_availability,
+            )
+
+    @callback
+    def async_report(self, key: Hashable, changed: bool, available: bool = True) -> None:
+        """Adapt the interval of `key` to the outcome of its last poll."""
+        if (target := self._targets.get(key)) is None:
+            return
+        if available:
+            self._async_sweep_done(key)
+        if changed:
+            target.changes += 1
+            self._retime(key, self._min_interval)
+        else:
+            self._retime(key, min(self._max_interval, target.interval * INTERVAL_GROWTH))
+
+    @callback
+    def async_mark_active(self, key: Hashable) -> None:
+        """Poll `key` at the fast rate after a command was sent to it."""
+        if (target := self._targets.get(key)) is not None and target.interval > 0:
+            target.interval = self._min_interval
+            self._schedule(key, self.hass.loop.time() + self._min_interval, urgent=False)
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling the registered entities."""
+        if self._targets and (self._task is None or self._task.done()):
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"dali-{self.name}-poller"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling, registrations are kept."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_wait(self, until: float) -> None:
+        """Sleep until `until` or until something new is scheduled."""
+        self._wakeup.clear()
+        delay = until - self.hass.loop.time()
+        if delay <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _async_run(self) -> None:
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due, _, _, key, generation, urgent = self._heap[0]
+            target = self._targets.get(key)
+            if target is None or target.generation != generation:
+                heapq.heappop(self._heap)
+                continue
+
+            if target.segment in self._suspended:
+                # resuming the segment schedules it again
+                heapq.heappop(self._heap)
+                continue
+
+            if self._ready is not None and not self._ready.is_set():
+                # the link is down, the hub sweeps everything once it is back
+                await self._ready.wait()
+                continue
+
+            start = due
+            if self._last_start is not None:
+                gap = self._min_spacing if urgent else self.spacing
+                start = max(start, self._last_start + gap)
+            if start > self.hass.loop.time():
+                await self._async_wait(start)
+                # an earlier or replacing entry may have been scheduled meanwhile
+                continue
+
+            if self._bus is not None and (delay := self._bus.delay(self.hass.loop.time())):
+                # commands or earlier polls used the budget up, let the bus breathe
+                await self._async_wait(self.hass.loop.time() + delay)
+                continue
+
+            heapq.heappop(self._heap)
+            now = self.hass.loop.time()
+            if target.interval > 0 and now - due > target.interval:
+                self.late += 1
+            self._last_start = now
+            target.last_start = now
+            if target.interval > 0:
+                # keep the phase, the next turn follows this start
+                self._schedule(key, now + target.interval, urgent=False)
+
+            consumed = self._bus.consumed if self._bus is not None else 0
+            try:
+                await target.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("dali %s poll of %s failed", self.name, key)
+            target.polls += 1
+            self.polls += 1
+            if self._bus is not None:
+                cost = self._bus.consumed - consumed
+                self._poll_cost += POLL_COST_ALPHA * (cost - self._poll_cost)
+                self._async_check_overload()
+            if (
+                self._quarantine is not None
+                and key in self._targets
+                and (backoff := self._quarantine.backoff(target.order)) > 0
+            ):
+                # the address does not answer, do not spend the bus on it
+                self._async_sweep_done(key)
+                if target.interval > 0:
+                    self._schedule(key, now + max(backoff, target.interval), urgent=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler counters."""
+        return {
+            "entities": len(self._targets),
+            "spacing": round(self.spacing, 3),
+            "fast": sum(
+                1 for t in self._targets.values() if 0 < t.interval <= self._min_interval
+            ),
+            "polls": self.polls,
+            "late": self.late,
+            "suspended_segments": sorted(self._suspended),
+            "transactions_per_poll": round(self._poll_cost, 2),
+            "overloaded": self.overloaded,
+            "time_to_availability": (
+                round(self.time_to_availability, 2)
+                if self.time_to_availability is not None else None
+            ),
+        }
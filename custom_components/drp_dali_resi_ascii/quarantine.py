@@ -0,0 +1,90 @@
+"""Back off from DALI short addresses that do not answer."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from .dali_const import ERR9, ERR99
+
+_LOGGER = logging.getLogger(__name__)
+
+NO_ANSWER = f"{ERR9},{ERR99},0x63"  # the gateway saw no backward frame
+
+QUARANTINE_AFTER = 2  # unanswered queries in a row before an address is quarantined
+QUARANTINE_BASE = 30  # seconds between polls once quarantined
+QUARANTINE_MAX = 3600  # seconds between polls at most
+
+
+def is_no_answer(response: str | None) -> bool:
+    """Return True when the gateway reply says the lamp did not answer.
+
+    A reply timeout counts as well. None is not an answer from the lamp:
+    the request was dropped or the link is down.
+    """
+    if response is None:
+        return False
+    if response == '':
+        return True
+    _, _, suffix = response.partition(':')
+    return suffix.startswith(NO_ANSWER)
+
+
+class LampQuarantine:
+    """Short addresses that stopped answering and how long to leave them be.
+
+    An address that misses QUARANTINE_AFTER queries in a row is
+    quarantined: its polls are spaced QUARANTINE_BASE seconds apart,
+    doubling with every further miss up to QUARANTINE_MAX, and its
+    failures are no longer logged as errors. Any answer, or the switch
+    feeding it powering up, releases it.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the quarantine."""
+        self.name = name
+        self._misses: dict[int, int] = {}
+        self.quarantined = 0
+        self.released = 0
+
+    def __contains__(self, lamp: int) -> bool:
+        return self._misses.get(lamp, 0) >= QUARANTINE_AFTER
+
+    def record(self, lamp: int, answered: bool) -> None:
+        """Account for a query that `lamp` answered or left unanswered."""
+        if answered:
+            self.release(lamp)
+            return
+        misses = self._misses.get(lamp, 0) + 1
+        self._misses[lamp] = misses
+        if misses == QUARANTINE_AFTER:
+            self.quarantined += 1
+            _LOGGER.warning(
+                "dali %s: lamp %d does not answer, polling it less often until it does",
+                self.name, lamp,
+            )
+
+    def release(self, lamp: int) -> None:
+        """Take `lamp` out of quarantine."""
+        if lamp in self:
+            self.released += 1
+            _LOGGER.info("dali %s: lamp %d answers again", self.name, lamp)
+        self._misses.pop(lamp, None)
+
+    def backoff(self, lamp: int) -> float:
+        """Return the seconds to wait before polling `lamp` again, 0 if not quarantined."""
+        misses = self._misses.get(lamp, 0)
+        if misses < QUARANTINE_AFTER:
+            return 0
+        return min(QUARANTINE_MAX, QUARANTINE_BASE * 2 ** min(misses - QUARANTINE_AFTER, 16))
+
+    def log_level(self, lamp: int) -> int:
+        """Return the level to log a failed query of `lamp` at."""
+        return logging.DEBUG if lamp in self else logging.ERROR
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the quarantine counters."""
+        return {
+            "lamps": sorted(lamp for lamp in self._misses if lamp in self),
+            "quarantined": self.quarantined,
+            "released": self.released,
+        }
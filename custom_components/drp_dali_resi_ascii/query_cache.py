@@ -0,0 +1,92 @@
+"""Short lived cache of DALI query answers."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+import copy
+from typing import Any
+
+from .const import DEFAULT_CACHE_TTL
+from .dali_const import DONE
+
+CACHE_SIZE = 256  # answers kept at most, least recently used go first
+
+
+class QueryCache:
+    """Answers to lamp queries keyed by (lamp, query, ...).
+
+    A fresh answer is served without touching the bus and callers asking
+    a question already on the wire share its round trip. Only successful
+    answers are kept. Invalidating a lamp drops its answers and keeps a
+    query that was in flight meanwhile from storing a stale one.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, size: int = CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._size = size
+        self._answers: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._generation: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    async def async_query(
+        self, key: tuple, factory: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Return the answer for `key`, asking the bus through `factory` if needed."""
+        loop = asyncio.get_running_loop()
+        if (cached := self._answers.get(key)) is not None:
+            stored, answer = cached
+            if self._ttl > 0 and loop.time() - stored <= self._ttl:
+                self._answers.move_to_end(key)
+                self.hits += 1
+                return copy.copy(answer)
+            del self._answers[key]
+
+        if (task := self._inflight.get(key)) is not None:
+            self.shared += 1
+            return copy.copy(await asyncio.shield(task))
+
+        self.misses += 1
+        # owned by a task so a cancelled caller does not fail the ones sharing it
+        task = loop.create_task(self._async_fetch(key, factory))
+        self._inflight[key] = task
+        return copy.copy(await asyncio.shield(task))
+
+    async def _async_fetch(
+        self, key: tuple, factory: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        generation = self._generation.get(key[0], 0)
+        try:
+            answer = await factory()
+        finally:
+            del self._inflight[key]
+
+        if (
+            self._ttl > 0
+            and DONE in answer and answer[DONE]
+            and self._generation.get(key[0], 0) == generation
+        ):
+            self._answers[key] = (asyncio.get_running_loop().time(), answer)
+            self._answers.move_to_end(key)
+            while len(self._answers) > self._size:
+                self._answers.popitem(last=False)
+        return answer
+
+    def invalidate(self, lamp: int) -> None:
+        """Forget the answers of `lamp`, a command changed it."""
+        self._generation[lamp] = self._generation.get(lamp, 0) + 1
+        for key in [key for key in self._answers if key[0] == lamp]:
+            del self._answers[key]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache counters."""
+        return {
+            "entries": len(self._answers),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+        }
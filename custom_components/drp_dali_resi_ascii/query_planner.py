@@ -0,0 +1,118 @@
+"""Plan the bus transactions that refresh a lamp."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+import functools
+
+from homeassistant.components.light import ColorMode
+
+STATUS_EVERY = 10  # polls between two reads of the status bits
+
+
+class Need(StrEnum):
+    """Data a poll may need about a lamp."""
+
+    DEVICE_TYPE = "device_type"
+    STATUS = "status"
+    LEVEL = "level"
+    KELVIN = "kelvin"
+    RGB = "rgb"
+    RGBWW = "rgbww"
+
+
+class Query(StrEnum):
+    """Bus transactions a plan is made of."""
+
+    DEVICE_TYPE = "device_type"  # QUERY DEVICE TYPE
+    STATUS = "status"  # QUERY STATUS
+    ACTUAL_LEVEL = "actual_level"  # QUERY ACTUAL LEVEL
+    TC = "tc"  # #LAMP QUERY TC, arc level and colour temperature
+    RGB = "rgb"  # #LAMP QUERY RGBWAF with 3 channels, arc level included
+    RGBWW = "rgbww"  # #LAMP QUERY RGBWAF with 5 channels, arc level included
+
+
+# What each transaction answers.
+PROVIDES: dict[Query, frozenset[Need]] = {
+    Query.DEVICE_TYPE: frozenset({Need.DEVICE_TYPE}),
+    Query.STATUS: frozenset({Need.STATUS}),
+    Query.TC: frozenset({Need.LEVEL, Need.KELVIN}),
+    Query.RGB: frozenset({Need.LEVEL, Need.RGB}),
+    Query.RGBWW: frozenset({Need.LEVEL, Need.RGBWW}),
+    Query.ACTUAL_LEVEL: frozenset({Need.LEVEL}),
+}
+
+COLOR_MODE_NEEDS: dict[str, frozenset[Need]] = {
+    ColorMode.ONOFF: frozenset({Need.LEVEL}),
+    ColorMode.BRIGHTNESS: frozenset({Need.LEVEL}),
+    ColorMode.COLOR_TEMP: frozenset({Need.LEVEL, Need.KELVIN}),
+    ColorMode.RGB: frozenset({Need.LEVEL, Need.RGB}),
+    ColorMode.RGBWW: frozenset({Need.LEVEL, Need.RGBWW}),
+}
+
+# Reads that tell nothing new once the status says the arc is off.
+LEVEL_QUERIES = frozenset({Query.ACTUAL_LEVEL, Query.TC, Query.RGB, Query.RGBWW})
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One transaction of a plan."""
+
+    query: Query
+    skip_if_off: bool = False
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """Ordered transactions that cover the needs of a poll."""
+
+    color_mode: str
+    needs: frozenset[Need]
+    steps: tuple[PlanStep, ...]
+
+    @property
+    def transactions(self) -> int:
+        """Return the number of transactions at most."""
+        return len(self.steps)
+
+
+@functools.lru_cache(maxsize=None)
+def plan_lamp_poll(color_mode: str, needs: frozenset[Need]) -> QueryPlan:
+    """Return the fewest transactions covering `needs`.
+
+    Transactions are picked greedily by how many open needs they answer.
+    The status goes first, so the level reads after it can be skipped
+    when it reports the arc power off.
+    """
+    queries: list[Query] = []
+    missing = set(needs)
+    while missing:
+        # most open needs answered, then least answered for nothing
+        query = max(
+            PROVIDES,
+            key=lambda q: (len(PROVIDES[q] & missing), -len(PROVIDES[q] - missing)),
+        )
+        if not PROVIDES[query] & missing:
+            break
+        queries.append(query)
+        missing -= PROVIDES[query]
+
+    with_status = Query.STATUS in queries
+    steps = [PlanStep(query) for query in queries if query not in LEVEL_QUERIES]
+    steps += [
+        PlanStep(query, skip_if_off=with_status)
+        for query in queries if query in LEVEL_QUERIES
+    ]
+    return QueryPlan(color_mode, frozenset(needs), tuple(steps))
+
+
+def lamp_poll_needs(
+    color_mode: str, device_type_known: bool, want_status: bool
+) -> frozenset[Need]:
+    """Return what a poll of a lamp in `color_mode` has to find out."""
+    needs = set(COLOR_MODE_NEEDS.get(color_mode, frozenset({Need.LEVEL})))
+    if not device_type_known:
+        needs.add(Need.DEVICE_TYPE)
+    if want_status:
+        needs.add(Need.STATUS)
+    return frozenset(needs)
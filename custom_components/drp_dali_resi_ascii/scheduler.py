@@ -0,0 +1,281 @@
+"""Request scheduling for the DALI hub."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import copy
+from dataclasses import dataclass, field
+import functools
+import heapq
+import itertools
+from typing import Any, TypeVar
+
+_R = TypeVar("_R")
+
+# Lower value is served first.
+PRIORITY_INTERACTIVE = 0  # user driven commands
+PRIORITY_VERIFY = 1  # read back right after a command
+PRIORITY_POLL = 2  # periodic state refresh
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_VERIFY: "verify",
+    PRIORITY_POLL: "poll",
+}
+
+_REQUEST_PRIORITY: ContextVar[int] = ContextVar(
+    "dali_request_priority", default=PRIORITY_POLL
+)
+
+
+class CancelToken:
+    """Cancellation shared by the requests issued on behalf of one owner.
+
+    Cancelling the token releases every request still waiting for the
+    wire with no result; the dispatcher skips them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the token."""
+        self.cancelled = False
+        self._futures: set[asyncio.Future] = set()
+
+    def attach(self, future: asyncio.Future) -> None:
+        """Release `future` when the token is cancelled."""
+        if self.cancelled:
+            future.set_result(None)
+            return
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+    def cancel(self) -> None:
+        """Cancel the token and release the attached requests."""
+        self.cancelled = True
+        futures, self._futures = self._futures, set()
+        for future in futures:
+            if not future.done():
+                future.set_result(None)
+
+
+@dataclass(frozen=True)
+class RequestScope:
+    """Deadline and cancellation applied to the requests of a task."""
+
+    token: CancelToken | None = None
+    deadline: float | None = None  # event loop time
+
+
+_REQUEST_SCOPE: ContextVar[RequestScope] = ContextVar(
+    "dali_request_scope", default=RequestScope()
+)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Run the requests issued inside the block at `priority`."""
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+def with_priority(
+    priority: int,
+) -> Callable[[Callable[..., Awaitable[_R]]], Callable[..., Awaitable[_R]]]:
+    """Decorate a coroutine so every request it issues runs at `priority`."""
+
+    def decorator(func: Callable[..., Awaitable[_R]]) -> Callable[..., Awaitable[_R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> _R:
+            with request_priority(priority):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_priority() -> int:
+    """Return the priority of requests issued from the running task."""
+    return _REQUEST_PRIORITY.get()
+
+
+@contextmanager
+def request_scope(
+    token: CancelToken | None = None, timeout: float | None = None
+) -> Iterator[None]:
+    """Bind the requests issued inside the block to `token` and a deadline.
+
+    A nested scope keeps the outer token unless it brings its own, and
+    can only bring the deadline closer.
+    """
+    outer = _REQUEST_SCOPE.get()
+    deadline = outer.deadline
+    if timeout is not None:
+        own = asyncio.get_running_loop().time() + timeout
+        deadline = own if deadline is None else min(deadline, own)
+    scope = RequestScope(token if token is not None else outer.token, deadline)
+    reset = _REQUEST_SCOPE.set(scope)
+    try:
+        yield
+    finally:
+        _REQUEST_SCOPE.reset(reset)
+
+
+@contextmanager
+def detached_scope() -> Iterator[None]:
+    """Run the block free of the deadline and token of the caller."""
+    reset = _REQUEST_SCOPE.set(RequestScope())
+    try:
+        yield
+    finally:
+        _REQUEST_SCOPE.reset(reset)
+
+
+def current_scope() -> RequestScope:
+    """Return the deadline and token of requests issued from the running task."""
+    return _REQUEST_SCOPE.get()
+
+
+@dataclass(order=True)
+class PendingRequest:
+    """A request waiting for its turn on the wire.
+
+    A tuple of commands is a sequence: they go out back to back, nothing
+    else is sent in between.
+    """
+
+    priority: int
+    seq: int
+    command: str | tuple[str, ...] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    deadline: float | None = field(default=None, compare=False)
+
+    def expired(self, now: float) -> bool:
+        """Return True when the request is too late to be worth sending."""
+        return self.deadline is not None and now > self.deadline
+
+
+class RequestQueue:
+    """Pending requests ordered by priority, then by arrival."""
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self._heap: list[PendingRequest] = []
+        self._seq = itertools.count()
+        self._event = asyncio.Event()
+
+    def __len__(self) -> int:
+        """Return the number of queued requests."""
+        return len(self._heap)
+
+    def put(
+        self,
+        command: str | tuple[str, ...],
+        future: asyncio.Future,
+        priority: int,
+        scope: RequestScope | None = None,
+    ) -> PendingRequest:
+        """Queue a request, bound to the deadline and token of `scope`."""
+        deadline = None
+        if scope is not None:
+            deadline = scope.deadline
+            if scope.token is not None:
+                scope.token.attach(future)
+        entry = PendingRequest(priority, next(self._seq), command, future, deadline)
+        heapq.heappush(self._heap, entry)
+        self._event.set()
+        return entry
+
+    def pop(self) -> PendingRequest | None:
+        """Return the most urgent request, None when empty."""
+        if not self._heap:
+            return None
+        return heapq.heappop(self._heap)
+
+    async def async_wait(self) -> None:
+        """Wait until a request is queued."""
+        while not self._heap:
+            self._event.clear()
+            await self._event.wait()
+
+    def drain(self) -> list[PendingRequest]:
+        """Remove and return every queued request."""
+        entries, self._heap = self._heap, []
+        return entries
+
+    def depth(self) -> dict[str, int]:
+        """Return the number of queued requests per priority."""
+        result = {name: 0 for name in PRIORITY_NAMES.values()}
+        for entry in self._heap:
+            name = PRIORITY_NAMES.get(entry.priority, str(entry.priority))
+            result[name] = result.get(name, 0) + 1
+        return result
+
+
+@dataclass
+class _CollapsedCommand:
+    """Latest command for a key that has not started yet."""
+
+    factory: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    callers: int = 1
+
+
+class CommandCollapser:
+    """Merge pending commands for the same target.
+
+    A command waits while an earlier one with the same key is running.
+    Every command arriving meanwhile replaces the waiting one, so only the
+    latest target reaches the bus, and all the callers it superseded get
+    its result. Keyed by target alone, whatever the kind of command, the
+    writes to a target keep their order and the last one wins.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the collapser."""
+        self._waiting: dict[Hashable, _CollapsedCommand] = {}
+        self._running: dict[Hashable, asyncio.Future] = {}
+        self.collapsed = 0
+
+    async def async_run(
+        self, key: Hashable, factory: Callable[[], Awaitable[_R]]
+    ) -> _R:
+        """Run `factory` unless a later command with `key` supersedes it."""
+        if (entry := self._waiting.get(key)) is not None:
+            entry.factory = factory
+            entry.callers += 1
+            self.collapsed += 1
+        else:
+            loop = asyncio.get_running_loop()
+            entry = _CollapsedCommand(factory, loop.create_future())
+            self._waiting[key] = entry
+            # owned by a task so a cancelled caller does not strand the others
+            loop.create_task(self._async_execute(key, entry))
+
+        result = await asyncio.shield(entry.future)
+        return copy.copy(result) if entry.callers > 1 else result
+
+    async def _async_execute(self, key: Hashable, entry: _CollapsedCommand) -> None:
+        """Wait for the running command with the same key, then run the latest."""
+        # a burst issued in the same loop iteration lands on this entry
+        await asyncio.sleep(0)
+        while (running := self._running.get(key)) is not None:
+            await asyncio.wait([running])
+
+        del self._waiting[key]
+        self._running[key] = entry.future
+        try:
+            result = await entry.factory()
+        except asyncio.CancelledError:
+            entry.future.cancel()
+            raise
+        except Exception as exception_error:  # handed to every caller
+            entry.future.set_exception(exception_error)
+        else:
+            entry.future.set_result(result)
+        finally:
+            del self._running[key]
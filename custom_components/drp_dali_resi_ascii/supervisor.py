@@ -0,0 +1,93 @@
+"""Connection supervision helpers for a DALI RESI gateway."""
+from __future__ import annotations
+
+from enum import StrEnum
+import random
+from typing import Any
+
+BACKOFF_BASE = 1.0  # seconds before the first reconnect attempt
+BACKOFF_FACTOR = 2.0
+BACKOFF_MAX = 60.0  # seconds
+BACKOFF_JITTER = 0.5  # a delay is drawn from [1 - jitter, 1] * nominal
+
+LINK_DEAD_TIMEOUTS = 5  # replies missed in a row before the socket is dropped
+
+
+class ReconnectBackoff:
+    """Jittered exponential delays between reconnect attempts."""
+
+    def __init__(
+        self,
+        base: float = BACKOFF_BASE,
+        factor: float = BACKOFF_FACTOR,
+        maximum: float = BACKOFF_MAX,
+        jitter: float = BACKOFF_JITTER,
+    ) -> None:
+        """Initialize the backoff."""
+        self._base = base
+        self._factor = factor
+        self._maximum = maximum
+        self._jitter = jitter
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        """Return the delay before the next attempt and count it."""
+        nominal = min(self._maximum, self._base * self._factor ** self.attempts)
+        self.attempts += 1
+        return nominal * random.uniform(1 - self._jitter, 1)
+
+    def reset(self) -> None:
+        """Start over after a successful connection."""
+        self.attempts = 0
+
+
+class BreakerState(StrEnum):
+    """States of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail requests fast while the gateway is unreachable.
+
+    The breaker opens when the link is lost and goes half open once a new
+    connection is made; the first reply on it closes the breaker again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the breaker, open until the first connection."""
+        self.state = BreakerState.OPEN
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def allows_requests(self) -> bool:
+        """Return True when requests may be queued."""
+        if self.state is BreakerState.OPEN:
+            self.rejected += 1
+            return False
+        return True
+
+    def trip(self) -> None:
+        """Open the breaker."""
+        if self.state is not BreakerState.OPEN:
+            self.trips += 1
+        self.state = BreakerState.OPEN
+
+    def try_reset(self) -> None:
+        """Let trial traffic through on a new connection."""
+        self.state = BreakerState.HALF_OPEN
+
+    def reset(self) -> None:
+        """Close the breaker after a good reply."""
+        self.state = BreakerState.CLOSED
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker counters."""
+        return {
+            "state": self.state.value,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
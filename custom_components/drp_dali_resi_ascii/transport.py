@@ -0,0 +1,226 @@
+"""Transport backends carrying RESI ASCII frames to a DALI gateway."""
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSPORT_PROTOCOL = "protocol"
+TRANSPORT_TELNET = "telnet"
+
+FRAME_SEPARATOR = b"\r"
+FRAME_BUFFER_SIZE = 512  # bytes, replies are a few dozen bytes long
+
+
+class DALITransport(ABC):
+    """Byte stream to a RESI gateway delivering CR delimited frames.
+
+    Complete frames are handed to `on_frame` stripped of separators and
+    surrounding whitespace. `on_lost` is called once when the stream ends.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_frame: Callable[[str], None],
+        on_lost: Callable[[Exception | None], None],
+    ) -> None:
+        """Initialize the transport."""
+        self._host = host
+        self._port = port
+        self._on_frame = on_frame
+        self._on_lost = on_lost
+
+    @property
+    @abstractmethod
+    def connected(self) -> bool:
+        """Return True while the stream is usable."""
+
+    @abstractmethod
+    async def async_open(self) -> None:
+        """Open the stream, raise on failure."""
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        """Queue bytes for sending."""
+
+    async def async_drain(self) -> None:
+        """Wait until the queued bytes are handed to the socket."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Close the stream."""
+
+
+class ProtocolTransport(DALITransport, asyncio.Protocol):
+    """Plain TCP backend framing bytes straight from `data_received`."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_frame: Callable[[str], None],
+        on_lost: Callable[[Exception | None], None],
+    ) -> None:
+        """Initialize the transport."""
+        super().__init__(host, port, on_frame, on_lost)
+        self._transport: asyncio.Transport | None = None
+        self._buffer = bytearray(FRAME_BUFFER_SIZE)
+        self._size = 0
+        self._drain_waiter: asyncio.Future | None = None
+        self._paused = False
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the stream is usable."""
+        return self._transport is not None and not self._transport.is_closing()
+
+    async def async_open(self) -> None:
+        """Open the TCP connection."""
+        loop = asyncio.get_running_loop()
+        await loop.create_connection(lambda: self, self._host, self._port)
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Keep the transport, asyncio already disables Nagle on TCP."""
+        self._transport = transport
+        self._size = 0
+
+    def data_received(self, data: bytes) -> None:
+        """Append to the frame buffer and emit every complete frame."""
+        end = self._size + len(data)
+        if end > len(self._buffer):
+            # a reply longer than the buffer, grow once and keep going
+            self._buffer.extend(bytes(end - len(self._buffer)))
+        self._buffer[self._size:end] = data
+        self._size = end
+
+        start = 0
+        while (stop := self._buffer.find(FRAME_SEPARATOR, start, self._size)) != -1:
+            frame = self._buffer[start:stop].decode("ascii", errors="replace").strip()
+            start = stop + 1
+            if frame:
+                self._on_frame(frame)
+
+        if start:
+            remaining = self._size - start
+            self._buffer[:remaining] = self._buffer[start:self._size]
+            self._size = remaining
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Report the end of the stream."""
+        self._transport = None
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+        self._on_lost(exc)
+
+    def pause_writing(self) -> None:
+        """Socket buffer is full."""
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        """Socket buffer drained."""
+        self._paused = False
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+    def write(self, data: bytes) -> None:
+        """Queue bytes for sending."""
+        if self._transport is None:
+            raise ConnectionError("transport is closed")
+        self._transport.write(data)
+
+    async def async_drain(self) -> None:
+        """Wait until the socket accepts more data."""
+        if not self._paused:
+            return
+        self._drain_waiter = asyncio.get_running_loop().create_future()
+        await self._drain_waiter
+
+    def close(self) -> None:
+        """Close the TCP connection."""
+        if self._transport is not None:
+            self._transport.close()
+
+
+class TelnetTransport(DALITransport):
+    """Backend using telnetlib3 streams with a reader task for framing."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_frame: Callable[[str], None],
+        on_lost: Callable[[Exception | None], None],
+    ) -> None:
+        """Initialize the transport."""
+        super().__init__(host, port, on_frame, on_lost)
+        self._reader = None
+        self._writer = None
+        self._reader_task: asyncio.Task | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the stream is usable."""
+        return self._writer is not None
+
+    async def async_open(self) -> None:
+        """Open the telnet session and start framing its output."""
+        import telnetlib3  # pylint: disable=import-outside-toplevel
+
+        self._reader, self._writer = await telnetlib3.open_connection(
+            host=self._host, port=self._port
+        )
+        self._reader_task = asyncio.get_running_loop().create_task(
+            self._async_read_frames()
+        )
+
+    async def _async_read_frames(self) -> None:
+        """Split the stream into CR delimited frames."""
+        error: Exception | None = None
+        try:
+            while True:
+                frame = (
+                    await self._reader.readuntil(separator=FRAME_SEPARATOR)
+                ).decode("ascii", errors="replace").strip()
+                if frame:
+                    self._on_frame(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception_error:
+            error = exception_error
+        self._writer = None
+        self._on_lost(error)
+
+    def write(self, data: bytes) -> None:
+        """Queue bytes for sending."""
+        if self._writer is None:
+            raise ConnectionError("transport is closed")
+        self._writer.write(data.decode("ascii"))
+
+    async def async_drain(self) -> None:
+        """Wait until the socket accepts more data."""
+        if self._writer is not None:
+            await self._writer.drain()
+
+    def close(self) -> None:
+        """Close the telnet session."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception as exception_error:
+                _LOGGER.debug("telnet close: %s", exception_error)
+            self._writer = None
+        self._reader = None
+
+
+TRANSPORTS: dict[str, type[DALITransport]] = {
+    TRANSPORT_PROTOCOL: ProtocolTransport,
+    TRANSPORT_TELNET: TelnetTransport,
+}
@@ -0,0 +1,75 @@
+"""When to read a lamp back after a command."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    DEFAULT_VERIFY,
+    DEFAULT_VERIFY_SAMPLE,
+    VERIFY_ALWAYS,
+    VERIFY_DEFERRED,
+)
+
+ERROR_ALPHA = 0.25  # weight of the latest outcome in a lamp's error rate
+ERROR_RATE_LIMIT = 0.1  # above this a sampled lamp is verified every time
+
+
+class VerifyPolicy:
+    """Decide which commands are followed by a read back.
+
+    `always` reads back every command. `sampled` reads back one command
+    in `sample` per lamp, and every command while the lamp's recent
+    error rate is high. `deferred` never reads back, the next poll that
+    the command brought forward catches any drift.
+    """
+
+    def __init__(self, mode: str = DEFAULT_VERIFY, sample: int = DEFAULT_VERIFY_SAMPLE) -> None:
+        """Initialize the policy."""
+        self.mode = mode
+        self._sample = max(1, sample)
+        self._commands: dict[int, int] = {}
+        self._error_rate: dict[int, float] = {}
+        self.verified = 0
+        self.skipped = 0
+        self.mismatches = 0
+
+    def should_verify(self, lamp: int, mode: str | None = None) -> bool:
+        """Return True when the command just sent to `lamp` should be read back."""
+        mode = mode or self.mode
+        if mode == VERIFY_ALWAYS:
+            verify = True
+        elif mode == VERIFY_DEFERRED:
+            verify = False
+        else:
+            count = self._commands.get(lamp, 0)
+            self._commands[lamp] = count + 1
+            verify = (
+                count % self._sample == 0
+                or self._error_rate.get(lamp, 0.0) > ERROR_RATE_LIMIT
+            )
+
+        if verify:
+            self.verified += 1
+        else:
+            self.skipped += 1
+        return verify
+
+    def needs_verify(self, lamp: int) -> bool:
+        """Return True when `lamp` recently failed to follow its commands."""
+        return self._error_rate.get(lamp, 0.0) > ERROR_RATE_LIMIT
+
+    def record(self, lamp: int, ok: bool) -> None:
+        """Account for the outcome of a command or of its read back."""
+        if not ok:
+            self.mismatches += 1
+        rate = self._error_rate.get(lamp, 0.0)
+        self._error_rate[lamp] = rate + ERROR_ALPHA * ((0.0 if ok else 1.0) - rate)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the policy counters."""
+        return {
+            "mode": self.mode,
+            "verified": self.verified,
+            "skipped": self.skipped,
+            "mismatches": self.mismatches,
+        }
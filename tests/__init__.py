@@ -0,0 +1 @@
+"""Tests for the DALI RESI ASCII integration."""
@@ -0,0 +1,18 @@
+"""Fixtures shared by the tests."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii import inventory
+from custom_components.drp_dali_resi_ascii.transport import TRANSPORTS
+
+from .gateway import Gateway, MemoryStore
+
+
+@pytest.fixture(autouse=True)
+def _test_gateway(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Connect to the test gateway, keep the inventory in memory."""
+    monkeypatch.setitem(TRANSPORTS, "test", Gateway)
+    monkeypatch.setattr(inventory, "Store", MemoryStore)
+    Gateway.opened.clear()
+    MemoryStore.saved.clear()
@@ -0,0 +1,163 @@
+"""A RESI gateway with DALI gear behind it, for tests that check the wire."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import copy
+from types import SimpleNamespace
+from typing import Any
+
+from homeassistant.const import CONF_DELAY, CONF_HOST, CONF_NAME, CONF_PORT
+
+from custom_components.drp_dali_resi_ascii.const import CONF_TRANSPORT
+from custom_components.drp_dali_resi_ascii.transport import DALITransport
+
+TURNAROUND = 0.005  # seconds the gateway takes to answer
+
+CONFIG = {
+    CONF_NAME: "test",
+    CONF_HOST: "gateway",
+    CONF_PORT: 23,
+    CONF_DELAY: 0,
+    CONF_TRANSPORT: "test",
+}
+
+
+class Gear:
+    """What a short address holds: its level, fade time and scenes."""
+
+    def __init__(self) -> None:
+        self.level = 0
+        self.fade_time = 0
+        self.fade_rate = 7
+        self.scenes = [255] * 16
+
+
+class Gateway(DALITransport):
+    """Answers every frame after TURNAROUND, keeping what went over the wire.
+
+    DTR0 is shared by all gear, and the gateway loads it itself for the
+    DT8 queries, like the real one does.
+    """
+
+    opened: list[Gateway] = []
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_frame: Callable[[str], None],
+        on_lost: Callable[[Exception | None], None],
+    ) -> None:
+        super().__init__(host, port, on_frame, on_lost)
+        self.wire: list[str] = []
+        self.answers: dict[str, str] = {}
+        self.gear: dict[int, Gear] = {}
+        self.absent: set[int] = set()  # short addresses nothing answers at
+        self.dtr0 = 0
+        self.turnaround = TURNAROUND
+        self._buffer = b""
+        self._open = False
+
+    @property
+    def connected(self) -> bool:
+        return self._open
+
+    async def async_open(self) -> None:
+        self._open = True
+        Gateway.opened.append(self)
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        *frames, self._buffer = self._buffer.split(b"\r")
+        loop = asyncio.get_running_loop()
+        for frame in frames:
+            if not frame.strip():
+                continue
+            command = frame.decode("ascii").strip()
+            self.wire.append(command)
+            answer = self.answers.get(command) or self._execute(command)
+            loop.call_later(self.turnaround, self._on_frame, answer)
+
+    def close(self) -> None:
+        self._open = False
+
+    def _execute(self, command: str) -> str:
+        """Apply `command` to the gear and return the gateway reply."""
+        name, _, body = command.partition(":")
+        if name == "#DALI CMD16":
+            frame = int(body, 16)
+            if frame >> 8 == 0xA3:
+                self.dtr0 = frame & 0xFF
+            elif not frame & 0x8000 and not frame & 0x100:
+                self.gear.setdefault(frame >> 9, Gear()).level = frame & 0xFF
+            return "#OK"
+        if name in ("#LAMP QUERY TC", "#LAMP QUERY RGBWAF"):
+            self.dtr0 = 0xFF
+            lamp = int(body.split(",")[0])
+            if lamp in self.absent:
+                return name.replace("#LAMP QUERY ", "#LQ") + ":ERR"
+            if name == "#LAMP QUERY TC":
+                return f"#LQTC:{lamp},100,0x00FA,4000.0"
+            return f"#LQRGBWAF:{lamp},100,0,0,0,0,0"
+        lamp_part, _, opcode = body.partition("=")
+        if not lamp_part.isdigit():
+            return "#OK"
+        if int(lamp_part) in self.absent:
+            return "#OK:9,99,0x63"
+        gear = self.gear.setdefault(int(lamp_part), Gear())
+        if name == "#LAMP COMMAND REPEAT":
+            code = int(opcode, 16)
+            if code == 0x2E:
+                gear.fade_time = self.dtr0
+            elif 0x40 <= code <= 0x4F:
+                gear.scenes[code - 0x40] = self.dtr0
+            return "#OK"
+        if name == "#LAMP COMMAND ANSWER":
+            code = int(opcode, 16)
+            if code == 0xA5:
+                return f"#OK:1,{gear.fade_time << 4 | gear.fade_rate}"
+            if 0xB0 <= code <= 0xBF:
+                return f"#OK:1,{gear.scenes[code - 0xB0]}"
+            if code == 0xA0:
+                return f"#OK:1,{gear.level}"
+            return "#OK:1,255"
+        if name == "#LAMP OFF":
+            gear.level = 0
+        elif name == "#LAMP ARC POWER":
+            gear.level = int(opcode)
+        return "#OK"
+
+
+class MemoryStore:
+    """Storage helper keeping the data in memory, by storage key."""
+
+    saved: dict[str, Any] = {}
+
+    def __init__(self, hass: Any, version: int, key: str) -> None:
+        self._key = key
+
+    async def async_load(self) -> Any:
+        return copy.deepcopy(MemoryStore.saved.get(self._key))
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        MemoryStore.saved[self._key] = copy.deepcopy(data_func())
+
+
+def fake_hass() -> SimpleNamespace:
+    """Return what the client and hub use of Home Assistant."""
+    loop = asyncio.get_running_loop()
+    return SimpleNamespace(
+        loop=loop,
+        data={},
+        async_create_background_task=lambda coro, name: loop.create_task(coro),
+    )
+
+
+async def async_connect(client: Any) -> Gateway:
+    """Bring the link of `client` up, return its gateway with the probe taken off the wire."""
+    assert await client.async_pb_connect()
+    assert await client.async_wait_ready(1)
+    gateway = Gateway.opened[-1]
+    gateway.wire.clear()
+    return gateway
@@ -0,0 +1,63 @@
+"""Tests for decoding gateway replies."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii.dali_const import (
+    DALICMD,
+    DONE,
+    ERROR,
+    LAMP_COMMAND_ANSWER,
+    LAMP_COMMAND_REPEAT,
+    OFF,
+    OPCODE,
+    QUERY_SCENE_LEVEL,
+    RECALL_MAX_LEVEL,
+    RESICMD,
+    STORE_DTR_AS_FADETIME,
+    STORE_THE_DTR_AS_SCENE_0,
+    TAG,
+)
+from custom_components.drp_dali_resi_ascii.dali_resi_master import DALIRESIMaster
+
+
+@pytest.fixture
+def master() -> DALIRESIMaster:
+    """Return a master for its decoder, which keeps no state."""
+    return object.__new__(DALIRESIMaster)
+
+
+def _decode(master: DALIRESIMaster, command: str, action: str, response: str) -> dict:
+    async def _run() -> dict:
+        request = await master.async_build_request(
+            RESICMD[command], DALICMD[action], 4, "=" + DALICMD[action][OPCODE]
+        )
+        return await master.async_decode_dali_master_response(response, request)
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize(
+    "action", [OFF, RECALL_MAX_LEVEL, STORE_DTR_AS_FADETIME, STORE_THE_DTR_AS_SCENE_0]
+)
+def test_repeated_commands_decode(master: DALIRESIMaster, action: str) -> None:
+    """Every command sent twice by the hub has a tag to file its reply under."""
+    result = _decode(master, LAMP_COMMAND_REPEAT, action, "#OK")
+    assert result[DONE]
+    assert DALICMD[action][TAG] in result
+
+
+def test_query_answer(master: DALIRESIMaster) -> None:
+    """The answer byte is filed under the query tag."""
+    result = _decode(master, LAMP_COMMAND_ANSWER, QUERY_SCENE_LEVEL, "#OK:1,200")
+    assert result[DONE]
+    assert result[DALICMD[QUERY_SCENE_LEVEL][TAG]] == 200
+
+
+def test_query_without_answer(master: DALIRESIMaster) -> None:
+    """A lamp that does not answer is an error."""
+    result = _decode(master, LAMP_COMMAND_ANSWER, QUERY_SCENE_LEVEL, "#OK:9,99,0x63")
+    assert result[ERROR]
+    assert DONE not in result
@@ -0,0 +1,170 @@
+"""Tests for the order in which the dispatcher puts requests on the wire."""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.drp_dali_resi_ascii.dali_resi_master import DALIRESIClient3
+from custom_components.drp_dali_resi_ascii.scheduler import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    PRIORITY_VERIFY,
+    CancelToken,
+    request_priority,
+    request_scope,
+)
+
+from .gateway import CONFIG, TURNAROUND, async_connect, fake_hass
+
+
+def _call(client: DALIRESIClient3, command: str, priority: int) -> asyncio.Task:
+    with request_priority(priority):
+        return asyncio.create_task(client.async_pb_call({"command": command}))
+
+
+def _sequence(client: DALIRESIClient3, commands: list[str], priority: int) -> asyncio.Task:
+    with request_priority(priority):
+        return asyncio.create_task(
+            client.async_pb_call_sequence([{"command": command} for command in commands])
+        )
+
+
+def test_sequence_is_not_interleaved() -> None:
+    """A user command queued while a DTR is loaded waits for the sequence to end."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        sequence = _sequence(
+            client, ["#DALI CMD16:A306", "#LAMP COMMAND REPEAT:1=0x2E"], PRIORITY_POLL
+        )
+        await asyncio.sleep(TURNAROUND / 2)
+        command = _call(client, "#LAMP OFF:2", PRIORITY_INTERACTIVE)
+        assert await sequence == ["#OK", "#OK"]
+        assert await command == "#OK"
+        assert gateway.wire == [
+            "#DALI CMD16:A306", "#LAMP COMMAND REPEAT:1=0x2E", "#LAMP OFF:2",
+        ]
+        await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_sequence_stops_at_the_first_failure() -> None:
+    """What follows a failed DTR load would act on whatever DTR0 holds."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        gateway.answers["#DALI CMD16:A306"] = "#ERR"
+        replies = await _sequence(
+            client, ["#DALI CMD16:A306", "#LAMP COMMAND REPEAT:1=0x2E"], PRIORITY_INTERACTIVE
+        )
+        assert replies == ["#ERR", None]
+        assert gateway.wire == ["#DALI CMD16:A306"]
+        await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_replies_go_to_their_requests() -> None:
+    """Requests of one priority go out in arrival order, each gets its own reply."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        commands = [f"#LAMP COMMAND ANSWER:{lamp}=0xA0" for lamp in range(5)]
+        for lamp, command in enumerate(commands):
+            gateway.answers[command] = f"#OK:1,{lamp * 10}"
+        replies = await asyncio.gather(
+            *(_call(client, command, PRIORITY_POLL) for command in commands)
+        )
+        assert replies == [f"#OK:1,{lamp * 10}" for lamp in range(5)]
+        assert gateway.wire == commands
+        await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_lost_link_releases_the_waiting_requests() -> None:
+    """Everything queued or on the wire gets None when the connection drops."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        gateway.turnaround = 10
+        calls = [_call(client, f"#LAMP OFF:{lamp}", PRIORITY_POLL) for lamp in range(3)]
+        await asyncio.sleep(0.01)
+        gateway.close()
+        gateway._on_lost(None)
+        await client.async_close()
+        assert await asyncio.gather(*calls) == [None] * 3
+        assert await client.async_pb_call({"command": "#LAMP OFF:1"}) is None
+
+    asyncio.run(_run())
+
+
+def test_unsolicited_frame_is_not_taken_as_a_reply() -> None:
+    """A frame arriving while nothing is on the wire is dropped."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        gateway._on_frame("#OK:1,42")
+        await asyncio.sleep(0)
+        gateway.answers["#LAMP COMMAND ANSWER:1=0xA0"] = "#OK:1,7"
+        assert await _call(client, "#LAMP COMMAND ANSWER:1=0xA0", PRIORITY_POLL) == "#OK:1,7"
+        await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_user_commands_overtake_polls() -> None:
+    """Queued polls wait for a user command, verification reads go in between."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        busy = _call(client, "#LAMP COMMAND ANSWER:9=0xA0", PRIORITY_POLL)
+        await asyncio.sleep(TURNAROUND / 2)
+        calls = [
+            _call(client, "#LAMP COMMAND ANSWER:1=0xA0", PRIORITY_POLL),
+            _call(client, "#LAMP COMMAND ANSWER:2=0xA0", PRIORITY_VERIFY),
+            _call(client, "#LAMP OFF:3", PRIORITY_INTERACTIVE),
+        ]
+        await asyncio.gather(busy, *calls)
+        assert gateway.wire == [
+            "#LAMP COMMAND ANSWER:9=0xA0",
+            "#LAMP OFF:3",
+            "#LAMP COMMAND ANSWER:2=0xA0",
+            "#LAMP COMMAND ANSWER:1=0xA0",
+        ]
+        await client.async_close()
+
+    asyncio.run(_run())
+
+
+def test_expired_and_cancelled_requests_stay_off_the_wire() -> None:
+    """Polls queued past their deadline or for a cancelled owner are dropped."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        busy = _call(client, "#LAMP OFF:9", PRIORITY_POLL)
+        await asyncio.sleep(TURNAROUND / 2)
+        token = CancelToken()
+        with request_scope(timeout=TURNAROUND / 4):
+            late = _call(client, "#LAMP OFF:1", PRIORITY_POLL)
+        with request_scope(token):
+            owned = _call(client, "#LAMP OFF:2", PRIORITY_POLL)
+        kept = _call(client, "#LAMP OFF:3", PRIORITY_POLL)
+        await asyncio.sleep(0)
+        token.cancel()
+        assert await asyncio.gather(busy, late, owned, kept) == ["#OK", None, None, "#OK"]
+        assert gateway.wire == ["#LAMP OFF:9", "#LAMP OFF:3"]
+        assert client.statistics["dropped"] == {"expired": 1, "cancelled": 1}
+        with request_scope(token):
+            assert await client.async_pb_call({"command": "#LAMP OFF:2"}) is None
+        assert client.statistics["dropped"]["cancelled"] == 2
+        await client.async_close()
+
+    asyncio.run(_run())
@@ -0,0 +1,88 @@
+"""Tests for batching lamp commands into group and broadcast commands."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.drp_dali_resi_ascii.const import DALIActionModel
+from custom_components.drp_dali_resi_ascii.dali_const import DONE
+from custom_components.drp_dali_resi_ascii.fanout import FanOutBatcher
+from custom_components.drp_dali_resi_ascii.groups import GroupIndex
+
+WINDOW = 0.01
+
+
+def _hass() -> SimpleNamespace:
+    loop = asyncio.get_running_loop()
+    return SimpleNamespace(
+        loop=loop,
+        async_create_background_task=lambda coro, name: loop.create_task(coro),
+    )
+
+
+async def _async_level(batcher: FanOutBatcher, lamps: list[int], sent: list) -> list[dict]:
+    """Give every lamp level 100 at the same time."""
+
+    async def _async_group(model: str, address: int) -> dict:
+        sent.append((model, address))
+        return {DONE: True}
+
+    def _single(lamp: int):
+        async def _async_send() -> dict:
+            sent.append((DALIActionModel.LAMP, lamp))
+            return {DONE: True}
+
+        return _async_send
+
+    return await asyncio.gather(
+        *(batcher.async_submit(("level", 100), lamp, _async_group, _single(lamp)) for lamp in lamps)
+    )
+
+
+def test_no_broadcast_unless_the_bus_is_complete() -> None:
+    """Other gear on the bus must not follow commands meant for the lights."""
+
+    async def _run() -> None:
+        sent: list = []
+        batcher = FanOutBatcher(_hass(), {5, 9}, GroupIndex(), WINDOW)
+        await _async_level(batcher, [5, 9], sent)
+        assert sorted(sent) == [(DALIActionModel.LAMP, 5), (DALIActionModel.LAMP, 9)]
+
+    asyncio.run(_run())
+
+
+def test_broadcast_when_every_address_is_configured() -> None:
+    """All the lamps of a complete bus share one broadcast."""
+
+    async def _run() -> None:
+        sent: list = []
+        batcher = FanOutBatcher(_hass(), {5, 9}, GroupIndex(), WINDOW, complete=True)
+        results = await _async_level(batcher, [5, 9], sent)
+        assert sent == [(DALIActionModel.ALL, 0)]
+        assert all(result[DONE] for result in results)
+
+    asyncio.run(_run())
+
+
+def test_groups_need_the_gear_read() -> None:
+    """Configured groups may hold more gear than they claim."""
+
+    async def _run() -> None:
+        groups = GroupIndex()
+        lamps = {1, 2, 3}
+        for lamp in (1, 2):
+            groups.set_groups(lamp, 0b1, confirmed=False)
+        groups.set_groups(3, 0)
+
+        sent: list = []
+        batcher = FanOutBatcher(_hass(), lamps, groups, WINDOW, complete=True)
+        await _async_level(batcher, [1, 2], sent)
+        assert sorted(sent) == [(DALIActionModel.LAMP, 1), (DALIActionModel.LAMP, 2)]
+
+        for lamp in (1, 2):
+            groups.set_groups(lamp, 0b1)
+        sent.clear()
+        await _async_level(batcher, [1, 2], sent)
+        assert sent == [(DALIActionModel.GROUP, 0)]
+
+    asyncio.run(_run())
@@ -0,0 +1,118 @@
+"""Tests for the raw DALI frames sent with #DALI CMD16."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii import frames
+from custom_components.drp_dali_resi_ascii.const import DALIActionModel
+from custom_components.drp_dali_resi_ascii.dali_const import (
+    DT8_ACTIVATE,
+    OFF,
+    RECALL_MAX_LEVEL,
+    SET_DTR,
+    SET_DTR1,
+)
+
+LAMP = DALIActionModel.LAMP
+GROUP = DALIActionModel.GROUP
+ALL = DALIActionModel.ALL
+
+
+@pytest.mark.parametrize(
+    ("model", "address", "command", "expected"),
+    [
+        (LAMP, 5, False, 0x0A),
+        (LAMP, 5, True, 0x0B),
+        (LAMP, 63, True, 0x7F),
+        (GROUP, 3, False, 0x86),
+        (GROUP, 15, True, 0x9F),
+        (ALL, 0, False, 0xFE),
+        (ALL, 7, True, 0xFF),
+    ],
+)
+def test_address_byte(model: str, address: int, command: bool, expected: int) -> None:
+    """Short address 0AAAAAAS, group 100GGGGS, broadcast 1111111S."""
+    assert frames.address_byte(model, address, command) == expected
+
+
+def test_arc_power_clamps_the_level() -> None:
+    """Direct arc power carries the level, 255 (MASK) is never sent."""
+    assert frames.arc_power(LAMP, 5, 100) == 0x0A64
+    assert frames.arc_power(LAMP, 5, 300) == 0x0AFE
+    assert frames.arc_power(GROUP, 1, -1) == 0x8200
+    assert frames.arc_power(ALL, 0, 254) == 0xFEFE
+
+
+def test_command() -> None:
+    """Addressed commands take their opcode from DALICMD."""
+    assert frames.command(GROUP, 3, OFF) == 0x8700
+    assert frames.command(ALL, 0, RECALL_MAX_LEVEL) == 0xFF05
+    assert frames.command(LAMP, 2, DT8_ACTIVATE) == 0x05E2
+
+
+def test_special_keeps_the_data_byte() -> None:
+    """Special commands put the opcode first and mask the data."""
+    assert frames.special(SET_DTR, 0x12) == 0xA312
+    assert frames.special(SET_DTR1, 0x1234) == 0xC334
+
+
+def test_dt8_enables_colour_gear_first() -> None:
+    """Every DT8 command follows ENABLE DEVICE TYPE 8."""
+    assert frames.dt8(ALL, 0, DT8_ACTIVATE) == [0xC108, 0xFFE2]
+
+
+def test_colour_temperature() -> None:
+    """4000 K is 250 mirek, loaded low byte first then set and activated."""
+    assert frames.colour_temperature(LAMP, 1, 4000) == [
+        0xA3FA, 0xC300, 0xC108, 0x03E7, 0xC108, 0x03E2,
+    ]
+
+
+def test_colour_temperature_clamps_mirek() -> None:
+    """Out of range temperatures stay inside 1..0xFFFE mirek."""
+    assert frames.colour_temperature(LAMP, 1, 0)[:2] == [0xA3FE, 0xC3FF]
+    assert frames.colour_temperature(LAMP, 1, 10_000_000)[:2] == [0xA301, 0xC300]
+
+
+def test_rgb() -> None:
+    """Red, green and blue go to DTR0..2, then SET RGB DIMLEVEL and ACTIVATE."""
+    assert frames.rgbwaf(GROUP, 0, 255, 10, None) == [
+        0xA3FE, 0xC30A, 0xC5FF, 0xC108, 0x81EB, 0xC108, 0x81E2,
+    ]
+
+
+def test_rgbwaf_masks_missing_channels() -> None:
+    """White and amber add a WAF step, an absent channel is left unchanged."""
+    assert frames.rgbwaf(LAMP, 4, 1, 2, 3, white=20) == [
+        0xA301, 0xC302, 0xC503, 0xC108, 0x09EB,
+        0xA314, 0xC3FF, 0xC5FF, 0xC108, 0x09EC,
+        0xC108, 0x09E2,
+    ]
+
+
+def test_frame_hex() -> None:
+    """#DALI CMD16 takes four upper case hex digits."""
+    assert frames.frame_hex(0x0A64) == "0A64"
+    assert frames.frame_hex(0x5) == "0005"
+
+
+def test_scene() -> None:
+    """GO TO SCENE is one addressed command, 0x10 plus the scene."""
+    assert frames.scene(GROUP, 2, 5) == 0x8515
+    assert frames.scene(ALL, 0, 15) == 0xFF1F
+    assert frames.scene(LAMP, 1, 0) == 0x0310
+
+
+@pytest.mark.parametrize(
+    ("seconds", "code"),
+    [(-1, 0), (0, 0), (0.2, 0), (0.7, 1), (1, 2), (2, 4), (5, 7), (10, 9), (90, 15), (300, 15)],
+)
+def test_fade_time(seconds: float, code: int) -> None:
+    """Transitions map to the nearest fade time, 0.5 * sqrt(2 ** code) seconds."""
+    assert frames.fade_time(seconds) == code
+
+
+def test_fade_time_never_shortens_a_longer_transition() -> None:
+    """Longer transitions never get a shorter fade."""
+    codes = [frames.fade_time(tenths / 10) for tenths in range(0, 1000)]
+    assert codes == sorted(codes)
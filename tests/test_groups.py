@@ -0,0 +1,53 @@
+"""Tests for the group membership index."""
+from __future__ import annotations
+
+from custom_components.drp_dali_resi_ascii.groups import GroupIndex
+
+
+def test_index_both_ways() -> None:
+    """A lamp's group mask is mirrored in each group's lamp mask."""
+    index = GroupIndex()
+    assert not index
+    index.set_groups(3, 0b101)
+    index.set_groups(40, 0b100)
+
+    assert index
+    assert index.groups(3) == 0b101
+    assert index.mask(0) == 1 << 3
+    assert index.mask(2) == 1 << 3 | 1 << 40
+    assert index.members(2) == {3, 40}
+    assert index.members(1) == set()
+    assert dict(index.items()) == {0: {3}, 2: {3, 40}}
+    assert index.as_dict() == {"0": [3], "2": [3, 40]}
+
+
+def test_set_groups_replaces() -> None:
+    """New groups drop the lamp from the groups it left."""
+    index = GroupIndex()
+    index.set_groups(7, 0b11)
+    index.set_groups(7, 0b10)
+
+    assert index.members(0) == set()
+    assert index.members(1) == {7}
+    index.set_groups(7, 0)
+    assert not index
+
+
+def test_out_of_range_group() -> None:
+    """Groups outside 0..15 have no members."""
+    index = GroupIndex()
+    index.set_groups(1, 1)
+    assert index.mask(16) == 0
+    assert index.mask(-1) == 0
+
+
+def test_confirmed_only_when_read_from_gear() -> None:
+    """Configured groups are not confirmed until the gear is read."""
+    index = GroupIndex()
+    index.set_groups(1, 0b1, confirmed=False)
+    index.set_groups(2, 0b1)
+
+    assert not index.confirmed(1)
+    assert index.confirmed(2)
+    index.set_groups(1, 0b1)
+    assert index.confirmed(1)
@@ -0,0 +1,163 @@
+"""Tests for what the hub leaves in the gear."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.components.light import ColorMode
+
+from custom_components.drp_dali_resi_ascii import frames
+from custom_components.drp_dali_resi_ascii.const import DALIActionModel
+from custom_components.drp_dali_resi_ascii.dali_const import TARGET_LEVEL
+from custom_components.drp_dali_resi_ascii.dali_resi_master import DALIHub
+from custom_components.drp_dali_resi_ascii.inventory import INV_FADE_TIME
+from custom_components.drp_dali_resi_ascii.query_planner import lamp_poll_needs, plan_lamp_poll
+
+from .gateway import CONFIG, TURNAROUND, Gateway, Gear, async_connect, fake_hass
+
+
+async def _async_hub() -> tuple[DALIHub, Gateway]:
+    hub = DALIHub(fake_hass(), CONFIG)
+    return hub, await async_connect(hub)
+
+
+def test_fade_time_survives_a_dt8_poll() -> None:
+    """A TC query loading the DTRs meanwhile does not land in the fade time."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        poll = asyncio.create_task(hub.async_dali_20_dt8_retrieve_cw_ww_lamp(1))
+        await hub.async_dali_recall_level(8, "brightness", 1, 100, transition=2)
+        await poll
+        assert gateway.gear[1].fade_time == frames.fade_time(2)
+        assert hub.inventory.get(1, INV_FADE_TIME) == frames.fade_time(2)
+        assert gateway.gear[1].level == 100
+        await hub.async_close()
+
+    asyncio.run(_run())
+
+
+def test_fade_time_is_read_back_before_it_is_kept() -> None:
+    """Gear that did not take the fade time is programmed once more, the inventory keeps what it holds."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        gateway.answers["#LAMP COMMAND REPEAT:1=0x2E"] = "#OK"
+        await hub.async_dali_recall_level(8, "brightness", 1, 100, transition=2)
+        assert gateway.wire.count("#LAMP COMMAND REPEAT:1=0x2E") == 2
+        assert hub.inventory.get(1, INV_FADE_TIME) == 0
+        await hub.async_close()
+
+    asyncio.run(_run())
+
+
+def test_no_transition_restores_the_fade_time_of_the_gear() -> None:
+    """The fade time the gear had before the first transition comes back, unknown or not."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        gateway.gear[1] = Gear()
+        gateway.gear[1].fade_time = 5
+        await hub.async_dali_recall_level(8, "brightness", 1, 100, transition=2)
+        assert gateway.gear[1].fade_time == frames.fade_time(2)
+        await hub.async_dali_recall_level(8, "brightness", 1, 50)
+        assert gateway.gear[1].fade_time == 5
+        await hub.async_close()
+
+    asyncio.run(_run())
+
+
+def test_unreadable_fade_time_is_not_changed() -> None:
+    """With no way back the transition is not programmed."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        gateway.answers["#LAMP COMMAND ANSWER:1=0xA5"] = "#OK:9,99,0x63"
+        await hub.async_dali_recall_level(8, "brightness", 1, 100, transition=2)
+        assert "#LAMP COMMAND REPEAT:1=0x2E" not in gateway.wire
+        assert gateway.gear[1].level == 100
+        await hub.async_close()
+
+    asyncio.run(_run())
+
+
+def test_dt8_group_frames_are_not_interleaved() -> None:
+    """ENABLE DEVICE TYPE 8 and the DTRs reach the command they are loaded for."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        dali_frames = frames.colour_temperature(DALIActionModel.GROUP, 0, 4000)
+        polls = [
+            asyncio.create_task(hub.async_dali_20_dt8_retrieve_cw_ww_lamp(lamp)) for lamp in (5, 6)
+        ]
+        await asyncio.sleep(TURNAROUND / 2)
+        await hub.async_dali_group_recall_color_temperature_level(
+            DALIActionModel.GROUP, 0, None, 4000
+        )
+        await asyncio.gather(*polls)
+        sent = [f"#DALI CMD16:{frames.frame_hex(frame)}" for frame in dali_frames]
+        start = gateway.wire.index(sent[0])
+        assert gateway.wire[start:start + len(sent)] == sent
+        await hub.async_close()
+
+    asyncio.run(_run())
+
+
+def test_scene_stores_the_level_asked_for() -> None:
+    """A DT8 poll loading DTR0 meanwhile does not end up in the scene."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        polls = [
+            asyncio.create_task(hub.async_dali_20_dt8_retrieve_cw_ww_lamp(lamp)) for lamp in (5, 6)
+        ]
+        await asyncio.sleep(TURNAROUND / 2)
+        assert await hub.async_dali_program_scene(3, {1: 120, 2: 40}) == {1: True, 2: True}
+        await asyncio.gather(*polls)
+        assert gateway.gear[1].scenes[3] == 120
+        assert gateway.gear[2].scenes[3] == 40
+        assert gateway.wire.count("#LAMP COMMAND REPEAT:1=0x43") == 1
+        await hub.async_close()
+
+    asyncio.run(_run())
+
+
+def test_off_is_not_overtaken_by_a_level() -> None:
+    """A level queued before an OFF never reaches the lamp after it."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        first = asyncio.create_task(hub.async_dali_recall_level(8, "brightness", 1, 100))
+        await asyncio.sleep(TURNAROUND / 2)
+        later = [
+            asyncio.create_task(hub.async_dali_recall_level(8, "brightness", 1, 150)),
+            asyncio.create_task(hub.async_dali_recall_off(8, "brightness", 1)),
+        ]
+        await first
+        responses = await asyncio.gather(*later)
+        assert gateway.gear[1].level == 0
+        assert "#LAMP ARC POWER:1=150" not in gateway.wire
+        assert all(response[TARGET_LEVEL] == 0 for response in responses)
+        await hub.async_close()
+
+    asyncio.run(_run())
+
+
+def test_plan_of_a_silent_lamp_has_no_result() -> None:
+    """A lamp that answered none of its queries is not reported available."""
+
+    async def _run() -> None:
+        hub, gateway = await _async_hub()
+        gateway.absent.add(7)
+        for color_mode in (ColorMode.BRIGHTNESS, ColorMode.COLOR_TEMP, ColorMode.RGB):
+            plan = plan_lamp_poll(color_mode, lamp_poll_needs(color_mode, False, True))
+            assert await hub.async_dali_execute_plan(7, plan) is None
+
+        plan = plan_lamp_poll(ColorMode.BRIGHTNESS, lamp_poll_needs(ColorMode.BRIGHTNESS, True, True))
+        gateway.gear[1] = Gear()
+        gateway.gear[1].level = 80
+        result = await hub.async_dali_execute_plan(1, plan)
+        assert result is not None
+        assert result["brightness"] == 80
+        await hub.async_close()
+
+    asyncio.run(_run())
@@ -0,0 +1,76 @@
+"""Tests for the persistent lamp inventory."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii import inventory
+from custom_components.drp_dali_resi_ascii.inventory import (
+    INV_DEVICE_TYPE,
+    INV_FADE_TIME,
+    INV_GROUPS,
+    INVENTORY_MAX_AGE,
+    INVENTORY_RETRY,
+    LampInventory,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Wall clock the inventory reads, moved by the test."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(inventory, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_entries_survive_a_restart(clock: list[float]) -> None:
+    """A second inventory for the same gateway finds what the first stored."""
+
+    async def _run() -> None:
+        first = LampInventory(None, "gateway", 23)
+        await first.async_load()
+        first.update(5, {INV_DEVICE_TYPE: 8, INV_GROUPS: 0b10})
+        other = LampInventory(None, "other", 23)
+        await other.async_load()
+        assert other.get(5, INV_DEVICE_TYPE) is None
+
+        second = LampInventory(None, "gateway", 23)
+        await second.async_load()
+        assert second.get(5, INV_DEVICE_TYPE) == 8
+        assert not second.due(5)
+
+    asyncio.run(_run())
+
+
+def test_missing_and_old_entries_are_due(clock: list[float]) -> None:
+    """Unknown lamps, entries without groups and stale entries are read again."""
+    lamps = LampInventory(None, "gateway", 23)
+    assert lamps.due(1)
+    lamps.update(1, {INV_DEVICE_TYPE: 6})
+    assert lamps.due(1)
+    lamps.update(1, {INV_GROUPS: 0})
+    assert not lamps.due(1)
+    clock[0] += INVENTORY_MAX_AGE + 1
+    assert lamps.due(1)
+    assert lamps.as_dict() == {"lamps": 1, "due": 1}
+
+
+def test_silent_lamp_is_not_asked_again_right_away(clock: list[float]) -> None:
+    """A lamp that did not answer waits INVENTORY_RETRY before the next read."""
+    lamps = LampInventory(None, "gateway", 23)
+    lamps.attempt(2)
+    assert not lamps.due(2)
+    clock[0] += INVENTORY_RETRY + 1
+    assert lamps.due(2)
+
+
+def test_written_values_keep_the_age(clock: list[float]) -> None:
+    """Settings written to the gear do not count as a refresh."""
+    lamps = LampInventory(None, "gateway", 23)
+    lamps.update(3, {INV_DEVICE_TYPE: 6, INV_GROUPS: 0})
+    clock[0] += INVENTORY_MAX_AGE + 1
+    lamps.update(3, {INV_FADE_TIME: 4}, refreshed=False)
+    assert lamps.get(3, INV_FADE_TIME) == 4
+    assert lamps.due(3)
@@ -0,0 +1,26 @@
+"""Tests for the light entities."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii.const import DALIActionModel
+from custom_components.drp_dali_resi_ascii.light import DALIGroupLight, DALILight
+
+
+def _light(cls: type[DALILight], model: str, address: int) -> DALILight:
+    """Return a light with only its address set."""
+    light = object.__new__(cls)
+    light._action_model = model
+    light._slave = address
+    return light
+
+
+def test_lamp_joins_its_segment() -> None:
+    """The switch constraint of a lamp powers its short address."""
+    assert _light(DALILight, DALIActionModel.LAMP, 5)._segment_lamp == 5
+
+
+@pytest.mark.parametrize("model", [DALIActionModel.GROUP, DALIActionModel.ALL])
+def test_group_address_is_no_short_address(model: str) -> None:
+    """Group 5 must not suspend or release the lamp at short address 5."""
+    assert _light(DALIGroupLight, model, 5)._segment_lamp is None
@@ -0,0 +1,58 @@
+"""Tests for bringing the gateway link up and keeping it up."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii.const import CONF_COALESCE_WRITES, CONF_TRANSPORT
+from custom_components.drp_dali_resi_ascii.dali_resi_master import DALIRESIClient3
+from custom_components.drp_dali_resi_ascii.transport import TRANSPORTS
+
+from .gateway import CONFIG, Gateway, async_connect, fake_hass
+
+
+class SplitGateway(Gateway):
+    """Gateway garbling a frame that comes in a single write."""
+
+    def write(self, data: bytes) -> None:
+        if data.startswith(b"\r#") and data.endswith(b"\r"):
+            self.wire.append(data.decode("ascii").strip())
+            asyncio.get_running_loop().call_soon(self._on_frame, "?")
+            return
+        super().write(data)
+
+
+def test_single_write_frames_when_accepted() -> None:
+    """The probe answered, every frame goes out in one write."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        gateway = await async_connect(client)
+        assert client.statistics["coalesced_write"]
+        assert await client.async_pb_call({"command": "#LAMP OFF:1"}) == "#OK"
+        assert gateway.wire == ["#LAMP OFF:1"]
+        await client.async_close()
+
+    asyncio.run(_run())
+
+
+@pytest.mark.parametrize("transport", ["split", "test"])
+def test_split_writes_when_single_writes_fail(
+    monkeypatch: pytest.MonkeyPatch, transport: str
+) -> None:
+    """A gateway garbling single write frames, or a config opting out, gets split writes."""
+    monkeypatch.setitem(TRANSPORTS, "split", SplitGateway)
+
+    async def _run() -> None:
+        config = {**CONFIG, CONF_TRANSPORT: transport}
+        if transport == "test":
+            config[CONF_COALESCE_WRITES] = False
+        client = DALIRESIClient3(fake_hass(), config)
+        gateway = await async_connect(client)
+        assert not client.statistics["coalesced_write"]
+        assert await client.async_pb_call({"command": "#LAMP OFF:1"}) == "#OK"
+        assert gateway.wire == ["#LAMP OFF:1"]
+        await client.async_close()
+
+    asyncio.run(_run())
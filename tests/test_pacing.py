@@ -0,0 +1,116 @@
+"""Tests for the command pacing, the reply timeout estimators and the bus budget."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii.pacing import (
+    DEFAULT_COMMAND_GAP,
+    DEFAULT_PREAMBLE_GAP,
+    MAX_GAP,
+    REPLY_DT8,
+    REPLY_FLOORS,
+    REPLY_QUERY,
+    REPLY_REPEAT,
+    RTO_MIN,
+    SHRINK_AFTER,
+    SHRINK_FACTOR,
+    PacingController,
+    ReplyTimeout,
+    TokenBucket,
+)
+
+
+def test_gaps_shrink_after_a_run_of_clean_replies() -> None:
+    """The historical gaps are only kept until the gateway proves faster."""
+    pacing = PacingController("test")
+    for _ in range(SHRINK_AFTER - 1):
+        pacing.record_reply(0.05)
+    assert (pacing.preamble_gap, pacing.command_gap) == (DEFAULT_PREAMBLE_GAP, DEFAULT_COMMAND_GAP)
+    pacing.record_reply(0.05)
+    assert pacing.preamble_gap == pytest.approx(DEFAULT_PREAMBLE_GAP * SHRINK_FACTOR)
+    assert pacing.command_gap == pytest.approx(DEFAULT_COMMAND_GAP * SHRINK_FACTOR)
+    assert pacing.turnaround == pytest.approx(0.05)
+
+
+def test_gaps_back_off_and_stay_above_the_failure() -> None:
+    """After an error shrinking stops short of the gap that failed."""
+    pacing = PacingController("test")
+    pacing.record_error()
+    assert pacing.command_gap == pytest.approx(2 * DEFAULT_COMMAND_GAP)
+    for _ in range(2 * SHRINK_AFTER):
+        pacing.record_reply(0.05)
+    assert DEFAULT_COMMAND_GAP < pacing.command_gap < 2 * DEFAULT_COMMAND_GAP
+    assert pacing.errors == 1
+
+
+def test_back_off_is_bounded() -> None:
+    """A gateway that keeps failing does not slow commands down without end."""
+    pacing = PacingController("test")
+    for _ in range(20):
+        pacing.record_error()
+    assert pacing.preamble_gap == pacing.command_gap == MAX_GAP
+
+
+def test_ceiling_until_the_first_reply() -> None:
+    """Nothing is known before the first reply."""
+    assert ReplyTimeout("test", 3).timeout == 3
+
+
+def test_follows_the_round_trip() -> None:
+    """Steady replies bring the timeout close to the round trip."""
+    estimator = ReplyTimeout("test", 3)
+    for _ in range(50):
+        estimator.record_sample(0.2)
+    assert 0.2 < estimator.timeout < 0.25
+
+
+def test_never_below_the_floor() -> None:
+    """Fast replies do not take the timeout under what the bus needs."""
+    estimator = ReplyTimeout("test", 3, REPLY_FLOORS[REPLY_DT8])
+    for _ in range(50):
+        estimator.record_sample(0.01)
+    assert estimator.timeout == pytest.approx(REPLY_FLOORS[REPLY_DT8])
+
+    plain = ReplyTimeout("test", 3)
+    for _ in range(50):
+        plain.record_sample(0.001)
+    assert plain.timeout == RTO_MIN
+
+
+def test_timeout_backs_off_to_the_ceiling() -> None:
+    """Each timeout doubles the wait, up to the ceiling."""
+    estimator = ReplyTimeout("test", 1)
+    for _ in range(20):
+        estimator.record_sample(0.1)
+    before = estimator.timeout
+    estimator.record_timeout()
+    assert estimator.timeout == pytest.approx(2 * before)
+    for _ in range(10):
+        estimator.record_timeout()
+    assert estimator.timeout == 1
+    assert estimator.timeouts == 11
+
+
+def test_floors_follow_the_bus_work() -> None:
+    """A repeat sends two frames, a DT8 command several transactions."""
+    assert REPLY_FLOORS[REPLY_QUERY] < REPLY_FLOORS[REPLY_REPEAT] < REPLY_FLOORS[REPLY_DT8]
+
+
+def test_bucket_goes_into_debt_and_pays_it_back() -> None:
+    """Transactions always take a token, background work waits out the debt."""
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.delay(0) == 0
+    for _ in range(4):
+        bucket.consume(0)
+    assert bucket.delay(0) == pytest.approx(0.2)
+    assert bucket.delay(0.2) == 0
+    assert bucket.consumed == 4
+
+
+def test_bucket_does_not_save_up_past_its_capacity() -> None:
+    """A long idle time does not allow a burst larger than the capacity."""
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.consume(0)
+    for _ in range(3):
+        bucket.consume(100)
+    assert bucket.delay(100) == pytest.approx(0.1)
@@ -0,0 +1,159 @@
+"""Tests for the hub wide poll scheduler."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii.pacing import TokenBucket
+from custom_components.drp_dali_resi_ascii.poller import FIRST_POLL_DELAY, PollScheduler
+
+from .gateway import fake_hass
+
+BUDGET = 1000.0  # polls per second, out of the way unless a test is about it
+
+
+def _poll(log: list, key: int, duration: float = 0.0):
+    async def _async_poll() -> None:
+        loop = asyncio.get_running_loop()
+        log.append((key, loop.time()))
+        await asyncio.sleep(duration)
+        log.append((key, None))
+
+    return _async_poll
+
+
+def test_polls_run_one_at_a_time_spread_over_the_interval() -> None:
+    """After the first polls the entities take evenly spaced turns."""
+
+    async def _run() -> None:
+        log: list = []
+        poller = PollScheduler(fake_hass(), "test", BUDGET, 0.3, 0.3)
+        for key in range(3):
+            poller.async_register(key, _poll(log, key, 0.02), 0.3)
+        await asyncio.sleep(FIRST_POLL_DELAY + 0.75)
+        poller.async_stop()
+
+        # a poll ends before the next starts
+        assert all(end[1] is None for end in log[1::2])
+        assert all(start[0] == end[0] for start, end in zip(log[::2], log[1::2]))
+        starts = [time for _, time in log[::2]]
+        assert [key for key, _ in log[::2]][:6] == [0, 1, 2, 0, 1, 2]
+        gaps = [later - earlier for earlier, later in zip(starts[3:], starts[4:])]
+        assert gaps
+        assert all(gap == pytest.approx(0.1, abs=0.03) for gap in gaps)
+
+    asyncio.run(_run())
+
+
+def test_requested_poll_goes_first() -> None:
+    """An entity asking for a refresh does not wait for its turn."""
+
+    async def _run() -> None:
+        log: list = []
+        poller = PollScheduler(fake_hass(), "test", BUDGET, 10, 10)
+        for key in range(3):
+            poller.async_register(key, _poll(log, key), 10)
+        await asyncio.sleep(FIRST_POLL_DELAY + 0.05)
+        log.clear()
+        poller.async_request_poll(2)
+        await asyncio.sleep(0.05)
+        poller.async_stop()
+        assert [key for key, time in log if time is not None] == [2]
+
+    asyncio.run(_run())
+
+
+def test_interval_follows_how_often_a_lamp_changes() -> None:
+    """Quiet lamps are polled less and less often, a change brings them back."""
+
+    async def _run() -> None:
+        poller = PollScheduler(fake_hass(), "test", BUDGET, 2, 8)
+        poller.async_register(1, _poll([], 1), 2)
+        poller.async_stop()
+        intervals = []
+        for _ in range(5):
+            poller.async_report(1, changed=False)
+            intervals.append(1 / poller.poll_rate)
+        assert intervals == pytest.approx([3, 4.5, 6.75, 8, 8])
+        poller.async_report(1, changed=True)
+        assert 1 / poller.poll_rate == pytest.approx(2)
+        poller.async_report(1, changed=False)
+        poller.async_mark_active(1)
+        assert poller.as_dict()["fast"] == 1
+
+    asyncio.run(_run())
+
+
+def test_nothing_is_polled_until_the_link_is_ready() -> None:
+    """Polls wait for the link, then a sweep goes through the lamps by address."""
+
+    async def _run() -> None:
+        log: list = []
+        ready = asyncio.Event()
+        hass = fake_hass()
+        poller = PollScheduler(hass, "test", BUDGET, 10, 10, ready)
+        for key, lamp in (("c", 7), ("a", 3), ("b", 5)):
+            poller.async_register(key, _poll(log, key), 10, order=lamp)
+        await asyncio.sleep(FIRST_POLL_DELAY + 0.05)
+        assert log == []
+
+        since = hass.loop.time()
+        ready.set()
+        poller.async_sweep(since)
+        await asyncio.sleep(0.05)
+        assert [key for key, time in log if time is not None] == ["a", "b", "c"]
+        assert poller.time_to_availability is None
+        for key in ("a", "b"):
+            poller.async_report(key, changed=False)
+        poller.async_report("c", changed=False, available=False)
+        assert poller.time_to_availability is None
+        poller.async_report("c", changed=True)
+        assert poller.time_to_availability == pytest.approx(0.05, abs=0.03)
+        poller.async_stop()
+
+    asyncio.run(_run())
+
+
+def test_suspended_segment_is_resynced_on_resume() -> None:
+    """Lamps behind a switched off feed are skipped, then all polled once it is back."""
+
+    async def _run() -> None:
+        log: list = []
+        poller = PollScheduler(fake_hass(), "test", BUDGET, 10, 10)
+        poller.async_register("a", _poll(log, "a"), 10, order=4, segment="switch.feed")
+        poller.async_register("b", _poll(log, "b"), 10, order=2, segment="switch.feed")
+        poller.async_register("c", _poll(log, "c"), 10, order=3)
+        poller.async_suspend_segment("switch.feed")
+        await asyncio.sleep(FIRST_POLL_DELAY + 0.05)
+        assert [key for key, time in log if time is not None] == ["c"]
+        assert poller.poll_rate == pytest.approx(0.1)
+        log.clear()
+
+        poller.async_resume_segment("switch.feed", 0.02)
+        await asyncio.sleep(0.05)
+        assert [key for key, time in log if time is not None] == ["b", "a"]
+        assert poller.as_dict()["suspended_segments"] == []
+        poller.async_stop()
+
+    asyncio.run(_run())
+
+
+def test_polls_stretch_to_the_bus_budget() -> None:
+    """Intervals asking for more than the bus can carry are spread out."""
+
+    async def _run() -> None:
+        bus = TokenBucket(rate=2)
+
+        async def _async_poll() -> None:
+            bus.consume(asyncio.get_running_loop().time())
+
+        poller = PollScheduler(fake_hass(), "test", BUDGET, 1, 1, bus=bus)
+        for key in range(4):
+            poller.async_register(key, _async_poll, 1)
+        await asyncio.sleep(FIRST_POLL_DELAY + 0.05)
+        poller.async_stop()
+        assert poller.overloaded
+        assert poller.spacing == pytest.approx(0.5)
+
+    asyncio.run(_run())
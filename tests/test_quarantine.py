@@ -0,0 +1,83 @@
+"""Tests for the quarantine of silent short addresses."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from custom_components.drp_dali_resi_ascii.poller import FIRST_POLL_DELAY, PollScheduler
+from custom_components.drp_dali_resi_ascii.quarantine import (
+    QUARANTINE_AFTER,
+    QUARANTINE_BASE,
+    QUARANTINE_MAX,
+    LampQuarantine,
+    is_no_answer,
+)
+
+from .gateway import fake_hass
+
+
+def test_no_answer_replies() -> None:
+    """A timeout or a missing backward frame is silence, a dropped request is not."""
+    assert is_no_answer("#OK:9,99,0x63")
+    assert is_no_answer("")
+    assert not is_no_answer(None)
+    assert not is_no_answer("#OK:1,254")
+
+
+def test_backoff_doubles_with_every_miss() -> None:
+    """Quarantine starts after a few misses and its wait is bounded."""
+    quarantine = LampQuarantine("test")
+    for _ in range(QUARANTINE_AFTER - 1):
+        quarantine.record(4, False)
+    assert 4 not in quarantine
+    assert quarantine.backoff(4) == 0
+    quarantine.record(4, False)
+    assert 4 in quarantine
+    assert quarantine.backoff(4) == QUARANTINE_BASE
+    quarantine.record(4, False)
+    assert quarantine.backoff(4) == 2 * QUARANTINE_BASE
+    for _ in range(40):
+        quarantine.record(4, False)
+    assert quarantine.backoff(4) == QUARANTINE_MAX
+    assert quarantine.log_level(4) == logging.DEBUG
+
+
+def test_an_answer_releases_the_lamp() -> None:
+    """One answer is enough to poll the lamp at its interval again."""
+    quarantine = LampQuarantine("test")
+    for _ in range(QUARANTINE_AFTER):
+        quarantine.record(4, False)
+    quarantine.record(4, True)
+    assert 4 not in quarantine
+    assert quarantine.log_level(4) == logging.ERROR
+    assert quarantine.as_dict() == {"lamps": [], "quarantined": 1, "released": 1}
+
+
+def test_quarantined_lamp_is_polled_after_the_backoff() -> None:
+    """A silent lamp gives its turns to the others and does not hold up a sweep."""
+
+    async def _run() -> None:
+        quarantine = LampQuarantine("test")
+        polls: list[int] = []
+
+        def _poll(lamp: int):
+            async def _async_poll() -> None:
+                polls.append(lamp)
+                quarantine.record(lamp, lamp != 1)
+
+            return _async_poll
+
+        hass = fake_hass()
+        poller = PollScheduler(hass, "test", 1000, 0.05, 0.05, quarantine=quarantine)
+        for lamp in (1, 2):
+            poller.async_register(lamp, _poll(lamp), 0.05, order=lamp)
+        poller.async_sweep(hass.loop.time())
+        poller.async_report(2, changed=False)
+        await asyncio.sleep(FIRST_POLL_DELAY + 0.5)
+        poller.async_stop()
+        assert 1 in quarantine
+        assert polls.count(1) == QUARANTINE_AFTER
+        assert polls.count(2) > 5
+        assert poller.time_to_availability is not None
+
+    asyncio.run(_run())
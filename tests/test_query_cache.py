@@ -0,0 +1,132 @@
+"""Tests for the query answer cache."""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.drp_dali_resi_ascii.dali_const import DONE, ERROR
+from custom_components.drp_dali_resi_ascii.query_cache import QueryCache
+
+
+class _Bus:
+    """Answers queries, counting the round trips."""
+
+    def __init__(self, answer: dict | None = None, delay: float = 0) -> None:
+        self.calls = 0
+        self._answer = answer if answer is not None else {DONE: True, "level": 100}
+        self._delay = delay
+
+    async def async_query(self) -> dict:
+        self.calls += 1
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return dict(self._answer)
+
+
+def test_fresh_answer_is_reused() -> None:
+    """A second ask within the ttl does not touch the bus."""
+
+    async def _run() -> None:
+        cache = QueryCache(ttl=10)
+        bus = _Bus()
+        first = await cache.async_query((1, "level"), bus.async_query)
+        second = await cache.async_query((1, "level"), bus.async_query)
+        assert bus.calls == 1
+        assert first == second
+        assert first is not second
+        assert cache.as_dict()["hits"] == 1
+
+    asyncio.run(_run())
+
+
+def test_concurrent_asks_share_one_round_trip() -> None:
+    """Callers asking while the query is on the wire wait for it."""
+
+    async def _run() -> None:
+        cache = QueryCache(ttl=10)
+        bus = _Bus(delay=0.01)
+        answers = await asyncio.gather(
+            *(cache.async_query((1, "level"), bus.async_query) for _ in range(3))
+        )
+        assert bus.calls == 1
+        assert all(answer["level"] == 100 for answer in answers)
+        assert cache.shared == 2
+
+    asyncio.run(_run())
+
+
+def test_failures_are_not_kept() -> None:
+    """An unanswered query is asked again."""
+
+    async def _run() -> None:
+        cache = QueryCache(ttl=10)
+        bus = _Bus({ERROR: True})
+        await cache.async_query((1, "level"), bus.async_query)
+        await cache.async_query((1, "level"), bus.async_query)
+        assert bus.calls == 2
+
+    asyncio.run(_run())
+
+
+def test_invalidate_drops_the_lamp_only() -> None:
+    """A command to a lamp forgets its answers, not the others'."""
+
+    async def _run() -> None:
+        cache = QueryCache(ttl=10)
+        bus = _Bus()
+        await cache.async_query((1, "level"), bus.async_query)
+        await cache.async_query((2, "level"), bus.async_query)
+        cache.invalidate(1)
+        await cache.async_query((1, "level"), bus.async_query)
+        await cache.async_query((2, "level"), bus.async_query)
+        assert bus.calls == 3
+
+    asyncio.run(_run())
+
+
+def test_invalidate_during_query_keeps_the_stale_answer_out() -> None:
+    """An answer read before the command landed is not stored."""
+
+    async def _run() -> None:
+        cache = QueryCache(ttl=10)
+        bus = _Bus(delay=0.05)
+        query = asyncio.create_task(cache.async_query((1, "level"), bus.async_query))
+        await asyncio.sleep(0.01)
+        assert bus.calls == 1
+        cache.invalidate(1)
+        await query
+        await cache.async_query((1, "level"), bus.async_query)
+        assert bus.calls == 2
+
+    asyncio.run(_run())
+
+
+def test_zero_ttl_disables_caching() -> None:
+    """With a ttl of 0 every ask goes to the bus."""
+
+    async def _run() -> None:
+        cache = QueryCache(ttl=0)
+        bus = _Bus()
+        await cache.async_query((1, "level"), bus.async_query)
+        await cache.async_query((1, "level"), bus.async_query)
+        assert bus.calls == 2
+
+    asyncio.run(_run())
+
+
+def test_least_recently_used_goes_first() -> None:
+    """The cache keeps `size` answers."""
+
+    async def _run() -> None:
+        cache = QueryCache(ttl=10, size=2)
+        bus = _Bus()
+        for lamp in (1, 2):
+            await cache.async_query((lamp, "level"), bus.async_query)
+        await cache.async_query((1, "level"), bus.async_query)
+        await cache.async_query((3, "level"), bus.async_query)
+        assert bus.calls == 3
+        # 2 was the least recently used
+        await cache.async_query((2, "level"), bus.async_query)
+        await cache.async_query((1, "level"), bus.async_query)
+        assert bus.calls == 5
+
+    asyncio.run(_run())
@@ -0,0 +1,57 @@
+"""Tests for the lamp poll planner."""
+from __future__ import annotations
+
+from homeassistant.components.light import ColorMode
+import pytest
+
+from custom_components.drp_dali_resi_ascii.query_planner import (
+    Need,
+    PlanStep,
+    Query,
+    lamp_poll_needs,
+    plan_lamp_poll,
+)
+
+
+def _plan(color_mode: str, device_type_known: bool = True, want_status: bool = False):
+    return plan_lamp_poll(color_mode, lamp_poll_needs(color_mode, device_type_known, want_status))
+
+
+@pytest.mark.parametrize(
+    ("color_mode", "query"),
+    [
+        (ColorMode.ONOFF, Query.ACTUAL_LEVEL),
+        (ColorMode.BRIGHTNESS, Query.ACTUAL_LEVEL),
+        (ColorMode.COLOR_TEMP, Query.TC),
+        (ColorMode.RGB, Query.RGB),
+        (ColorMode.RGBWW, Query.RGBWW),
+        # modes without a colour read fall back to the level
+        (ColorMode.HS, Query.ACTUAL_LEVEL),
+    ],
+)
+def test_one_transaction_per_colour_mode(color_mode: str, query: Query) -> None:
+    """The colour reads answer the level too, no separate level query."""
+    plan = _plan(color_mode)
+    assert plan.steps == (PlanStep(query),)
+    assert plan.transactions == 1
+
+
+def test_status_first_and_level_skipped_when_off() -> None:
+    """With the status in the plan the level read can be skipped."""
+    plan = _plan(ColorMode.COLOR_TEMP, want_status=True)
+    assert plan.steps == (
+        PlanStep(Query.STATUS),
+        PlanStep(Query.TC, skip_if_off=True),
+    )
+
+
+def test_unknown_device_type_is_read_first() -> None:
+    """The device type is asked for before anything else."""
+    plan = _plan(ColorMode.RGB, device_type_known=False, want_status=True)
+    assert [step.query for step in plan.steps] == [Query.DEVICE_TYPE, Query.STATUS, Query.RGB]
+    assert plan.needs == {Need.DEVICE_TYPE, Need.STATUS, Need.LEVEL, Need.RGB}
+
+
+def test_plans_are_shared() -> None:
+    """Equal needs give the very same plan."""
+    assert _plan(ColorMode.BRIGHTNESS) is _plan(ColorMode.BRIGHTNESS)
@@ -0,0 +1,135 @@
+"""Tests for command collapsing."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.drp_dali_resi_ascii.scheduler import CommandCollapser
+
+
+def _command(sent: list[int], level: int, release: asyncio.Event | None = None):
+    async def _async_send() -> dict[str, int]:
+        sent.append(level)
+        if release is not None:
+            await release.wait()
+        return {"level": level}
+
+    return _async_send
+
+
+def test_burst_sends_the_latest_only() -> None:
+    """Commands issued together reach the bus once, with the last target."""
+
+    async def _run() -> None:
+        collapser = CommandCollapser()
+        sent: list[int] = []
+        results = await asyncio.gather(
+            *(collapser.async_run(1, _command(sent, level)) for level in (10, 20, 30))
+        )
+        assert sent == [30]
+        assert results == [{"level": 30}] * 3
+        # each caller owns its copy
+        assert results[0] is not results[1]
+        assert collapser.collapsed == 2
+
+    asyncio.run(_run())
+
+
+def test_waits_for_the_running_command() -> None:
+    """A running command finishes, the ones queued behind it collapse."""
+
+    async def _run() -> None:
+        collapser = CommandCollapser()
+        sent: list[int] = []
+        release = asyncio.Event()
+        first = asyncio.create_task(collapser.async_run(1, _command(sent, 10, release)))
+        await asyncio.sleep(0.01)
+        later = [
+            asyncio.create_task(collapser.async_run(1, _command(sent, level)))
+            for level in (20, 30)
+        ]
+        await asyncio.sleep(0.01)
+        assert sent == [10]
+
+        release.set()
+        assert await first == {"level": 10}
+        assert [await task for task in later] == [{"level": 30}] * 2
+        assert sent == [10, 30]
+
+    asyncio.run(_run())
+
+
+def test_other_keys_are_not_collapsed() -> None:
+    """Commands for other lamps all go out."""
+
+    async def _run() -> None:
+        collapser = CommandCollapser()
+        sent: list[int] = []
+        await asyncio.gather(
+            collapser.async_run(1, _command(sent, 10)),
+            collapser.async_run(2, _command(sent, 20)),
+        )
+        assert sorted(sent) == [10, 20]
+        assert collapser.collapsed == 0
+
+    asyncio.run(_run())
+
+
+def test_failure_reaches_every_caller() -> None:
+    """An exception is raised to all the callers it superseded."""
+
+    async def _fail() -> dict[str, int]:
+        raise ValueError("bus error")
+
+    async def _run() -> None:
+        collapser = CommandCollapser()
+        results = await asyncio.gather(
+            collapser.async_run(1, _fail),
+            collapser.async_run(1, _fail),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+    asyncio.run(_run())
+
+
+def test_cancelled_caller_does_not_strand_the_others() -> None:
+    """The command still runs for the callers left."""
+
+    async def _run() -> None:
+        collapser = CommandCollapser()
+        sent: list[int] = []
+        release = asyncio.Event()
+        first = asyncio.create_task(collapser.async_run(1, _command(sent, 10, release)))
+        second = asyncio.create_task(collapser.async_run(1, _command(sent, 10, release)))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == {"level": 10}
+
+    asyncio.run(_run())
+
+
+def test_off_during_a_level_command_goes_last() -> None:
+    """Writes to a lamp keep their order whatever their kind, the last one wins."""
+
+    async def _run() -> None:
+        collapser = CommandCollapser()
+        sent: list[int] = []
+        release = asyncio.Event()
+        level = asyncio.create_task(collapser.async_run(1, _command(sent, 100, release)))
+        await asyncio.sleep(0.01)
+        later = [
+            asyncio.create_task(collapser.async_run(1, _command(sent, target)))
+            for target in (150, 0)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        assert await level == {"level": 100}
+        assert [await task for task in later] == [{"level": 0}] * 2
+        assert sent == [100, 0]
+
+    asyncio.run(_run())
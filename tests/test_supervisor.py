@@ -0,0 +1,66 @@
+"""Tests for the reconnect backoff and the circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.drp_dali_resi_ascii.dali_resi_master import DALIRESIClient3
+from custom_components.drp_dali_resi_ascii.scheduler import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    request_priority,
+)
+from custom_components.drp_dali_resi_ascii.supervisor import (
+    BreakerState,
+    CircuitBreaker,
+    ReconnectBackoff,
+)
+
+from .gateway import CONFIG, Gateway, fake_hass
+
+
+def test_backoff_doubles_up_to_the_maximum() -> None:
+    """Each attempt waits longer, jitter only ever shortens the wait."""
+    backoff = ReconnectBackoff(base=1, factor=2, maximum=8, jitter=0.5)
+    delays = [backoff.next_delay() for _ in range(6)]
+    for delay, nominal in zip(delays, [1, 2, 4, 8, 8, 8]):
+        assert nominal / 2 <= delay <= nominal
+    backoff.reset()
+    assert backoff.next_delay() <= 1
+
+
+def test_breaker_opens_on_a_lost_link() -> None:
+    """Requests are refused from the loss until the new link is tried."""
+    breaker = CircuitBreaker()
+    assert not breaker.allows_requests
+    breaker.try_reset()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allows_requests
+    breaker.reset()
+    breaker.trip()
+    breaker.trip()
+    assert not breaker.allows_requests
+    assert breaker.as_dict() == {"state": "open", "trips": 1, "rejected": 2}
+
+
+def test_reconnect_after_the_link_is_lost() -> None:
+    """Polls fail fast during the reconnect, a user command waits for it."""
+
+    async def _run() -> None:
+        client = DALIRESIClient3(fake_hass(), CONFIG)
+        client._backoff = ReconnectBackoff(base=0.05)
+        assert await client.async_setup()
+        assert await client.async_wait_ready(1)
+        Gateway.opened[-1]._on_lost(None)
+        await asyncio.sleep(0)
+
+        with request_priority(PRIORITY_POLL):
+            assert await client.async_pb_call({"command": "#LAMP OFF:1"}) is None
+        with request_priority(PRIORITY_INTERACTIVE):
+            assert await client.async_pb_call({"command": "#LAMP OFF:1"}) == "#OK"
+        assert len(Gateway.opened) == 2
+        assert Gateway.opened[-1].wire[-1] == "#LAMP OFF:1"
+        assert client.statistics["reconnects"] == 1
+        assert client.statistics["breaker"]["state"] == "closed"
+        await client.async_close()
+
+    asyncio.run(_run())
@@ -0,0 +1,39 @@
+"""Tests for the framing of the gateway byte stream."""
+from __future__ import annotations
+
+from custom_components.drp_dali_resi_ascii.transport import (
+    FRAME_BUFFER_SIZE,
+    ProtocolTransport,
+)
+
+
+def _transport() -> tuple[ProtocolTransport, list[str]]:
+    frames: list[str] = []
+    return ProtocolTransport("gateway", 23, frames.append, lambda exc: None), frames
+
+
+def test_frame_split_across_reads() -> None:
+    """A reply is only handed over once its separator arrived."""
+    transport, frames = _transport()
+    transport.data_received(b"#OK:1,")
+    assert frames == []
+    transport.data_received(b"254\r")
+    assert frames == ["#OK:1,254"]
+
+
+def test_several_frames_in_one_read() -> None:
+    """Frames read together come out one by one, blank ones are skipped."""
+    transport, frames = _transport()
+    transport.data_received(b"\r\r#OK\r #OK:1,0 \r#OK:9")
+    assert frames == ["#OK", "#OK:1,0"]
+    transport.data_received(b",99,0x63\r")
+    assert frames == ["#OK", "#OK:1,0", "#OK:9,99,0x63"]
+
+
+def test_frame_longer_than_the_buffer() -> None:
+    """An oversized reply is kept whole."""
+    transport, frames = _transport()
+    reply = "#" + "A" * (2 * FRAME_BUFFER_SIZE)
+    transport.data_received(reply[:10].encode())
+    transport.data_received(reply[10:].encode() + b"\r#OK\r")
+    assert frames == [reply, "#OK"]
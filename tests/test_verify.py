@@ -0,0 +1,38 @@
+"""Tests for the read back policy."""
+from __future__ import annotations
+
+from custom_components.drp_dali_resi_ascii.const import (
+    VERIFY_ALWAYS,
+    VERIFY_DEFERRED,
+    VERIFY_SAMPLED,
+)
+from custom_components.drp_dali_resi_ascii.verify import VerifyPolicy
+
+
+def test_sampled_reads_back_one_command_in_n_per_lamp() -> None:
+    """Each lamp counts its own commands."""
+    policy = VerifyPolicy(VERIFY_SAMPLED, 3)
+    assert [policy.should_verify(1) for _ in range(6)] == [True, False, False] * 2
+    assert policy.should_verify(2)
+    assert policy.as_dict() == {"mode": VERIFY_SAMPLED, "verified": 3, "skipped": 4, "mismatches": 0}
+
+
+def test_failing_lamp_is_read_back_every_time() -> None:
+    """A mismatch turns sampling off for the lamp until it behaves again."""
+    policy = VerifyPolicy(VERIFY_SAMPLED, 3)
+    policy.should_verify(1)
+    policy.record(1, False)
+    assert policy.needs_verify(1)
+    assert all(policy.should_verify(1) for _ in range(4))
+    for _ in range(10):
+        policy.record(1, True)
+    assert not policy.needs_verify(1)
+    assert policy.mismatches == 1
+
+
+def test_modes_always_and_deferred() -> None:
+    """The policy mode is the default, a command may bring its own."""
+    policy = VerifyPolicy(VERIFY_DEFERRED)
+    assert not policy.should_verify(1)
+    assert policy.should_verify(1, VERIFY_ALWAYS)
+    assert all(VerifyPolicy(VERIFY_ALWAYS).should_verify(1) for _ in range(3))